@@ -1,9 +1,166 @@
+import functools
+import os
+from contextlib import contextmanager
+
 import streamlit as st
-import sympy as sp
-from sympy import symbols, solve, simplify
-import numpy as np
-import matplotlib.pyplot as plt
-import pandas as pd
+
+# NumPy, Matplotlib and the polytools solver are imported inside the sections
+# that use them, so the static sections render without paying for them.
+
+
+# Input help for the polynomial fields of the Interactive Tools.
+POLY_HELP = ("One variable; coefficients may be whole numbers, fractions, decimals or square "
+             "roots of whole numbers, e.g. 3x^2 - 3√2x + 1 or sqrt(2)x^2 - 1.")
+
+
+# "matplotlib" rasterises each chart to a PNG on the server; "vega" sends only
+# the sampled points and zero markers and lets the browser draw them.
+CHART_BACKEND = os.environ.get("POLYTOOLS_CHART_BACKEND", "matplotlib")
+
+
+def show_chart(key, options, **data):
+    from polytools.memory import get_session_budget
+    from polytools.metrics import stage
+    # A session over its memory budget keeps no raster buffer between
+    # renders, and beyond that no figure at all.
+    mode = get_session_budget(st.session_state).mode
+    with stage("render"):
+        if CHART_BACKEND == "vega" or mode == "vega":
+            from polytools.vega import line_chart_spec
+            st.vega_lite_chart(line_chart_spec(**data))
+        else:
+            # The figure is built once per session; reruns only update its data
+            from polytools.plotting import get_chart
+            chart = get_chart(st.session_state, key, **options)
+            st.pyplot(chart.update(**data))
+            if mode == "release":
+                chart.release()
+
+
+# Per-stage timings (polytools.metrics) are collected when they are exported
+# or the debug panel is open; static sections otherwise never import polytools.
+METRICS_EXPORT = bool(os.environ.get("POLYTOOLS_METRICS_FILE") or os.environ.get("POLYTOOLS_METRICS_PORT"))
+
+
+def timings_enabled():
+    return METRICS_EXPORT or st.session_state.get("debug_panel", False)
+
+
+@contextmanager
+def fragment_timings():
+    # A fragment rerun skips the top of the script, so it times itself; inside
+    # a full run the full run's timings already cover it.
+    if not timings_enabled():
+        yield
+        return
+    from polytools import metrics
+    with metrics.rerun(section) as breakdown:
+        yield
+    if breakdown:
+        st.session_state["last_timings"] = dict(breakdown, section=section, scope="fragment")
+
+
+# tracemalloc snapshots per section and tool run (polytools.memory) are opt-in.
+MEMORY_PROFILE = int(os.environ.get("POLYTOOLS_TRACEMALLOC", "0")) > 0
+
+
+@contextmanager
+def memory_profile(scope):
+    if not MEMORY_PROFILE:
+        yield
+        return
+    from polytools.memory import profile
+    with profile(scope):
+        yield
+
+
+def enforce_memory_budget():
+    # Every chart belongs to a tool, so checking after each tool run covers
+    # all the memory a session can hold.
+    from polytools.memory import check_process, get_session_budget
+    get_session_budget(st.session_state).enforce(st.session_state)
+    check_process()
+
+
+def tool(name):
+    # Each interactive tool runs as a fragment: moving one of its widgets
+    # reruns only that tool, not the rest of the page. Runs are timed per
+    # session for the debug panel.
+    def decorate(body):
+        @functools.wraps(body)
+        def run():
+            from polytools.reruns import get_rerun_stats
+            with get_rerun_stats(st.session_state).track(name), fragment_timings(), \
+                    memory_profile(f"tool: {name}"):
+                body()
+            enforce_memory_budget()
+        return st.fragment(run)
+    return decorate
+
+
+def question_page(key):
+    # Topic / degree / difficulty filters and a page of the question bank.
+    # Only the page shown is read and solved, whatever the size of the bank.
+    from polytools.questions import PAGE_SIZE, TOPICS, bank
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        topic = st.selectbox("Topic", [None, *bank.values("topic")], key=f"{key}_topic",
+                             format_func=lambda t: "All topics" if t is None else TOPICS.get(t, t))
+    with col2:
+        degree = st.selectbox("Degree", [None, *bank.values("degree")], key=f"{key}_degree",
+                              format_func=lambda d: "Any degree" if d is None else str(d))
+    with col3:
+        difficulty = st.selectbox("Difficulty", [None, *bank.values("difficulty")], key=f"{key}_difficulty",
+                                  format_func=lambda d: "Any difficulty" if d is None else d)
+    positions = bank.query(topic, degree, difficulty)
+    with col4:
+        # Keyed by the filters, so changing them goes back to page 1
+        page = st.number_input("Page", 1, bank.pages(positions), 1,
+                               key=f"{key}_page_{topic}_{degree}_{difficulty}")
+    first = (page - 1) * PAGE_SIZE + 1
+    last = min(page * PAGE_SIZE, len(positions))
+    st.caption(f"Questions {first}–{last} of {len(positions)}" if positions else "No matching questions")
+    return first, bank.page(positions, page)
+
+
+def show_number(value, spec=None):
+    # Fraction and SymPy values print exactly unless a float format is asked for
+    if isinstance(value, complex):
+        spec = spec or ".10g"
+        sign = "+" if value.imag >= 0 else "−"
+        return f"{value.real:{spec}} {sign} {abs(value.imag):{spec}}i"
+    if isinstance(value, float) or spec:
+        try:
+            return format(float(value), spec or ".10g")
+        except TypeError:
+            return show_number(complex(value), spec)
+    return str(value)
+
+
+def show_relations(relations, spec=None):
+    # Vieta's relations of polytools.vieta: e_k from the zeroes against ±(coefficient)/a.
+    # Quadratics and cubics get one line each, higher degrees a table.
+    if not relations:
+        return
+    if relations[0].degree <= 3:
+        for r in relations:
+            bound = "" if r.error is None else f" (± {r.error:.1e})"
+            line = (f"**{r.name}:** {r.expression} = {show_number(r.rounded(), spec)}{bound} "
+                    f"= {r.label} = {show_number(r.ratio, spec)}")
+            if r.holds:
+                st.info(line + " ✓")
+            else:
+                st.error(line + " ✗")
+        return
+    rows = ["| Relation | From the zeroes | Error bound | From the coefficients | Holds |",
+            "|---|---|---|---|---|"]
+    for r in relations:
+        bound = "exact" if r.error is None else f"± {r.error:.1e}"
+        rows.append(f"| {r.name} (e{r.k}) | {show_number(r.rounded(), spec)} | {bound} | "
+                    f"{r.label} = {show_number(r.ratio, spec)} | {'✓' if r.holds else '✗'} |")
+    st.markdown("\n".join(rows))
+
 
 st.set_page_config(
     page_title="Polynomials Chapter Guide",
@@ -11,6 +168,12 @@ st.set_page_config(
     layout="wide"
 )
 
+# Bracket full runs so fragment reruns can report how much they skipped. The
+# stats only exist once a tool has run, so static pages never import polytools.
+rerun_stats = st.session_state.get("rerun_stats")
+if rerun_stats is not None:
+    rerun_stats.begin_run()
+
 # Custom CSS for better styling
 st.markdown("""
 <style>
@@ -75,6 +238,16 @@ section = st.sidebar.radio(
      "Practice Questions", "Answer Key", "Interactive Tools"]
 )
 
+if timings_enabled():
+    from polytools import metrics
+    timing = metrics.begin(section)
+else:
+    timing = None
+
+if MEMORY_PROFILE:
+    from polytools import memory
+    memory_run = memory.begin(f"section: {section}")
+
 # Introduction Section
 if section == "Introduction":
     st.markdown('<h2 class="section-header">2.1 Introduction to Polynomials</h2>', unsafe_allow_html=True)
@@ -113,14 +286,14 @@ if section == "Introduction":
     # Examples in a table
     st.markdown("#### Examples of Polynomials")
     
-    examples_data = {
-        "Polynomial": ["4x + 2", "2y² - 3y + 4", "5x³ - 4x² + x - √2", "7u⁶ - ³⁄₂ u⁴ + 4u² + u - 8"],
-        "Variable": ["x", "y", "x", "u"],
-        "Degree": [1, 2, 3, 6],
-        "Type": ["Linear", "Quadratic", "Cubic", "Degree 6"]
-    }
-    
-    st.table(pd.DataFrame(examples_data))
+    st.markdown("""
+    | Polynomial | Variable | Degree | Type |
+    |---|---|---|---|
+    | 4x + 2 | x | 1 | Linear |
+    | 2y² - 3y + 4 | y | 2 | Quadratic |
+    | 5x³ - 4x² + x - √2 | x | 3 | Cubic |
+    | 7u⁶ - ³⁄₂ u⁴ + 4u² + u - 8 | u | 6 | Degree 6 |
+    """)
     
     # Value of a polynomial
     st.markdown("#### Value of a Polynomial at a Point")
@@ -134,6 +307,10 @@ if section == "Introduction":
 
 # Geometrical Meaning Section
 elif section == "Geometrical Meaning of Zeroes":
+    from polytools.closed_form import solve_closed_form
+    from polytools.metrics import stage
+    from polytools.sampling import adaptive_sample
+    
     st.markdown('<h2 class="section-header">2.2 Geometrical Meaning of Zeroes of a Polynomial</h2>', unsafe_allow_html=True)
     
     st.markdown("""
@@ -156,34 +333,28 @@ elif section == "Geometrical Meaning of Zeroes":
     """)
     
     # Plot linear polynomial
-    with st.expander("Visualize Linear Polynomial Graph"):
-        col1, col2 = st.columns(2)
-        with col1:
-            a = st.slider("Coefficient a (for ax+b)", -5.0, 5.0, 2.0, 0.5)
-            b = st.slider("Constant b (for ax+b)", -10.0, 10.0, 3.0, 0.5)
-        
-        # Generate plot
-        x_vals = np.linspace(-10, 10, 400)
-        y_vals = a * x_vals + b
-        zero = -b/a if a != 0 else None
-        
-        fig, ax = plt.subplots(figsize=(8, 5))
-        ax.plot(x_vals, y_vals, 'b-', linewidth=2, label=f'y = {a}x + {b}')
-        ax.axhline(y=0, color='k', linestyle='-', alpha=0.3)
-        ax.axvline(x=0, color='k', linestyle='-', alpha=0.3)
+    @tool("Linear graph")
+    def linear_graph():
+        with st.expander("Visualize Linear Polynomial Graph"):
+            col1, col2 = st.columns(2)
+            with col1:
+                a = st.slider("Coefficient a (for ax+b)", -5.0, 5.0, 2.0, 0.5)
+                b = st.slider("Constant b (for ax+b)", -10.0, 10.0, 3.0, 0.5)
         
-        if zero is not None:
-            ax.plot(zero, 0, 'ro', markersize=8, label=f'Zero at x = {zero:.2f}')
+            # Generate plot
+            with stage("sample"):
+                x_vals, y_vals = adaptive_sample([a, b], xlim=(-10, 10), ylim=(-10, 10))
+            zero = -b/a if a != 0 else None
         
-        ax.set_xlabel('x')
-        ax.set_ylabel('y')
-        ax.set_title(f'Graph of y = {a}x + {b}')
-        ax.grid(True, alpha=0.3)
-        ax.legend()
-        ax.set_xlim(-10, 10)
-        ax.set_ylim(-10, 10)
-        
-        st.pyplot(fig)
+            show_chart(
+                "linear_expander_chart", dict(figsize=(8, 5), max_zeroes=1),
+                x=x_vals, y=y_vals, title=f'Graph of y = {a}x + {b}', label=f'y = {a}x + {b}',
+                zeroes=[zero] if zero is not None else [],
+                zero_labels=[f'Zero at x = {zero:.2f}'] if zero is not None else None,
+                xlim=(-10, 10), ylim=(-10, 10),
+            )
+    
+    linear_graph()
     
     # Quadratic Polynomial
     st.markdown('<h3 class="subsection-header">2. Quadratic Polynomials</h3>', unsafe_allow_html=True)
@@ -197,55 +368,44 @@ elif section == "Geometrical Meaning of Zeroes":
     """)
     
     # Plot quadratic polynomial
-    with st.expander("Visualize Quadratic Polynomial Graph"):
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            a_q = st.slider("Coefficient a (for ax²+bx+c)", -3.0, 3.0, 1.0, 0.1)
-        with col2:
-            b_q = st.slider("Coefficient b (for ax²+bx+c)", -10.0, 10.0, -3.0, 0.5)
-        with col3:
-            c_q = st.slider("Constant c (for ax²+bx+c)", -10.0, 10.0, -4.0, 0.5)
-        
-        # Generate plot
-        x_vals = np.linspace(-10, 10, 400)
-        y_vals = a_q * x_vals**2 + b_q * x_vals + c_q
-        
-        # Calculate zeroes
-        discriminant = b_q**2 - 4*a_q*c_q
-        if discriminant >= 0 and a_q != 0:
-            zero1 = (-b_q + np.sqrt(discriminant)) / (2*a_q)
-            zero2 = (-b_q - np.sqrt(discriminant)) / (2*a_q)
-            zeroes = [zero1, zero2]
-        else:
-            zeroes = []
+    @tool("Quadratic graph")
+    def quadratic_graph():
+        with st.expander("Visualize Quadratic Polynomial Graph"):
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                a_q = st.slider("Coefficient a (for ax²+bx+c)", -3.0, 3.0, 1.0, 0.1)
+            with col2:
+                b_q = st.slider("Coefficient b (for ax²+bx+c)", -10.0, 10.0, -3.0, 0.5)
+            with col3:
+                c_q = st.slider("Constant c (for ax²+bx+c)", -10.0, 10.0, -4.0, 0.5)
         
-        fig, ax = plt.subplots(figsize=(8, 5))
-        ax.plot(x_vals, y_vals, 'b-', linewidth=2, label=f'y = {a_q}x² + {b_q}x + {c_q}')
-        ax.axhline(y=0, color='k', linestyle='-', alpha=0.3)
-        ax.axvline(x=0, color='k', linestyle='-', alpha=0.3)
+            # Generate plot
+            with stage("sample"):
+                x_vals, y_vals = adaptive_sample([a_q, b_q, c_q], xlim=(-10, 10), ylim=(-20, 20))
         
-        for zero in zeroes:
-            if -10 <= zero <= 10:
-                ax.plot(zero, 0, 'ro', markersize=8)
+            # Calculate zeroes (exact discriminant, stable formula)
+            with stage("solve"):
+                solved = solve_closed_form([a_q, b_q, c_q], decimal=True) if a_q != 0 else []
+            real = [(float(z), m) for z, m in solved if not isinstance(z, complex)]
+            zeroes = [z for z, _ in real]
         
-        ax.set_xlabel('x')
-        ax.set_ylabel('y')
-        ax.set_title(f'Graph of y = {a_q}x² + {b_q}x + {c_q}')
-        ax.grid(True, alpha=0.3)
-        ax.legend()
-        ax.set_xlim(-10, 10)
-        ax.set_ylim(-20, 20)
+            show_chart(
+                "quadratic_expander_chart", dict(figsize=(8, 5), max_zeroes=2),
+                x=x_vals, y=y_vals, title=f'Graph of y = {a_q}x² + {b_q}x + {c_q}',
+                label=f'y = {a_q}x² + {b_q}x + {c_q}', zeroes=zeroes,
+                xlim=(-10, 10), ylim=(-20, 20),
+            )
         
-        st.pyplot(fig)
-        
-        # Display zero information
-        if a_q != 0:
-            if discriminant > 0:
-                st.success(f"Two distinct zeroes: x₁ = {zero1:.2f}, x₂ = {zero2:.2f}")
-            elif discriminant == 0:
-                st.info(f"One repeated zero: x = {zero1:.2f}")
-            else:
-                st.warning("No real zeroes (graph doesn't intersect x-axis)")
+            # Display zero information
+            if a_q != 0:
+                if len(real) == 2:
+                    st.success(f"Two distinct zeroes: x₁ = {zeroes[0]:.2f}, x₂ = {zeroes[1]:.2f}")
+                elif real:
+                    st.info(f"One repeated zero: x = {zeroes[0]:.2f}")
+                else:
+                    st.warning("No real zeroes (graph doesn't intersect x-axis)")
+    
+    quadratic_graph()
     
     # Cubic Polynomial
     st.markdown('<h3 class="subsection-header">3. Cubic Polynomials</h3>', unsafe_allow_html=True)
@@ -265,6 +425,13 @@ elif section == "Geometrical Meaning of Zeroes":
 
 # Zeroes & Coefficients Relationship Section
 elif section == "Zeroes & Coefficients Relationship":
+    from fractions import Fraction
+
+    from polytools.closed_form import solve_closed_form
+    from polytools.metrics import stage
+    from polytools.polynomial import Polynomial
+    from polytools.vieta import relations
+    
     st.markdown('<h2 class="section-header">2.3 Relationship Between Zeroes and Coefficients</h2>', unsafe_allow_html=True)
     
     # Linear Polynomial
@@ -324,95 +491,98 @@ elif section == "Zeroes & Coefficients Relationship":
     st.markdown('<div class="important-box">', unsafe_allow_html=True)
     st.markdown("#### Interactive Zero Calculator")
     
-    poly_type = st.selectbox("Select polynomial type:", ["Linear", "Quadratic", "Cubic"])
+    @tool("Zero calculator")
+    def zero_calculator():
+        poly_type = st.selectbox("Select polynomial type:", ["Linear", "Quadratic", "Cubic"])
     
-    if poly_type == "Linear":
-        col1, col2 = st.columns(2)
-        with col1:
-            a = st.number_input("Enter coefficient a:", value=2.0, format="%.2f")
-        with col2:
-            b = st.number_input("Enter constant b:", value=3.0, format="%.2f")
+        if poly_type == "Linear":
+            col1, col2 = st.columns(2)
+            with col1:
+                a = st.number_input("Enter coefficient a:", value=2.0, format="%.2f")
+            with col2:
+                b = st.number_input("Enter constant b:", value=3.0, format="%.2f")
         
-        if a != 0:
-            zero = -b/a
-            st.success(f"Zero of {a}x + {b} is: x = {zero:.2f}")
-        else:
-            st.error("Coefficient a cannot be zero for a linear polynomial!")
-    
-    elif poly_type == "Quadratic":
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            a = st.number_input("Enter coefficient a:", value=1.0, format="%.2f")
-        with col2:
-            b = st.number_input("Enter coefficient b:", value=-3.0, format="%.2f")
-        with col3:
-            c = st.number_input("Enter constant c:", value=-4.0, format="%.2f")
+            if a != 0:
+                zero = -b/a
+                st.success(f"Zero of {a}x + {b} is: x = {zero:.2f}")
+            else:
+                st.error("Coefficient a cannot be zero for a linear polynomial!")
+    
+        elif poly_type == "Quadratic":
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                a = st.number_input("Enter coefficient a:", value=1.0, format="%.2f")
+            with col2:
+                b = st.number_input("Enter coefficient b:", value=-3.0, format="%.2f")
+            with col3:
+                c = st.number_input("Enter constant c:", value=-4.0, format="%.2f")
         
-        if a != 0:
-            discriminant = b**2 - 4*a*c
+            if a != 0:
+                # Exact discriminant and a cancellation-free formula
+                with stage("solve"):
+                    solved = solve_closed_form([a, b, c], decimal=True)
             
-            if discriminant > 0:
-                zero1 = (-b + np.sqrt(discriminant)) / (2*a)
-                zero2 = (-b - np.sqrt(discriminant)) / (2*a)
-                st.success(f"Two distinct zeroes: x₁ = {zero1:.2f}, x₂ = {zero2:.2f}")
-                
-                # Calculate sum and product
-                sum_zeros = zero1 + zero2
-                product_zeros = zero1 * zero2
-                st.info(f"Sum of zeroes = {sum_zeros:.2f} (Should equal -b/a = {-b/a:.2f})")
-                st.info(f"Product of zeroes = {product_zeros:.2f} (Should equal c/a = {c/a:.2f})")
-                
-            elif discriminant == 0:
-                zero = -b/(2*a)
-                st.success(f"One repeated zero: x = {zero:.2f}")
-                st.info(f"Sum of zeroes = {2*zero:.2f} (Should equal -b/a = {-b/a:.2f})")
-                st.info(f"Product of zeroes = {zero**2:.2f} (Should equal c/a = {c/a:.2f})")
+                if len(solved) == 2 and not isinstance(solved[0][0], complex):
+                    zero1, zero2 = (float(z) for z, _ in solved)
+                    st.success(f"Two distinct zeroes: x₁ = {zero1:.2f}, x₂ = {zero2:.2f}")
+                elif len(solved) == 1:
+                    zero = float(solved[0][0])
+                    st.success(f"One repeated zero: x = {zero:.2f}")
+                else:
+                    zero = solved[0][0]
+                    st.warning(f"No real zeroes (discriminant < 0): x = {zero.real:.2f} ± {abs(zero.imag):.2f}i")
                 
+                # Sum and product of the zeroes, complex ones included, against -b/a and c/a
+                with stage("verify"):
+                    checks = relations(Polynomial([Fraction(str(a)), Fraction(str(b)), Fraction(str(c))]))
+                show_relations(checks, ".2f")
             else:
-                st.warning("No real zeroes (discriminant < 0)")
-        else:
-            st.error("Coefficient a cannot be zero for a quadratic polynomial!")
-    
-    else:  # Cubic
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            a = st.number_input("Enter coefficient a:", value=2.0, format="%.2f", key="cubic_a")
-        with col2:
-            b = st.number_input("Enter coefficient b:", value=-5.0, format="%.2f", key="cubic_b")
-        with col3:
-            c = st.number_input("Enter coefficient c:", value=-14.0, format="%.2f", key="cubic_c")
-        with col4:
-            d = st.number_input("Enter constant d:", value=8.0, format="%.2f", key="cubic_d")
+                st.error("Coefficient a cannot be zero for a quadratic polynomial!")
+    
+        else:  # Cubic
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                a = st.number_input("Enter coefficient a:", value=2.0, format="%.2f", key="cubic_a")
+            with col2:
+                b = st.number_input("Enter coefficient b:", value=-5.0, format="%.2f", key="cubic_b")
+            with col3:
+                c = st.number_input("Enter coefficient c:", value=-14.0, format="%.2f", key="cubic_c")
+            with col4:
+                d = st.number_input("Enter constant d:", value=8.0, format="%.2f", key="cubic_d")
         
-        if a != 0:
-            # Use numpy to find approximate roots for cubic
-            coeffs = [a, b, c, d]
-            roots = np.roots(coeffs)
-            real_roots = [root.real for root in roots if abs(root.imag) < 1e-10]
+            if a != 0:
+                # Closed form with exact multiplicities (no imaginary-part cutoff)
+                with stage("solve"):
+                    solved = solve_closed_form([a, b, c, d], decimal=True)
+                real_roots = [(float(z), m) for z, m in solved if not isinstance(z, complex)]
             
-            if real_roots:
-                if len(real_roots) == 3:
-                    zero1, zero2, zero3 = real_roots
-                    st.success(f"Three zeroes: x₁ = {zero1:.2f}, x₂ = {zero2:.2f}, x₃ = {zero3:.2f}")
-                    
-                    # Calculate relationships
-                    sum_zeros = zero1 + zero2 + zero3
-                    sum_pairwise = zero1*zero2 + zero2*zero3 + zero3*zero1
-                    product_zeros = zero1 * zero2 * zero3
-                    
-                    st.info(f"Sum of zeroes = {sum_zeros:.2f} (Should equal -b/a = {-b/a:.2f})")
-                    st.info(f"Sum of products taken two at a time = {sum_pairwise:.2f} (Should equal c/a = {c/a:.2f})")
-                    st.info(f"Product of zeroes = {product_zeros:.2f} (Should equal -d/a = {-d/a:.2f})")
+                if real_roots:
+                    if sum(m for _, m in real_roots) == 3:
+                        zero1, zero2, zero3 = (z for z, m in real_roots for _ in range(m))
+                        if len(real_roots) == 3:
+                            st.success(f"Three zeroes: x₁ = {zero1:.2f}, x₂ = {zero2:.2f}, x₃ = {zero3:.2f}")
+                        elif len(real_roots) == 2:
+                            # One is repeated
+                            (r1, m1), (r2, m2) = real_roots
+                            repeated, single = (r1, r2) if m1 == 2 else (r2, r1)
+                            st.success(f"Two zeroes (one repeated): x₁ = x₂ = {repeated:.2f}, x₃ = {single:.2f}")
+                        else:
+                            st.success(f"One zero repeated three times: x₁ = x₂ = x₃ = {zero1:.2f}")
+                    else:
+                        pair = next(z for z, _ in solved if isinstance(z, complex))
+                        st.success(f"One real zero: x = {real_roots[0][0]:.2f} (the other two are complex: "
+                                   f"{pair.real:.2f} ± {abs(pair.imag):.2f}i)")
                     
-                elif len(real_roots) == 2:
-                    # One is repeated
-                    st.success(f"Two zeroes (one repeated): x₁ = {real_roots[0]:.2f}, x₂ = {real_roots[1]:.2f}")
+                    # Relationships hold for the complex zeroes too
+                    with stage("verify"):
+                        checks = relations(Polynomial([Fraction(str(v)) for v in (a, b, c, d)]))
+                    show_relations(checks, ".2f")
                 else:
-                    st.success(f"One zero: x = {real_roots[0]:.2f}")
+                    st.warning("No real zeroes found")
             else:
-                st.warning("No real zeroes found")
-        else:
-            st.error("Coefficient a cannot be zero for a cubic polynomial!")
+                st.error("Coefficient a cannot be zero for a cubic polynomial!")
+    
+    zero_calculator()
     
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -501,381 +671,378 @@ elif section == "Important Points & Formulas":
 
 # Practice Questions Section
 elif section == "Practice Questions":
+    from polytools.questions import solution
+    
     st.markdown('<h2 class="section-header">Practice Questions</h2>', unsafe_allow_html=True)
     
-    st.markdown("### Exercise 1: Find Zeroes and Verify Relationships")
-    
-    questions = [
-        {
-            "text": "1. Find the zeroes of the polynomial \(x^2 - 2x - 8\) and verify the relationship between zeroes and coefficients.",
-            "type": "quadratic"
-        },
-        {
-            "text": "2. Find the zeroes of \(4s^2 - 4s + 1\) and verify the relationship.",
-            "type": "quadratic"
-        },
-        {
-            "text": "3. Find the zeroes of \(6x^2 - 3 - 7x\) and verify the relationship.",
-            "type": "quadratic"
-        },
-        {
-            "text": "4. Find the zeroes of \(4u^2 + 8u\) and verify the relationship.",
-            "type": "quadratic"
-        },
-        {
-            "text": "5. Find the zeroes of \(t^2 - 15\) and verify the relationship.",
-            "type": "quadratic"
-        },
-        {
-            "text": "6. Find the zeroes of \(3x^2 - x - 4\) and verify the relationship.",
-            "type": "quadratic"
-        }
-    ]
-    
-    for i, q in enumerate(questions):
+    first, questions = question_page("practice")
+    exercise = None
+    for n, q in enumerate(questions, first):
+        if q["exercise"] != exercise:
+            exercise = q["exercise"]
+            st.markdown(f"### {exercise}")
         st.markdown(f'<div class="question-box">', unsafe_allow_html=True)
-        st.markdown(f"**Q{i+1}:** {q['text']}")
+        st.markdown(f"**Q{n}** ({q['difficulty']}): {q['text']}")
         
-        with st.expander(f"Show/Hide Solution for Q{i+1}"):
-            if i == 0:  # x² - 2x - 8
-                st.markdown(r"""
-                **Solution:**
-                - Factorize: \(x^2 - 2x - 8 = (x - 4)(x + 2)\)
-                - Zeroes: \(x = 4\) and \(x = -2\)
-                - Sum: \(4 + (-2) = 2 = \frac{-(-2)}{1} = -\frac{b}{a}\)
-                - Product: \(4 \times (-2) = -8 = \frac{-8}{1} = \frac{c}{a}\)
-                """)
-            elif i == 1:  # 4s² - 4s + 1
-                st.markdown(r"""
-                **Solution:**
-                - Factorize: \(4s^2 - 4s + 1 = (2s - 1)^2\)
-                - Zeroes: \(s = \frac{1}{2}\) (repeated)
-                - Sum: \(\frac{1}{2} + \frac{1}{2} = 1 = \frac{-(-4)}{4} = -\frac{b}{a}\)
-                - Product: \(\frac{1}{2} \times \frac{1}{2} = \frac{1}{4} = \frac{1}{4} = \frac{c}{a}\)
-                """)
-            elif i == 2:  # 6x² - 3 - 7x
-                st.markdown(r"""
-                **Solution:**
-                - Rewrite: \(6x^2 - 7x - 3\)
-                - Factorize: \(6x^2 - 7x - 3 = (3x + 1)(2x - 3)\)
-                - Zeroes: \(x = -\frac{1}{3}\) and \(x = \frac{3}{2}\)
-                - Sum: \(-\frac{1}{3} + \frac{3}{2} = \frac{7}{6} = \frac{-(-7)}{6} = -\frac{b}{a}\)
-                - Product: \(-\frac{1}{3} \times \frac{3}{2} = -\frac{1}{2} = \frac{-3}{6} = \frac{c}{a}\)
-                """)
-            elif i == 3:  # 4u² + 8u
-                st.markdown(r"""
-                **Solution:**
-                - Factorize: \(4u^2 + 8u = 4u(u + 2)\)
-                - Zeroes: \(u = 0\) and \(u = -2\)
-                - Sum: \(0 + (-2) = -2 = \frac{-8}{4} = -\frac{b}{a}\)
-                - Product: \(0 \times (-2) = 0 = \frac{0}{4} = \frac{c}{a}\)
-                """)
-            elif i == 4:  # t² - 15
-                st.markdown(r"""
-                **Solution:**
-                - Factorize: \(t^2 - 15 = (t - \sqrt{15})(t + \sqrt{15})\)
-                - Zeroes: \(t = \sqrt{15}\) and \(t = -\sqrt{15}\)
-                - Sum: \(\sqrt{15} + (-\sqrt{15}) = 0 = \frac{-0}{1} = -\frac{b}{a}\)
-                - Product: \(\sqrt{15} \times (-\sqrt{15}) = -15 = \frac{-15}{1} = \frac{c}{a}\)
-                """)
-            elif i == 5:  # 3x² - x - 4
-                st.markdown(r"""
-                **Solution:**
-                - Factorize: \(3x^2 - x - 4 = (3x - 4)(x + 1)\)
-                - Zeroes: \(x = \frac{4}{3}\) and \(x = -1\)
-                - Sum: \(\frac{4}{3} + (-1) = \frac{1}{3} = \frac{-(-1)}{3} = -\frac{b}{a}\)
-                - Product: \(\frac{4}{3} \times (-1) = -\frac{4}{3} = \frac{-4}{3} = \frac{c}{a}\)
-                """)
+        # Worked solutions come from the solver and are cached per question
+        with st.expander(f"Show/Hide Solution for Q{n}"):
+            st.markdown(solution(q).markdown())
         
         st.markdown('</div>', unsafe_allow_html=True)
-    
-    st.markdown("---")
-    st.markdown("### Exercise 2: Find Quadratic Polynomials")
-    
-    st.markdown('<div class="question-box">', unsafe_allow_html=True)
-    st.markdown("Find quadratic polynomials with the following sums and products of zeroes:")
-    
-    poly_questions = [
-        ("(i) Sum = \(\\frac{1}{4}\), Product = -1", "\(4x^2 - x - 4\)"),
-        ("(ii) Sum = \(\sqrt{2}\), Product = \(\\frac{1}{3}\)", "\(3x^2 - 3\sqrt{2}x + 1\)"),
-        ("(iii) Sum = 0, Product = \(\sqrt{5}\)", "\(x^2 + \sqrt{5}\)"),
-        ("(iv) Sum = 1, Product = 1", "\(x^2 - x + 1\)"),
-        ("(v) Sum = \(-\\frac{1}{4}\), Product = \(\\frac{1}{4}\)", "\(4x^2 + x + 1\)"),
-        ("(vi) Sum = 4, Product = 1", "\(x^2 - 4x + 1\)")
-    ]
-    
-    for q_text, _ in poly_questions:
-        st.markdown(f"**{q_text}**")
-    
-    with st.expander("Show Solutions"):
-        for q_text, solution in poly_questions:
-            st.markdown(f"**{q_text.split(')')[0]})** Solution: {solution}")
-            st.markdown("---")
-    
-    st.markdown('</div>', unsafe_allow_html=True)
 
 # Answer Key Section
 elif section == "Answer Key":
-    st.markdown('<h2 class="section-header">Answer Key</h2>', unsafe_allow_html=True)
-    
-    st.markdown("### Exercise 1 Answers")
+    from polytools.questions import solution
     
-    answers_ex1 = [
-        ("1. \(x^2 - 2x - 8\)", "Zeroes: 4, -2; Sum: 2; Product: -8"),
-        ("2. \(4s^2 - 4s + 1\)", "Zeroes: \(\\frac{1}{2}, \\frac{1}{2}\); Sum: 1; Product: \(\\frac{1}{4}\)"),
-        ("3. \(6x^2 - 3 - 7x\)", "Zeroes: \(-\\frac{1}{3}, \\frac{3}{2}\); Sum: \(\\frac{7}{6}\); Product: \(-\\frac{1}{2}\)"),
-        ("4. \(4u^2 + 8u\)", "Zeroes: 0, -2; Sum: -2; Product: 0"),
-        ("5. \(t^2 - 15\)", "Zeroes: \(\sqrt{15}, -\sqrt{15}\); Sum: 0; Product: -15"),
-        ("6. \(3x^2 - x - 4\)", "Zeroes: \(\\frac{4}{3}, -1\); Sum: \(\\frac{1}{3}\); Product: \(-\\frac{4}{3}\)")
-    ]
-    
-    for question, answer in answers_ex1:
-        st.markdown(f'<div class="answer-box">', unsafe_allow_html=True)
-        st.markdown(f"**{question}**")
-        st.markdown(f"{answer}")
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    st.markdown("---")
-    st.markdown("### Exercise 2 Answers")
-    
-    st.markdown("""
-    **General Form**: For sum = S and product = P, quadratic polynomial is: \(x^2 - Sx + P\)
-    
-    (Multiply by constant k if needed to clear fractions)
-    """)
-    
-    answers_ex2 = [
-        ("(i) Sum = \(\\frac{1}{4}\), Product = -1", "\(x^2 - \\frac{1}{4}x - 1\) or \(4x^2 - x - 4\)"),
-        ("(ii) Sum = \(\sqrt{2}\), Product = \(\\frac{1}{3}\)", "\(x^2 - \sqrt{2}x + \\frac{1}{3}\) or \(3x^2 - 3\sqrt{2}x + 1\)"),
-        ("(iii) Sum = 0, Product = \(\sqrt{5}\)", "\(x^2 + \sqrt{5}\)"),
-        ("(iv) Sum = 1, Product = 1", "\(x^2 - x + 1\)"),
-        ("(v) Sum = \(-\\frac{1}{4}\), Product = \(\\frac{1}{4}\)", "\(x^2 + \\frac{1}{4}x + \\frac{1}{4}\) or \(4x^2 + x + 1\)"),
-        ("(vi) Sum = 4, Product = 1", "\(x^2 - 4x + 1\)")
-    ]
+    st.markdown('<h2 class="section-header">Answer Key</h2>', unsafe_allow_html=True)
     
-    for question, answer in answers_ex2:
+    first, questions = question_page("answers")
+    exercise = None
+    for n, q in enumerate(questions, first):
+        if q["exercise"] != exercise:
+            exercise = q["exercise"]
+            st.markdown(f"### {exercise}")
+            if q["kind"] == "from_sum_product":
+                st.markdown("""
+                **General Form**: For sum = S and product = P, quadratic polynomial is: \(x^2 - Sx + P\)
+                
+                (Multiply by constant k if needed to clear fractions)
+                """)
         st.markdown(f'<div class="answer-box">', unsafe_allow_html=True)
-        st.markdown(f"**{question}**")
-        st.markdown(f"{answer}")
+        st.markdown(f"**Q{n}.** {q['text']}")
+        st.markdown(solution(q).answer)
         st.markdown('</div>', unsafe_allow_html=True)
 
+    # Grade a class's answers against this answer key
+    with st.expander("Grade student answers"):
+        st.markdown("""
+        Upload a CSV with columns `student, question, part, answer` (or JSON lines with those fields).
+        `question` is a question id such as `ex1-1`, and `part` is `zeroes`, `sum`, `product` or
+        `polynomial` (left empty: zeroes for Exercise 1, the polynomial for Exercise 2).
+        Polynomials are accepted up to a constant multiple.
+        """)
+        upload = st.file_uploader("Submissions", type=["csv", "jsonl", "json"], key="grader_upload")
+        if upload is not None:
+            import io
+
+            import pandas as pd
+            from polytools.grader import grade, read_submissions
+
+            fmt = "csv" if upload.name.lower().endswith(".csv") else "jsonl"
+            try:
+                report = grade(read_submissions(io.StringIO(upload.getvalue().decode("utf-8")), fmt))
+            except (ValueError, KeyError, UnicodeDecodeError) as exc:
+                st.error(f"Could not read the submissions: {exc}")
+            else:
+                summary = report.summary()
+                st.success(f"Graded {summary['graded']} answers: {summary['correct']} correct, "
+                           f"{summary['wrong']} wrong, {summary['invalid']} unreadable, "
+                           f"{summary['unknown']} for unknown questions")
+                table = pd.DataFrame(list(report.records()))
+                if not table.empty:
+                    table["common_wrong"] = table["common_wrong"].map(
+                        lambda rows: ", ".join(f"{answer} (×{count})" for answer, count in rows))
+                    st.dataframe(table, hide_index=True)
+
 # Interactive Tools Section
 else:  # Interactive Tools
+    from polytools.analysis import analyze, parse
+    from polytools.closed_form import real_zeroes as closed_form_zeroes
+    from polytools.memory import numeric_only
+    from polytools.metrics import stage
+    from polytools.pool import SolveCancelled
+    from polytools.reruns import rerun_requested
+    from polytools.sampling import adaptive_sample, y_range
+    from polytools.vieta import relations
+
+    def approximation_note():
+        if numeric_only():
+            return "The server is low on memory; showing numeric approximations."
+        return "Exact solving took too long; showing numeric approximations."
+    
     st.markdown('<h2 class="section-header">Interactive Tools</h2>', unsafe_allow_html=True)
     
     tab1, tab2, tab3 = st.tabs(["Polynomial Analyzer", "Graph Plotter", "Zero Finder"])
     
     with tab1:
-        st.markdown("### Polynomial Analyzer")
-        st.markdown("Enter any polynomial to analyze its properties:")
+        @tool("Polynomial Analyzer")
+        def polynomial_analyzer():
+            st.markdown("### Polynomial Analyzer")
+            st.markdown("Enter any polynomial to analyze its properties:")
         
-        poly_input = st.text_input("Enter polynomial (use x as variable):", "x^2 - 3x - 4")
+            poly_input = st.text_input("Enter polynomial (use x as variable):", "x^2 - 3x - 4",
+                                       help=POLY_HELP)
         
-        if poly_input:
-            try:
-                x = sp.symbols('x')
-                poly_expr = sp.sympify(poly_input)
-                
-                # Get degree
-                degree = sp.Poly(poly_expr, x).degree()
+            if poly_input:
+                try:
+                    with stage("parse"):
+                        poly = parse(poly_input)
                 
-                # Get coefficients
-                coeffs = sp.Poly(poly_expr, x).all_coeffs()
+                    # Degree and coefficients come from the array-backed polynomial
+                    degree = poly.degree
+                    coeffs = poly.all_coeffs()
                 
-                st.success(f"**Degree:** {degree}")
+                    st.success(f"**Degree:** {degree}")
                 
-                if degree == 1:
-                    st.info("**Type:** Linear Polynomial")
-                    a, b = coeffs
-                    st.info(f"**Standard Form:** {a}x + {b}")
-                    if a != 0:
-                        zero = -b/a
-                        st.info(f"**Zero:** x = {zero}")
+                    if degree == 1:
+                        st.info("**Type:** Linear Polynomial")
+                        a, b = coeffs
+                        st.info(f"**Standard Form:** {a}{poly.var} + {b}")
+                        if a != 0:
+                            zero = -b/a
+                            st.info(f"**Zero:** x = {zero}")
                 
-                elif degree == 2:
-                    st.info("**Type:** Quadratic Polynomial")
-                    a, b, c = coeffs
-                    st.info(f"**Standard Form:** {a}x² + {b}x + {c}")
+                    elif degree == 2:
+                        st.info("**Type:** Quadratic Polynomial")
+                        a, b, c = coeffs
+                        st.info(f"**Standard Form:** {a}{poly.var}² + {b}{poly.var} + {c}")
                     
-                    if a != 0:
-                        # Calculate discriminant
-                        D = b**2 - 4*a*c
-                        st.info(f"**Discriminant:** D = {D}")
+                        if a != 0:
+                            # Calculate discriminant
+                            D = b**2 - 4*a*c
+                            st.info(f"**Discriminant:** D = {D}")
                         
-                        if D > 0:
-                            zero1 = (-b + sp.sqrt(D)) / (2*a)
-                            zero2 = (-b - sp.sqrt(D)) / (2*a)
-                            st.info(f"**Zeroes:** x₁ = {zero1}, x₂ = {zero2}")
-                            st.info(f"**Sum of zeroes:** α + β = {zero1 + zero2} = -b/a = {-b/a}")
-                            st.info(f"**Product of zeroes:** αβ = {zero1 * zero2} = c/a = {c/a}")
-                        elif D == 0:
-                            zero = -b/(2*a)
-                            st.info(f"**Zero:** x = {zero} (repeated)")
-                            st.info(f"**Sum of zeroes:** α + β = {2*zero} = -b/a = {-b/a}")
-                            st.info(f"**Product of zeroes:** αβ = {zero**2} = c/a = {c/a}")
-                        else:
-                            st.info("**Zeroes:** No real zeroes (complex conjugate pair)")
+                            analysis = analyze(poly, cancel=rerun_requested, numeric_only=numeric_only())
+                            if D > 0:
+                                zero1, zero2 = analysis.zeroes
+                                st.info(f"**Zeroes:** x₁ = {zero1}, x₂ = {zero2}")
+                            elif D == 0:
+                                zero = -b/(2*a)
+                                st.info(f"**Zero:** x = {zero} (repeated)")
+                            else:
+                                st.info("**Zeroes:** No real zeroes (complex conjugate pair"
+                                        + (f" {', '.join(map(str, analysis.zeroes))})" if analysis.zeroes else ")"))
+                            show_relations(relations(poly, analysis))
                 
-                elif degree == 3:
-                    st.info("**Type:** Cubic Polynomial")
-                    a, b, c, d = coeffs
-                    st.info(f"**Standard Form:** {a}x³ + {b}x² + {c}x + {d}")
+                    elif degree == 3:
+                        st.info("**Type:** Cubic Polynomial")
+                        a, b, c, d = coeffs
+                        st.info(f"**Standard Form:** {a}{poly.var}³ + {b}{poly.var}² + {c}{poly.var} + {d}")
                     
-                    # Try to find zeroes
-                    try:
-                        zeroes = sp.solve(poly_expr, x)
-                        real_zeroes = [z for z in zeroes if z.is_real]
+                        # Try to find zeroes
+                        try:
+                            analysis = analyze(poly, cancel=rerun_requested, numeric_only=numeric_only())
+                            real_zeroes = analysis.real_zeroes
+                            if not analysis.exact:
+                                st.warning(approximation_note())
                         
-                        if len(real_zeroes) >= 1:
-                            st.info(f"**Real Zeroes:** {real_zeroes}")
-                            
-                            if len(real_zeroes) == 3:
-                                alpha, beta, gamma = real_zeroes
-                                st.info(f"**Sum of zeroes:** α + β + γ = {alpha + beta + gamma} = -b/a = {-b/a}")
-                                st.info(f"**Sum of products taken two at a time:** αβ + βγ + γα = {alpha*beta + beta*gamma + gamma*alpha} = c/a = {c/a}")
-                                st.info(f"**Product of zeroes:** αβγ = {alpha*beta*gamma} = -d/a = {-d/a}")
-                        else:
-                            st.info("**Zeroes:** No real zeroes found")
-                    except:
-                        st.warning("Could not find exact zeroes symbolically")
+                            if len(real_zeroes) >= 1:
+                                st.info(f"**Real Zeroes:** [{', '.join(map(str, real_zeroes))}]")
+                            else:
+                                st.info("**Zeroes:** No real zeroes found")
+                            # Complex zeroes count too, so every cubic has all three relations
+                            show_relations(relations(poly, analysis))
+                        except SolveCancelled:
+                            raise
+                        except:
+                            st.warning("Could not find exact zeroes symbolically")
                 
-                else:
-                    st.info(f"**Type:** Polynomial of degree {degree}")
-                    st.info(f"**Coefficients:** {coeffs}")
+                    else:
+                        st.info(f"**Type:** Polynomial of degree {degree}")
+                        st.info(f"**Coefficients:** [{', '.join(map(str, coeffs))}]")
+                    
+                        if degree > 3:
+                            # Numeric zeroes with error bounds; see the Zero Finder for the full list
+                            analysis = analyze(poly, cancel=rerun_requested)
+                            roots = analysis.roots
+                            real_roots = [r for r in roots if r.real]
+                            n_real = sum(r.multiplicity for r in real_roots)
+                            st.info(f"**Real zeroes:** {n_real} of {degree}"
+                                    + (f" — x ≈ {', '.join(f'{r.value:.6g}' + (f' (×{r.multiplicity})' if r.multiplicity > 1 else '') for r in real_roots)}"
+                                       if real_roots else ""))
+                            st.info(f"**Non-real zeroes:** {degree - n_real} (in conjugate pairs)")
+                            show_relations(relations(poly, analysis))
                     
-            except Exception as e:
-                st.error(f"Error parsing polynomial: {e}")
+                except SolveCancelled:
+                    # Newer input is waiting; its rerun shows the result.
+                    pass
+                except Exception as e:
+                    st.error(f"Error parsing polynomial: {e}")
+        
+        polynomial_analyzer()
     
     with tab2:
-        st.markdown("### Polynomial Graph Plotter")
+        @tool("Graph Plotter")
+        def graph_plotter():
+            st.markdown("### Polynomial Graph Plotter")
         
-        col1, col2 = st.columns([1, 2])
+            col1, col2 = st.columns([1, 2])
         
-        with col1:
-            poly_type = st.selectbox("Select polynomial type:", 
-                                     ["Linear (ax+b)", "Quadratic (ax²+bx+c)", "Cubic (ax³+bx²+cx+d)"])
+            with col1:
+                poly_type = st.selectbox("Select polynomial type:", 
+                                         ["Linear (ax+b)", "Quadratic (ax²+bx+c)", "Cubic (ax³+bx²+cx+d)"])
             
-            if poly_type == "Linear (ax+b)":
-                a = st.slider("a", -5.0, 5.0, 2.0, 0.1)
-                b = st.slider("b", -10.0, 10.0, 3.0, 0.1)
-                x_vals = np.linspace(-10, 10, 400)
-                y_vals = a * x_vals + b
-                title = f"y = {a}x + {b}"
+                if poly_type == "Linear (ax+b)":
+                    a = st.slider("a", -5.0, 5.0, 2.0, 0.1)
+                    b = st.slider("b", -10.0, 10.0, 3.0, 0.1)
+                    coeffs = [a, b]
+                    title = f"y = {a}x + {b}"
                 
-            elif poly_type == "Quadratic (ax²+bx+c)":
-                a = st.slider("a", -3.0, 3.0, 1.0, 0.1, key="quad_a")
-                b = st.slider("b", -10.0, 10.0, -3.0, 0.1, key="quad_b")
-                c = st.slider("c", -10.0, 10.0, -4.0, 0.1, key="quad_c")
-                x_vals = np.linspace(-10, 10, 400)
-                y_vals = a * x_vals**2 + b * x_vals + c
-                title = f"y = {a}x² + {b}x + {c}"
+                elif poly_type == "Quadratic (ax²+bx+c)":
+                    a = st.slider("a", -3.0, 3.0, 1.0, 0.1, key="quad_a")
+                    b = st.slider("b", -10.0, 10.0, -3.0, 0.1, key="quad_b")
+                    c = st.slider("c", -10.0, 10.0, -4.0, 0.1, key="quad_c")
+                    coeffs = [a, b, c]
+                    title = f"y = {a}x² + {b}x + {c}"
                 
-            else:  # Cubic
-                a = st.slider("a", -2.0, 2.0, 1.0, 0.1, key="cubic_a_plot")
-                b = st.slider("b", -5.0, 5.0, 0.0, 0.1, key="cubic_b_plot")
-                c = st.slider("c", -5.0, 5.0, -4.0, 0.1, key="cubic_c_plot")
-                d = st.slider("d", -10.0, 10.0, 0.0, 0.1, key="cubic_d_plot")
-                x_vals = np.linspace(-10, 10, 400)
-                y_vals = a * x_vals**3 + b * x_vals**2 + c * x_vals + d
-                title = f"y = {a}x³ + {b}x² + {c}x + {d}"
+                else:  # Cubic
+                    a = st.slider("a", -2.0, 2.0, 1.0, 0.1, key="cubic_a_plot")
+                    b = st.slider("b", -5.0, 5.0, 0.0, 0.1, key="cubic_b_plot")
+                    c = st.slider("c", -5.0, 5.0, -4.0, 0.1, key="cubic_c_plot")
+                    d = st.slider("d", -10.0, 10.0, 0.0, 0.1, key="cubic_d_plot")
+                    coeffs = [a, b, c, d]
+                    title = f"y = {a}x³ + {b}x² + {c}x + {d}"
             
-            # Find zeroes for plotting
-            zeroes = []
-            if poly_type == "Linear (ax+b)" and a != 0:
-                zeroes.append(-b/a)
-            elif poly_type == "Quadratic (ax²+bx+c)" and a != 0:
-                discriminant = b**2 - 4*a*c
-                if discriminant >= 0:
-                    zero1 = (-b + np.sqrt(discriminant)) / (2*a)
-                    zero2 = (-b - np.sqrt(discriminant)) / (2*a)
-                    zeroes.extend([zero1, zero2])
+                # Find zeroes for plotting (cubics included)
+                with stage("solve"):
+                    zeroes = closed_form_zeroes(coeffs, decimal=True) if a != 0 else []
         
-        with col2:
-            # Create plot
-            fig, ax = plt.subplots(figsize=(10, 6))
-            ax.plot(x_vals, y_vals, 'b-', linewidth=2, label=title)
-            ax.axhline(y=0, color='k', linestyle='-', alpha=0.3)
-            ax.axvline(x=0, color='k', linestyle='-', alpha=0.3)
-            
-            # Plot zeroes
-            for zero in zeroes:
-                if -10 <= zero <= 10:
-                    ax.plot(zero, 0, 'ro', markersize=8, label=f'Zero at x = {zero:.2f}')
+            with col2:
+                # Adjust y-lim based on polynomial type (exact curve range on [-10, 10])
+                with stage("sample"):
+                    y_min, y_max = y_range(coeffs, -10, 10)
+                if poly_type == "Linear (ax+b)":
+                    ylim = (-10, 10)
+                elif poly_type == "Quadratic (ax²+bx+c)":
+                    ylim = (min(-10, y_min), max(10, y_max))
+                else:  # Cubic
+                    ylim = (min(-20, y_min), max(20, y_max))
             
-            ax.set_xlabel('x', fontsize=12)
-            ax.set_ylabel('y', fontsize=12)
-            ax.set_title(f'Graph of {title}', fontsize=14)
-            ax.grid(True, alpha=0.3)
-            ax.legend()
-            ax.set_xlim(-10, 10)
+                # Points concentrate near zeroes and turns instead of a fixed 400-point grid
+                with stage("sample"):
+                    x_vals, y_vals = adaptive_sample(coeffs, xlim=(-10, 10), ylim=ylim)
             
-            # Adjust y-lim based on polynomial type
-            if poly_type == "Linear (ax+b)":
-                ax.set_ylim(-10, 10)
-            elif poly_type == "Quadratic (ax²+bx+c)":
-                ax.set_ylim(min(-10, np.min(y_vals)), max(10, np.max(y_vals)))
-            else:  # Cubic
-                ax.set_ylim(min(-20, np.min(y_vals)), max(20, np.max(y_vals)))
-            
-            st.pyplot(fig)
+                show_chart(
+                    "graph_plotter_chart", dict(figsize=(10, 6), label_fontsize=12, title_fontsize=14),
+                    x=x_vals, y=y_vals, title=f'Graph of {title}', label=title, zeroes=zeroes,
+                    zero_labels=[f'Zero at x = {zero:.2f}' for zero in zeroes],
+                    xlim=(-10, 10), ylim=ylim,
+                )
+        
+        graph_plotter()
     
     with tab3:
-        st.markdown("### Zero Finder Tool")
-        st.markdown("Find zeroes of any polynomial up to degree 3:")
+        @tool("Zero Finder")
+        def zero_finder():
+            st.markdown("### Zero Finder Tool")
+            st.markdown("Find zeroes of any polynomial: exact up to degree 3, numeric with error bounds above that.")
         
-        poly_input2 = st.text_input("Enter polynomial:", "x^2 + 7x + 10", key="zero_finder")
+            poly_input2 = st.text_input("Enter polynomial:", "x^2 + 7x + 10", key="zero_finder",
+                                        help=POLY_HELP)
         
-        if poly_input2:
-            try:
-                x = sp.symbols('x')
-                poly_expr = sp.sympify(poly_input2)
-                degree = sp.Poly(poly_expr, x).degree()
+            if poly_input2:
+                try:
+                    with stage("parse"):
+                        poly = parse(poly_input2)
+                    degree = poly.degree
                 
-                if degree <= 3:
-                    # Try to find zeroes symbolically
-                    zeroes = sp.solve(poly_expr, x)
+                    if degree <= 3:
+                        # Zeroes, verification and symmetric sums are cached per canonical polynomial
+                        analysis = analyze(poly, cancel=rerun_requested, numeric_only=numeric_only())
+                        zeroes = analysis.zeroes
+                        if not analysis.exact:
+                            st.warning(approximation_note())
                     
-                    st.success(f"**Polynomial:** {poly_expr}")
-                    st.success(f"**Degree:** {degree}")
+                        st.success(f"**Polynomial:** {poly}")
+                        st.success(f"**Degree:** {degree}")
                     
-                    if zeroes:
-                        st.success(f"**Zeroes found:** {zeroes}")
+                        if zeroes:
+                            st.success(f"**Zeroes found:** [{', '.join(map(str, zeroes))}]")
                         
-                        # Verify they are zeroes
-                        st.info("**Verification:**")
-                        for zero in zeroes:
-                            value = poly_expr.subs(x, zero)
-                            st.info(f"p({zero}) = {value}")
+                            # Verify they are zeroes
+                            st.info("**Verification:**")
+                            for zero, value in zip(zeroes, analysis.values):
+                                st.info(f"p({zero}) = {value}")
                         
-                        # Show relationships if applicable
-                        coeffs = sp.Poly(poly_expr, x).all_coeffs()
-                        
-                        if degree == 2 and len(zeroes) == 2:
-                            a, b, c = coeffs
-                            alpha, beta = zeroes
-                            st.info(f"**Sum of zeroes:** {alpha} + {beta} = {alpha + beta}")
-                            st.info(f"**-b/a =** -({b})/({a}) = {-b/a}")
-                            st.info(f"**Product of zeroes:** {alpha} × {beta} = {alpha * beta}")
-                            st.info(f"**c/a =** {c}/{a} = {c/a}")
-                        
-                        elif degree == 3 and len(zeroes) == 3:
-                            a, b, c, d = coeffs
-                            alpha, beta, gamma = zeroes
-                            st.info(f"**Sum of zeroes:** {alpha} + {beta} + {gamma} = {alpha + beta + gamma}")
-                            st.info(f"**-b/a =** -({b})/({a}) = {-b/a}")
-                            st.info(f"**Sum of products (two at a time):** {alpha*beta + beta*gamma + gamma*alpha}")
-                            st.info(f"**c/a =** {c}/{a} = {c/a}")
-                            st.info(f"**Product of zeroes:** {alpha} × {beta} × {gamma} = {alpha * beta * gamma}")
-                            st.info(f"**-d/a =** -({d})/({a}) = {-d/a}")
+                            # Relationships with the coefficients, complex zeroes included
+                            show_relations(relations(poly, analysis))
                     
-                    else:
-                        st.warning("No zeroes found symbolically. The polynomial may have no real zeroes.")
+                        else:
+                            st.warning("No zeroes found symbolically. The polynomial may have no real zeroes.")
                 
-                else:
-                    st.warning("This tool supports polynomials up to degree 3 only.")
+                    else:
+                        # Zeroes are found numerically, each with a guaranteed error bound
+                        analysis = analyze(poly, cancel=rerun_requested)
+                        roots = analysis.roots
+                    
+                        st.success(f"**Polynomial:** {poly}")
+                        st.success(f"**Degree:** {degree}")
+                    
+                        n_real = sum(r.multiplicity for r in roots if r.real)
+                        st.info(f"**Real zeroes:** {n_real} • **Non-real zeroes:** {degree - n_real} "
+                                "(counted with multiplicity)")
+                        if not all(r.isolated for r in roots):
+                            st.warning("Some zeroes are too sensitive to rounding to separate; "
+                                       "they are shown with wide error bounds.")
+                    
+                        def show_zero(z):
+                            if isinstance(z, complex):
+                                return f"{z.real:.10g} {'+' if z.imag >= 0 else '−'} {abs(z.imag):.10g}i"
+                            return f"{z:.10g}"
+                    
+                        rows = ["| Zero | Multiplicity | Error bound | Type |", "|---|---|---|---|"]
+                        for r in roots:
+                            bound = "exact" if r.radius == 0 else f"± {r.radius:.1e}"
+                            rows.append(f"| {show_zero(r.value)} | {r.multiplicity} | {bound} | "
+                                        f"{'real' if r.real else 'complex'} |")
+                        st.markdown("\n".join(rows))
+                    
+                        # Every Vieta relation, each within the error bound of the zeroes above
+                        show_relations(relations(poly, analysis))
             
-            except Exception as e:
-                st.error(f"Error: {e}")
+                except SolveCancelled:
+                    # Newer input is waiting; its rerun shows the result.
+                    pass
+                except Exception as e:
+                    st.error(f"Error: {e}")
+        
+        zero_finder()
+
+# Debug panel (opt-in)
+rerun_stats = st.session_state.get("rerun_stats")
+if st.sidebar.checkbox("Show debug panel", value=False, key="debug_panel"):
+    import pandas as pd
+    from polytools.analysis import cache_stats, pool_stats, service_stats, store_stats
+    
+    with st.sidebar.expander("Debug", expanded=True):
+        st.markdown("**Polynomial caches**")
+        stats = cache_stats()
+        st.table(pd.DataFrame(stats).T[["size", "hits", "misses", "hit_rate", "coalesced", "evictions", "expirations"]])
+        disk = store_stats()
+        if disk is not None:
+            st.markdown("**Solve store** (on disk)")
+            st.table(pd.DataFrame([disk]).T.rename(columns={0: "value"}))
+        st.markdown("**Solver pool**")
+        st.table(pd.DataFrame([pool_stats()]).T.rename(columns={0: "value"}))
+        service = service_stats()
+        if service is not None:
+            st.markdown("**Solver service**")
+            st.table(pd.DataFrame([{k: str(v) for k, v in service.items()}]).T.rename(columns={0: "value"}))
+        if rerun_stats is not None:
+            st.markdown("**Reruns** (as of the last full run)")
+            st.table(pd.DataFrame([rerun_stats.summary()]).T.rename(columns={0: "value"}))
+            st.table(pd.DataFrame(rerun_stats.tool_table()).T)
+        last = st.session_state.get("last_timings")
+        if last is not None:
+            from polytools.metrics import STAGES
+            st.markdown(f"**Last rerun** ({last['section']}, {last['scope']})")
+            rows = {name: last.get(name, 0.0) for name in (*STAGES, "other", "total")}
+            st.table(pd.DataFrame([rows]).T.rename(columns={0: "ms"}))
+        from polytools import memory
+        st.markdown("**Memory**")
+        memory_rows = {**memory.get_session_budget(st.session_state).summary(), **memory.process_summary()}
+        st.table(pd.DataFrame([{k: str(v) for k, v in memory_rows.items()}]).T.rename(columns={0: "value"}))
+        if MEMORY_PROFILE:
+            st.markdown("**Allocations per run** (tracemalloc)")
+            st.table(pd.DataFrame(memory.profile_table()).T)
+            columns = ["line", "bytes", "blocks"]
+            for scope, profile in list(memory.profiles.items()):
+                if profile.top:
+                    st.markdown(f"Sampled run of {scope}")
+                    st.table(pd.DataFrame(profile.top[:5], columns=columns))
+            # A whole-process snapshot takes seconds; only on request.
+            if st.button("Top allocators"):
+                st.table(pd.DataFrame(memory.top_allocators(), columns=columns))
 
 # Footer
 st.markdown("---")
@@ -885,3 +1052,12 @@ st.markdown("""
     <p>Use this app as a comprehensive guide to understand polynomials, their zeroes, and the relationship with coefficients.</p>
 </div>
 """, unsafe_allow_html=True)
+
+if rerun_stats is not None:
+    rerun_stats.end_run()
+
+if timing is not None:
+    st.session_state["last_timings"] = dict(metrics.end() or {}, section=section, scope="full")
+
+if MEMORY_PROFILE:
+    memory.end(memory_run)
@@ -0,0 +1,109 @@
+"""Server CPU per rerun: Matplotlib PNG rasterisation vs a Vega-Lite spec.
+
+The direct comparison times what each backend does on the server for one
+slider change of the Graph Plotter: ``LineChart.update`` plus the PNG encode
+``st.pyplot`` performs (``dpi=200``, ``bbox_inches="tight"``), against
+``line_chart_spec`` plus JSON serialisation. It also reports payload size.
+
+``--apptest N`` additionally drives N slider changes through the real page
+with Streamlit's ``AppTest`` under each ``POLYTOOLS_CHART_BACKEND``, in a
+fresh interpreter per backend.
+
+    python benchmarks/bench_chart_backends.py [--reruns 200] [--apptest 50]
+"""
+
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+_APPTEST = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=120).run()
+at.sidebar.radio[0].set_value("Interactive Tools").run()
+at.selectbox[0].set_value("Cubic (ax³+bx²+cx+d)").run()
+n = int(sys.argv[2])
+start = time.process_time()
+for i in range(n):
+    at.slider[2].set_value(round(-5 + 10 * i / n, 1)).run()
+assert not at.exception, at.exception
+print(json.dumps({"cpu_ms": (time.process_time() - start) / n * 1000}))
+"""
+
+
+def sample(i, n):
+    x = np.linspace(-10, 10, 400)
+    c = -5 + 10 * i / n
+    y = x**3 + c * x
+    zeroes = [0.0] + ([np.sqrt(-c), -np.sqrt(-c)] if c < 0 else [])
+    return dict(x=x, y=y, title=f"Graph of y = x³ + {c:.1f}x", label="cubic", zeroes=zeroes,
+                zero_labels=[f"Zero at x = {z:.2f}" for z in zeroes],
+                xlim=(-10, 10), ylim=(min(-20, y.min()), max(20, y.max())))
+
+
+def bench_matplotlib(reruns):
+    import matplotlib
+    matplotlib.use("Agg")
+    from polytools.plotting import LineChart
+
+    chart = LineChart(figsize=(10, 6), label_fontsize=12, title_fontsize=14)
+    size = 0
+    start = time.process_time()
+    for i in range(reruns):
+        fig = chart.update(**sample(i, reruns))
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", dpi=200, bbox_inches="tight")
+        size = buf.getbuffer().nbytes
+    return (time.process_time() - start) / reruns * 1000, size
+
+
+def bench_vega(reruns):
+    from polytools.vega import line_chart_spec
+
+    size = 0
+    start = time.process_time()
+    for i in range(reruns):
+        payload = json.dumps(line_chart_spec(**sample(i, reruns)))
+        size = len(payload.encode())
+    return (time.process_time() - start) / reruns * 1000, size
+
+
+def bench_apptest(backend, reruns):
+    env = dict(os.environ, POLYTOOLS_CHART_BACKEND=backend)
+    proc = subprocess.run([sys.executable, "-c", _APPTEST, os.path.join(ROOT, "app.py"), str(reruns)],
+                          capture_output=True, text=True, cwd=ROOT, env=env, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])["cpu_ms"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=200)
+    parser.add_argument("--apptest", type=int, default=0, metavar="N",
+                        help="also time N full-page reruns per backend through AppTest")
+    args = parser.parse_args()
+
+    mpl_ms, mpl_bytes = bench_matplotlib(args.reruns)
+    vega_ms, vega_bytes = bench_vega(args.reruns)
+    print(f"{'backend':12} {'cpu ms/rerun':>13} {'payload KB':>11}")
+    print(f"{'matplotlib':12} {mpl_ms:13.2f} {mpl_bytes / 1024:11.1f}")
+    print(f"{'vega':12} {vega_ms:13.2f} {vega_bytes / 1024:11.1f}")
+    print(f"vega uses {mpl_ms / vega_ms:.1f}x less server CPU per chart")
+
+    if args.apptest:
+        print()
+        print(f"{'full rerun (AppTest)':24} {'cpu ms/rerun':>13}")
+        for backend in ("matplotlib", "vega"):
+            print(f"{backend:24} {bench_apptest(backend, args.apptest):13.2f}")
+
+
+if __name__ == "__main__":
+    main()
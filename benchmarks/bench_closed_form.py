@@ -0,0 +1,81 @@
+"""Benchmark: closed-form quadratic and cubic zeroes against the textbook formulas.
+
+Compares ``polytools.closed_form.solve_closed_form`` with
+``(-b ± sqrt(D)) / 2a`` on quadratics where ``b^2 >> 4ac`` (relative error
+of the small zero), with ``np.roots`` on classifying repeated and nearly
+repeated cubic zeroes from slider-style decimal coefficients, and reports
+the time per call.
+
+    python benchmarks/bench_closed_form.py
+"""
+
+import math
+import os
+import sys
+import time
+from fractions import Fraction
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from polytools.closed_form import solve_closed_form
+
+
+def us(fn, number=2000):
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return (time.perf_counter() - start) / number * 1e6
+
+
+def naive_quadratic(a, b, c):
+    root = math.sqrt(b * b - 4 * a * c)
+    return sorted([(-b - root) / (2 * a), (-b + root) / (2 * a)])
+
+
+def main():
+    print("quadratic x^2 + b x + 1, small zero (exact value -1/b - 1/b^3 - ...)")
+    print(f"{'b':>8} {'naive rel. error':>17} {'closed form rel. error':>23}")
+    for b in (1e2, 1e4, 1e6, 1e8):
+        small = Fraction(-1) / Fraction(b)
+        # Series -1/b - 1/b^3 - 2/b^5 - 5/b^7; later terms are below float precision.
+        exact = float(small + small ** 3 + 2 * small ** 5 + 5 * small ** 7)
+        naive = naive_quadratic(1.0, b, 1.0)[1]
+        stable = float(solve_closed_form([1.0, b, 1.0])[1][0])
+        print(f"{b:8.0e} {abs(naive - exact) / abs(exact):17.2e} {abs(stable - exact) / abs(exact):23.2e}")
+
+    # (x - r)^2 (x - s) and (x - r)^3 with decimal coefficients, as typed in the app.
+    cases = {
+        "(x - 1)^2 (x + 2)": ([1.0, 0.0, -3.0, 2.0], 2),
+        "(x - 0.1)^2 (x - 0.3)": ([1.0, -0.5, 0.07, -0.003], 2),
+        "(x - 0.3)^3": ([1.0, -0.9, 0.27, -0.027], 1),
+        "(x + 1.1)^3": ([1.0, 3.3, 3.63, 1.331], 1),
+        "0.1x^3 - 0.3x^2 + 0.3x - 0.1": ([0.1, -0.3, 0.3, -0.1], 1),
+    }
+    print()
+    print("all zeroes real; distinct zeroes found, and how many np.roots calls non-real")
+    print(f"{'cubic':32} {'distinct':>9} {'closed form':>12} {'np.roots':>9} {'non-real':>9}")
+    for name, (coeffs, distinct) in cases.items():
+        found = solve_closed_form(coeffs, decimal=True)
+        assert len(found) == distinct, (name, found)
+        roots = np.roots(coeffs)
+        real = roots[np.abs(roots.imag) < 1e-10]
+        print(f"{name:32} {distinct:9} {len(found):12} {len(np.unique(real.real)):9} {3 - real.size:9}")
+
+    print()
+    print(f"{'call':40} {'us':>8}")
+    timings = [
+        ("quadratic, rational zeroes", lambda: solve_closed_form([1.0, -3.0, -4.0], decimal=True)),
+        ("quadratic, irrational zeroes", lambda: solve_closed_form([1.0, 0.0, -2.0], decimal=True)),
+        ("cubic, rational zeroes", lambda: solve_closed_form([2.0, -5.0, -14.0, 8.0], decimal=True)),
+        ("cubic, three irrational real zeroes", lambda: solve_closed_form([1.0, 0.0, -3.0, 1.0], decimal=True)),
+        ("cubic, binary floats (no rational search)", lambda: solve_closed_form([1.0, 0.0, -3.0, 1.0])),
+        ("np.roots on the same cubic", lambda: np.roots([1.0, 0.0, -3.0, 1.0])),
+    ]
+    for name, fn in timings:
+        print(f"{name:40} {us(fn):8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Compare the SymPy Poly path used by the Interactive Tools tabs with polytools.
+
+Run from the repository root:
+
+    python benchmarks/bench_core.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sympy as sp
+
+from polytools import Polynomial
+
+CASES = [
+    "x**2 - 3*x - 4",
+    "x**2 + 7*x + 10",
+    "2*x**3 - 5*x**2 - 14*x + 8",
+    "6*x**2 - 7*x - 3",
+    "7*x**6 - 3*x**4/2 + 4*x**2 + x - 8",
+]
+
+x = sp.symbols("x")
+
+
+def sympy_path(expr):
+    # What the Analyzer does on every rerun: two Poly constructions, then
+    # evaluation, derivative and the Vieta ratios.
+    degree = sp.Poly(expr, x).degree()
+    coeffs = sp.Poly(expr, x).all_coeffs()
+    expr.subs(x, 2)
+    sp.diff(expr, x)
+    [(-1) ** k * c / coeffs[0] for k, c in enumerate(coeffs[1:], start=1)]
+    return degree
+
+
+def polytools_path(coeffs):
+    poly = Polynomial(coeffs)
+    poly.degree
+    poly.all_coeffs()
+    poly(2)
+    poly.derivative()
+    poly.vieta()
+    return poly.degree
+
+
+def bench(fn, arg, number):
+    best = min(timeit.repeat(lambda: fn(arg), number=number, repeat=5))
+    return best / number * 1e6
+
+
+def main():
+    print(f"{'polynomial':40} {'sympy us':>10} {'polytools us':>13} {'speedup':>8}")
+    for text in CASES:
+        expr = sp.sympify(text)
+        coeffs = sp.Poly(expr, x).all_coeffs()
+        old = bench(sympy_path, expr, 200)
+        new = bench(polytools_path, coeffs, 2000)
+        print(f"{text:40} {old:10.1f} {new:13.1f} {old / new:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
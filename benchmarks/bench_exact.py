@@ -0,0 +1,63 @@
+"""Benchmark: the exact rational fast path against sp.solve.
+
+Times ``polytools.analysis.solve_rational`` (rational root theorem, no
+SymPy) against ``sp.solve`` on the textbook polynomials and on products of
+random rational linear factors up to degree 30, and checks that real-root
+isolation counts the three real zeroes of ``x^3 - 3x + 1``, which SymPy's
+``is_real`` cannot decide.
+
+    python benchmarks/bench_exact.py
+"""
+
+import os
+import random
+import sys
+import time
+from fractions import Fraction
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from polytools.analysis import solve_rational
+from polytools.exact import isolate_real_roots
+from polytools.parser import parse_polynomial
+from polytools.polynomial import Polynomial
+
+TEXTBOOK = ["x^2 - 3x - 4", "6x^2 - 7x - 3", "4s^2 - 4s + 1", "x^2 - 2x - 8",
+            "x^3 - 6x^2 + 11x - 6", "2x^3 - 5x^2 - 14x + 8"]
+
+
+def ms(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def main():
+    import sympy as sp
+
+    random.seed(0)
+    cases = [(text, parse_polynomial(text)) for text in TEXTBOOK]
+    for n in (10, 20, 30):
+        roots = [Fraction(random.randint(-20, 20), random.randint(1, 6)) for _ in range(n)]
+        cases.append((f"degree {n}, rational zeroes", Polynomial.from_roots(roots)))
+
+    print(f"{'polynomial':30} {'fast path ms':>13} {'sp.solve ms':>12}")
+    for name, poly in cases:
+        expr = poly.as_expr()
+        x = poly.to_sympy().gens[0]
+        fast = solve_rational(poly)
+        assert fast is not None and sorted(fast[0]) == sorted(Fraction(str(z)) for z in sp.solve(expr, x))
+        print(f"{name:30} {ms(lambda: solve_rational(poly)):13.3f} {ms(lambda: sp.solve(expr, x), 1):12.1f}")
+
+    x = sp.Symbol("x")
+    print("is_real of sp.solve(x^3 - 3x + 1):", [z.is_real for z in sp.solve(x**3 - 3 * x + 1, x)])
+    intervals = isolate_real_roots([1, 0, -3, 1])
+    assert len(intervals) == 3
+    print("isolating intervals:", [(str(r.lo), str(r.hi)) for r in intervals])
+
+
+if __name__ == "__main__":
+    main()
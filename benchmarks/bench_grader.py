@@ -0,0 +1,79 @@
+"""Benchmark: bulk grading throughput of polytools.grader.
+
+Builds a bank of generated Exercise 1 and 2 style problems, simulates
+``--count`` student submissions (right answers in any order, sign slips,
+a lone zero, sums and scaled polynomials) and grades them in this process.
+It reports answers per minute, how many distinct answers actually had to
+be graded, and the time to grade each of those from scratch.
+
+    python benchmarks/bench_grader.py [--count N]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from fractions import Fraction
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from polytools.generator import generate
+from polytools.grader import Grader, grade
+from polytools.questions import QuestionBank
+
+
+def submissions(questions, count, rng):
+    for _ in range(count):
+        q = rng.choice(questions)
+        student, r = f"s{rng.randrange(5000)}", rng.random()
+        if q["kind"] == "from_sum_product":
+            k = rng.choice([1, 1, 2, -3])
+            coeffs = [k * int(c) for c in q["id"].rsplit("-", 1)[1].split("_")]
+            answer = q["answer"] if r < 0.6 else " + ".join(f"{c}x^{2 - i}" for i, c in enumerate(coeffs))
+            yield {"student": student, "question": q["id"], "answer": answer}
+        elif r < 0.8:
+            zeroes = q["zeroes"][::-1] if r < 0.4 else q["zeroes"]
+            if r > 0.6:
+                zeroes = [str(-Fraction(z)) for z in zeroes]
+            yield {"student": student, "question": q["id"], "answer": ", ".join(zeroes)}
+        else:
+            total = sum(Fraction(z) for z in q["zeroes"])
+            yield {"student": student, "question": q["id"], "part": "sum", "answer": str(total)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    problems = [generate(1500, max_numerator=20, denominators=(1, 2, 3), max_leading=2, seed=1),
+                generate(500, "from_sum_product", denominators=(1, 2, 3), seed=2)]
+    with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as fh:
+        questions = [q for p in problems for q in p.questions()]
+        fh.writelines(json.dumps(q) + "\n" for q in questions)
+    try:
+        rows = list(submissions(questions, args.count, random.Random(0)))
+        start = time.perf_counter()
+        report = grade(iter(rows), bank_path=fh.name)
+        elapsed = time.perf_counter() - start
+        summary = report.summary()
+        print(f"{args.count} answers in {elapsed:.2f}s ({args.count / elapsed * 60:,.0f}/min): "
+              f"{summary['correct']} correct, {summary['wrong']} wrong, {summary['invalid']} invalid")
+
+        grader = Grader(QuestionBank(fh.name))
+        distinct = {(r["question"], r["answer"], r.get("part")) for r in rows}
+        start = time.perf_counter()
+        for item in distinct:
+            grader.grade(*item)
+        elapsed = time.perf_counter() - start
+        print(f"{len(distinct)} distinct answers graded from scratch in {elapsed:.2f}s "
+              f"({elapsed / len(distinct) * 1e6:.0f} µs each, references included)")
+    finally:
+        os.unlink(fh.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Micro-benchmark: polytools.horner against the app's hand-written expressions.
+
+Compares ``a * x**3 + b * x**2 + c * x + d`` (what the Graph Plotter used)
+with ``horner`` into a fresh and into a preallocated buffer, and a loop of
+single evaluations with one ``horner_batch`` call over a coefficient matrix.
+
+    python benchmarks/bench_horner.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from polytools.horner import horner, horner_batch
+
+
+def us(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=7)) / number * 1e6
+
+
+def main():
+    x = np.linspace(-10, 10, 400)
+    a, b, c, d = 1.0, -0.5, -4.0, 2.0
+    out = np.empty_like(x)
+
+    assert np.allclose(horner([a, b, c, d], x), a * x**3 + b * x**2 + c * x + d)
+    rows = [
+        ("cubic expression", us(lambda: a * x**3 + b * x**2 + c * x + d, 20000)),
+        ("cubic np.polyval", us(lambda: np.polyval([a, b, c, d], x), 20000)),
+        ("cubic horner", us(lambda: horner([a, b, c, d], x), 20000)),
+        ("cubic horner (out=)", us(lambda: horner([a, b, c, d], x, out=out), 20000)),
+        ("quadratic expression", us(lambda: a * x**2 + b * x + c, 20000)),
+        ("quadratic horner (out=)", us(lambda: horner([a, b, c], x, out=out), 20000)),
+    ]
+
+    rng = np.random.default_rng(0)
+    for m, degree in [(100, 3), (1000, 5)]:
+        coeffs = rng.uniform(-5, 5, size=(m, degree + 1))
+        batch_out = np.empty((m, x.size))
+        assert np.allclose(horner_batch(coeffs, x), [np.polyval(row, x) for row in coeffs])
+        rows.append((f"{m} x deg {degree}: polyval loop", us(lambda: [np.polyval(row, x) for row in coeffs], 20)))
+        rows.append((f"{m} x deg {degree}: horner_batch", us(lambda: horner_batch(coeffs, x, out=batch_out), 20)))
+
+    print(f"{'case':36} {'us/call':>10}")
+    for name, value in rows:
+        print(f"{name:36} {value:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
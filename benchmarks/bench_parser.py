@@ -0,0 +1,80 @@
+"""Parse throughput of polytools.parse_polynomial against sp.sympify.
+
+``sp.sympify`` cannot read implicit multiplication ("3x"), so it is given the
+explicit ``*``/``**`` spelling of each input. Adversarial inputs that would
+make SymPy expand or allocate without bound are only fed to the fast parser,
+which must reject them quickly.
+
+    python benchmarks/bench_parser.py
+"""
+
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sympy as sp
+
+from polytools import PolynomialSyntaxError, parse_polynomial
+
+# (fast-parser text, sympify text)
+TYPICAL = [
+    ("x^2 - 3x - 4", "x**2 - 3*x - 4"),
+    ("x^2 + 7x + 10", "x**2 + 7*x + 10"),
+    ("x^2 - 2x - 8", "x**2 - 2*x - 8"),
+    ("4s^2 - 4s + 1", "4*s**2 - 4*s + 1"),
+    ("6x^2 - 3 - 7x", "6*x**2 - 3 - 7*x"),
+    ("4u² + 8u", "4*u**2 + 8*u"),
+    ("t^2 - 15", "t**2 - 15"),
+    ("3x^2 - x - 4", "3*x**2 - x - 4"),
+    ("2x^3 - 5x^2 - 14x + 8", "2*x**3 - 5*x**2 - 14*x + 8"),
+    ("x^2 - 1/4x - 1", "x**2 - x/4 - 1"),
+    ("(x - 1)(x + 2)(x - 3)", "(x - 1)*(x + 2)*(x - 3)"),
+    ("7u⁶ - 3/2u⁴ + 4u² + u - 8", "7*u**6 - 3*u**4/2 + 4*u**2 + u - 8"),
+]
+
+ADVERSARIAL = [
+    "x^999999999",
+    "(x + 1)^100000",
+    "(3x/7 + 11/13)^1000",
+    "9" * 1999,
+    "(" * 200 + "x" + ")" * 200,
+    "x" * 1500,
+    "__import__('os').system('true')",
+    "x^2 + " * 300 + "1",
+]
+
+
+def per_call_us(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    print(f"{'input':32} {'sympify us':>11} {'parser us':>10} {'speedup':>8}")
+    total_old = total_new = 0.0
+    for fast, slow in TYPICAL:
+        old = per_call_us(lambda: sp.sympify(slow), 200)
+        new = per_call_us(lambda: parse_polynomial(fast), 2000)
+        total_old += old
+        total_new += new
+        print(f"{fast:32} {old:11.1f} {new:10.1f} {old / new:7.1f}x")
+    print(f"{'corpus total':32} {total_old:11.1f} {total_new:10.1f} {total_old / total_new:7.1f}x")
+
+    print()
+    print(f"{'adversarial input':32} {'parser us':>10}  result")
+    for text in ADVERSARIAL:
+        start = time.perf_counter()
+        try:
+            poly = parse_polynomial(text)
+            result = f"accepted, degree {poly.degree}"
+        except PolynomialSyntaxError as exc:
+            result = f"rejected: {exc}"
+        elapsed = (time.perf_counter() - start) * 1e6
+        label = text if len(text) <= 32 else text[:29] + "..."
+        print(f"{label:32} {elapsed:10.1f}  {result[:60]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark: polytools.roots.find_roots against np.roots and sp.solve.
+
+Random integer-coefficient polynomials of degree 5 to 500. For each degree
+prints the time of each method, the widest certified error bound from
+``find_roots`` and the largest distance from an ``np.roots`` zero to the
+nearest ``find_roots`` zero. ``sp.solve`` (with ``evalf`` of the results) is
+only run up to degree 10, which already takes tens of seconds. Also checks that
+repeated zeroes are found with the right multiplicity.
+
+    python benchmarks/bench_roots.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from polytools.polynomial import Polynomial
+from polytools.roots import find_roots
+
+DEGREES = [5, 10, 20, 50, 100, 200, 500]
+SYMPY_MAX_DEGREE = 10
+
+
+def ms(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def sympy_roots(coeffs):
+    import sympy as sp
+
+    x = sp.Symbol("x")
+    expr = sp.Poly([int(c) for c in coeffs], x).as_expr()
+    return [complex(z.evalf()) for z in sp.solve(expr, x)]
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'degree':>6} {'find_roots ms':>14} {'np.roots ms':>12} {'sp.solve ms':>12} "
+          f"{'max bound':>10} {'max diff':>10}")
+    for n in DEGREES:
+        coeffs = rng.integers(-9, 10, n + 1).astype(float)
+        coeffs[0] = rng.integers(1, 10)
+        coeffs[-1] = rng.integers(1, 10)
+        roots = find_roots(coeffs)
+        assert sum(r.multiplicity for r in roots) == n
+        ours = np.array([complex(r.value) for r in roots])
+        theirs = np.roots(coeffs)
+        diff = max(np.min(np.abs(ours - z)) for z in theirs)
+        t_ours = ms(lambda: find_roots(coeffs))
+        t_numpy = ms(lambda: np.roots(coeffs))
+        t_sympy = f"{ms(lambda: sympy_roots(coeffs), 1):12.1f}" if n <= SYMPY_MAX_DEGREE else f"{'-':>12}"
+        bound = max(r.radius for r in roots)
+        print(f"{n:6d} {t_ours:14.1f} {t_numpy:12.1f} {t_sympy} {bound:10.1e} {diff:10.1e}")
+
+    # (x - 1)^3 (x + 2)^2 (x^2 + 1)
+    coeffs = np.polymul(Polynomial.from_roots([1, 1, 1, -2, -2]).coeffs, [1, 0, 1])
+    found = sorted((r.multiplicity, r.real) for r in find_roots(coeffs))
+    assert found == [(1, False), (1, False), (2, True), (3, True)], found
+    print("multiplicities of (x - 1)^3 (x + 2)^2 (x^2 + 1): 3, 2, 1, 1")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Check and time adaptive curve sampling against the fixed 400-point grid.
+
+For the textbook examples, reports how many points ``adaptive_sample`` uses,
+its worst chord error against a dense reference grid (as a fraction of the
+visible y-range), and whether repeated zeroes are hit exactly.
+
+    python benchmarks/bench_sampling.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from polytools.horner import horner
+from polytools.sampling import TOLERANCE, adaptive_sample
+
+CASES = [
+    ("x^2 - 3x - 4", [1, -3, -4], (-20, 20)),
+    ("6x^2 - 7x - 3", [6, -7, -3], (-20, 20)),
+    ("4s^2 - 4s + 1", [4, -4, 1], (-20, 20)),
+    ("x^3 - 6x^2 + 11x - 6", [1, -6, 11, -6], (-20, 20)),
+    ("2x + 3", [2, 3], (-10, 10)),
+]
+
+
+def screen_error(coeffs, x, y, ylim):
+    """Worst gap between the piecewise-linear curve and the true curve, on screen."""
+    dense = np.linspace(-10, 10, 200001)
+    true = np.clip(horner(coeffs, dense), *ylim)
+    drawn = np.clip(np.interp(dense, x, y), *ylim)
+    return float(np.max(np.abs(true - drawn)) / (ylim[1] - ylim[0]))
+
+
+def main():
+    print(f"{'polynomial':24} {'points':>6} {'max error':>10} {'grid error':>10} {'us/call':>9}")
+    grid = np.linspace(-10, 10, 400)
+    for name, coeffs, ylim in CASES:
+        x, y = adaptive_sample(coeffs, ylim=ylim)
+        error = screen_error(coeffs, x, y, ylim)
+        grid_error = screen_error(coeffs, grid, horner(coeffs, grid), ylim)
+        cost = min(timeit.repeat(lambda: adaptive_sample(coeffs, ylim=ylim), number=200, repeat=5)) / 200 * 1e6
+        print(f"{name:24} {x.size:6d} {error:10.2e} {grid_error:10.2e} {cost:9.1f}")
+        assert error <= 2 * TOLERANCE, name
+
+    x, y = adaptive_sample([4, -4, 1], ylim=(-20, 20))
+    assert 0.5 in x and y[np.searchsorted(x, 0.5)] == 0.0
+    print("repeated zero of 4s^2 - 4s + 1 sampled exactly at s = 0.5")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Import-time and cold-start benchmark for app.py.
+
+Every measurement runs in a fresh interpreter so nothing is already imported:
+
+* ``python -X importtime -c "import <module>"`` for each heavy dependency,
+  reporting the cumulative import time of the top-level module;
+* a cold render of each sidebar section through Streamlit's ``AppTest``,
+  reporting wall time and which heavy modules the section ended up loading.
+
+Pass ``--record`` to append the results as one JSON line to
+``benchmarks/results/startup.jsonl`` (or ``--record PATH``) so they can be
+tracked over time.
+
+    python benchmarks/bench_startup.py [--record [PATH]]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_RECORD = os.path.join(ROOT, "benchmarks", "results", "startup.jsonl")
+
+MODULES = ["streamlit", "numpy", "sympy", "matplotlib.pyplot", "pandas", "polytools", "polytools.analysis"]
+HEAVY = ["numpy", "sympy", "matplotlib.pyplot", "pandas", "polytools"]
+SECTIONS = [
+    "Introduction",
+    "Geometrical Meaning of Zeroes",
+    "Zeroes & Coefficients Relationship",
+    "Important Points & Formulas",
+    "Practice Questions",
+    "Answer Key",
+    "Interactive Tools",
+]
+
+# Runs in the child interpreter: render one section cold and report.
+_RENDER = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+at.run()
+if sys.argv[2] != "Introduction":
+    at.sidebar.radio[0].set_value(sys.argv[2]).run()
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "exception": bool(at.exception),
+                  "loaded": [m for m in sys.argv[3:] if m in sys.modules]}))
+"""
+
+
+def import_time(module):
+    """Cumulative import time of ``module`` in microseconds."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, cwd=ROOT, check=True)
+    top = module.split(".")[0]
+    total = 0
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            total = int(parts[1])
+        elif len(parts) == 3 and parts[2].strip() == top and total == 0:
+            total = int(parts[1])
+    return total
+
+
+def cold_render(section):
+    proc = subprocess.run([sys.executable, "-c", _RENDER, os.path.join(ROOT, "app.py"), section, *HEAVY],
+                          capture_output=True, text=True, cwd=ROOT, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--record", nargs="?", const=DEFAULT_RECORD, metavar="PATH",
+                        help="append results as a JSON line")
+    args = parser.parse_args()
+
+    imports = {}
+    print(f"{'module':24} {'import ms':>10}")
+    for module in MODULES:
+        imports[module] = import_time(module) / 1000
+        print(f"{module:24} {imports[module]:10.1f}")
+
+    renders = {}
+    print()
+    print(f"{'section (cold)':36} {'seconds':>8}  heavy modules loaded")
+    for section in SECTIONS:
+        renders[section] = cold_render(section)
+        result = renders[section]
+        flag = "  EXCEPTION" if result["exception"] else ""
+        print(f"{section:36} {result['seconds']:8.2f}  {', '.join(result['loaded']) or '-'}{flag}")
+
+    if args.record:
+        os.makedirs(os.path.dirname(args.record), exist_ok=True)
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, cwd=ROOT).stdout.strip()
+        entry = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "commit": commit,
+                 "python": sys.version.split()[0], "import_ms": imports,
+                 "cold_render_s": {k: v["seconds"] for k, v in renders.items()}}
+        with open(args.record, "a") as fh:
+            fh.write(json.dumps(entry) + "\n")
+        print(f"\nrecorded to {args.record}")
+
+
+if __name__ == "__main__":
+    main()
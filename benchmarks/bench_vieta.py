@@ -0,0 +1,88 @@
+"""Benchmark: Vieta's relations for any degree.
+
+Times ``polytools.vieta.relations`` on polynomials with rational zeroes
+(exact check) and with random coefficients, so real and complex zeroes
+(bounded check), and ``elementary_symmetric`` against summing over
+every product of ``k`` zeroes (``itertools.combinations``), which is
+exponential. Also checks that the numeric error bounds contain the exact
+sums of zeroes known as fractions, and that a coefficient perturbed by
+more than the bound makes a relation fail. The bounds are a priori: they
+grow like the sums of products of ``|z|``, so for random polynomials of
+high degree they are loose.
+
+    python benchmarks/bench_vieta.py
+"""
+
+import itertools
+import math
+import os
+import random
+import sys
+import time
+from fractions import Fraction
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from polytools import vieta
+from polytools.polynomial import Polynomial
+from polytools.roots import find_roots
+
+
+def ms(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def by_combinations(values):
+    return [sum(math.prod(c) for c in itertools.combinations(values, k))
+            for k in range(1, len(values) + 1)]
+
+
+def main():
+    rng = np.random.default_rng(0)
+    random.seed(0)
+
+    vieta.relations(Polynomial([1, -3, -4]))  # import SymPy and the solvers once
+    print(f"{'degree':>6} {'exact ms':>9} {'numeric ms':>11} {'all hold':>9} {'max bound':>10}")
+    for n in (2, 3, 5, 10, 20, 50, 100, 200, 500):
+        exact = Polynomial.from_roots([Fraction(random.randint(-9, 9), random.randint(1, 3))
+                                       for _ in range(n)])
+        numeric = Polynomial(rng.standard_normal(n + 1).tolist())
+        t_exact = ms(lambda: (vieta._cache.clear(), vieta.relations(exact)), 1)
+        t_numeric = ms(lambda: (vieta._cache.clear(), vieta.relations(numeric)), 1)
+        checks = vieta.relations(exact) + vieta.relations(numeric)
+        bound = max(r.error for r in vieta.relations(numeric))
+        print(f"{n:6} {t_exact:9.2f} {t_numeric:11.2f} {str(all(r.holds for r in checks)):>9} {bound:10.1e}")
+
+    print(f"\n{'zeroes':>6} {'recurrence ms':>14} {'combinations ms':>16}")
+    for n in (8, 12, 16, 18):
+        values = [Fraction(random.randint(-9, 9), random.randint(1, 5)) for _ in range(n)]
+        assert vieta.elementary_symmetric(values) == by_combinations(values)
+        print(f"{n:6} {ms(lambda: vieta.elementary_symmetric(values)):14.3f} "
+              f"{ms(lambda: by_combinations(values), 1):16.1f}")
+
+    # Bounds around float zeroes contain the exact sums.
+    for n in (5, 20, 60):
+        values = [Fraction(random.randint(-40, 40), random.randint(1, 7)) for _ in range(n)]
+        sums, bounds = vieta.symmetric_bounds([float(v) for v in values],
+                                              [abs(float(v) - v) for v in values])
+        for e, bound, true in zip(sums, bounds, vieta.elementary_symmetric(values)):
+            assert abs(Fraction(e.real) - true) <= Fraction(bound) and abs(e.imag) <= bound
+    print("\nbounds contain the exact sums: True")
+
+    poly = Polynomial([1.0, 0.0, 0.0, -3.0, 0.0, 0.0, 0.0, 2.0, 7.0])
+    worst = max(r.error for r in vieta.relations(poly))
+    checks = vieta.relations(poly)
+    perturbed = Polynomial([1.0, 0.0, 0.0, -3.0 + 1e3 * worst, 0.0, 0.0, 0.0, 2.0, 7.0])
+    wrong = vieta._numeric_relations(poly, find_roots(perturbed.coeffs))
+    print("perturbed coefficient detected:", all(r.holds for r in checks) and not all(r.holds for r in wrong))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,463 @@
+"""Load test: many concurrent sessions navigating the app like a classroom.
+
+Each simulated session is a student. It opens the app, then follows a
+random but plausible path: mostly on to the next section, sometimes back
+or straight to the tools. On Geometrical Meaning of Zeroes it drags the
+quadratic's sliders, and on Interactive Tools it types polynomials into
+the calculator and Zero Finder inputs (``poly_input`` / ``poly_input2``).
+Sessions start spread over ``--ramp`` seconds, like the first minutes of
+a period, and wait a random think time between actions.
+
+Two targets:
+
+* ``--target server`` (default) starts ``streamlit run app.py`` on a free
+  local port, or uses ``--url``, and speaks the browser's websocket
+  protocol to it, so all sessions share one server process as in class.
+  Widgets inside a fragment send fragment-scoped reruns, as in a browser.
+* ``--target apptest`` drives each session through Streamlit's ``AppTest``
+  in a process of its own, without a server. All reruns are full reruns,
+  and the RSS is that of every session's copy of the app together.
+
+For every section the report gives rerun latency percentiles (p50, p95,
+p99, max), reruns per second over the whole test, and the peak RSS of the
+app's process tree (solver workers included) sampled while a rerun of
+that section was in flight. Nothing leaves the machine.
+
+    python benchmarks/loadtest.py [--sessions 20] [--steps 15] [--ramp 10]
+                                  [--think 1.0] [--target server|apptest]
+                                  [--url ws://HOST:PORT] [--pid PID]
+                                  [--seed 0] [--json PATH]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+APP = os.path.join(ROOT, "app.py")
+SECTIONS = ["Introduction", "Geometrical Meaning of Zeroes", "Zeroes & Coefficients Relationship",
+            "Important Points & Formulas", "Practice Questions", "Answer Key", "Interactive Tools"]
+GEOMETRY = "Geometrical Meaning of Zeroes"
+TOOLS = "Interactive Tools"
+SECTION_LABEL = "Select Section:"
+# (label, low, high, step) of the quadratic graph's sliders.
+SLIDERS = [("Coefficient a (for ax²+bx+c)", -3.0, 3.0, 0.1),
+           ("Coefficient b (for ax²+bx+c)", -10.0, 10.0, 0.5),
+           ("Constant c (for ax²+bx+c)", -10.0, 10.0, 0.5)]
+# poly_input (Polynomial Analyzer) and poly_input2 (Zero Finder).
+INPUTS = ["Enter polynomial (use x as variable):", "Enter polynomial:"]
+TYPED = ["x^2 - 5x + 6", "2x^2 - 3x - 2", "x^3 - 6x^2 + 11x - 6", "x^2 + 1", "4x^2 - 4x + 1",
+         "x^3 - 2", "3x^2 - x - 4", "t^2 - 15", "x^4 - 5x^2 + 4", "2x^3 - 5x^2 - 14x + 8"]
+SAMPLE_INTERVAL = 0.05
+
+
+def journey(rng, steps):
+    """``steps`` actions of one student: ``(kind, label, value)`` tuples.
+
+    ``kind`` is ``"section"``, ``"slider"`` or ``"text"``.
+    """
+    actions = []
+    section = "Introduction"
+    while len(actions) < steps:
+        r = rng.random()
+        if r < 0.6:
+            section = SECTIONS[(SECTIONS.index(section) + 1) % len(SECTIONS)]
+        elif r < 0.8:
+            section = rng.choice(SECTIONS)
+        else:
+            section = rng.choice([GEOMETRY, TOOLS])
+        actions.append(("section", SECTION_LABEL, section))
+        if section == GEOMETRY:
+            # A drag and a few nudges of one slider, each a rerun.
+            label, low, high, step = rng.choice(SLIDERS)
+            for _ in range(rng.randint(2, 5)):
+                value = round(low + step * rng.randint(0, round((high - low) / step)), 1)
+                actions.append(("slider", label, value))
+        elif section == TOOLS:
+            for _ in range(rng.randint(1, 3)):
+                actions.append(("text", rng.choice(INPUTS), rng.choice(TYPED)))
+    return actions[:steps]
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a sorted list."""
+    return values[max(0, math.ceil(q / 100 * len(values)) - 1)]
+
+
+def tree_rss(pid):
+    """Resident memory in bytes of ``pid`` and all its descendants (Linux ``/proc``)."""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as fh:
+                # The command name may contain spaces; fields resume after ")".
+                ppid = int(fh.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    total, todo = 0, [pid]
+    while todo:
+        current = todo.pop()
+        todo.extend(children.get(current, ()))
+        try:
+            with open(f"/proc/{current}/status") as fh:
+                for line in fh:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            pass
+    return total
+
+
+class Recorder:
+    """Latencies, errors and peak RSS per section; shared by all sessions."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+        self.fragment_runs = {}
+        self.peak_rss = {}
+        self.in_flight = {}
+
+    def start(self, section):
+        with self._lock:
+            self.in_flight[section] = self.in_flight.get(section, 0) + 1
+
+    def finish(self, section, seconds, ok=True, fragment=False):
+        with self._lock:
+            self.in_flight[section] -= 1
+            if ok:
+                self.latencies.setdefault(section, []).append(seconds)
+                if fragment:
+                    self.fragment_runs[section] = self.fragment_runs.get(section, 0) + 1
+            else:
+                self.errors[section] = self.errors.get(section, 0) + 1
+
+    def sample(self, rss):
+        with self._lock:
+            for section, n in self.in_flight.items():
+                if n and rss > self.peak_rss.get(section, 0):
+                    self.peak_rss[section] = rss
+
+    def report(self, elapsed):
+        """Per-section statistics, plus ``"all"``; times in ms, RSS in MB."""
+        rows = {}
+        sections = [s for s in SECTIONS if s in self.latencies or s in self.errors]
+        everything = [t for s in sections for t in self.latencies.get(s, ())]
+        for name, values in [(s, self.latencies.get(s, [])) for s in sections] + [("all", everything)]:
+            values = sorted(values)
+            errors = sum(self.errors.values()) if name == "all" else self.errors.get(name, 0)
+            fragment = (sum(self.fragment_runs.values()) if name == "all"
+                        else self.fragment_runs.get(name, 0))
+            rss = max(self.peak_rss.values(), default=0) if name == "all" else self.peak_rss.get(name, 0)
+            row = {"reruns": len(values), "fragment_reruns": fragment, "errors": errors,
+                   "reruns_per_s": round(len(values) / elapsed, 2) if elapsed else 0.0,
+                   "peak_rss_mb": round(rss / 2 ** 20, 1) if rss else None}
+            if values:
+                row.update({f"p{q}_ms": round(percentile(values, q) * 1e3, 1) for q in (50, 95, 99)})
+                row["max_ms"] = round(values[-1] * 1e3, 1)
+            rows[name] = row
+        return rows
+
+
+def sample_rss(pid, recorder, stop):
+    while not stop.wait(SAMPLE_INTERVAL):
+        recorder.sample(tree_rss(pid))
+
+
+# AppTest target
+
+
+def find_widget(at, kind, label):
+    if kind == "section":
+        return at.sidebar.radio[0]
+    widgets = at.slider if kind == "slider" else at.text_input
+    return next(w for w in widgets if w.label == label)
+
+
+class QueueRecorder:
+    """The :class:`Recorder` interface of a session process: events go to the parent."""
+
+    __slots__ = ("events",)
+
+    def __init__(self, events):
+        self.events = events
+
+    def start(self, section):
+        self.events.put(("start", section))
+
+    def finish(self, section, seconds, ok=True, fragment=False):
+        self.events.put(("finish", section, seconds, ok, fragment))
+
+
+def apptest_session(actions, think, rng, events, timeout):
+    """One session, in a process of its own: ``AppTest`` swaps a process-wide
+    runtime in and out around every run, so two sessions cannot share one."""
+    from streamlit.logger import set_log_level
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import AppTest, local_script_runner
+
+    # AppTest compiles the script on every run, where a server compiles it
+    # once per process; keep one cache like the server does.
+    script_cache = ScriptCache()
+    local_script_runner.ScriptCache = lambda: script_cache
+    # Not a server: silence the warnings about running without one.
+    set_log_level("error")
+
+    recorder = QueueRecorder(events)
+    at = AppTest.from_file(APP, default_timeout=timeout)
+    section = "Introduction"
+    for action in [None] + actions:
+        if action is not None:
+            time.sleep(rng.uniform(0, 2 * think))
+            kind, label, value = action
+            if kind == "section":
+                section = value
+            try:
+                find_widget(at, kind, label).set_value(value)
+            except (IndexError, StopIteration):
+                recorder.start(section)
+                recorder.finish(section, 0.0, ok=False)
+                continue
+        recorder.start(section)
+        start = time.perf_counter()
+        try:
+            at.run()
+            ok = not at.exception
+        except Exception:
+            ok = False
+        recorder.finish(section, time.perf_counter() - start, ok)
+
+
+def run_apptest(plans, args, recorder):
+    import multiprocessing
+
+    events = multiprocessing.Queue()
+
+    def drain():
+        for event in iter(events.get, None):
+            getattr(recorder, event[0])(*event[1:])
+
+    drainer = threading.Thread(target=drain, daemon=True)
+    drainer.start()
+    processes = [multiprocessing.Process(target=apptest_session, name=f"session-{i}",
+                                         args=(actions, args.think, rng, events, args.timeout))
+                 for i, (actions, rng) in enumerate(plans)]
+    start = time.perf_counter()
+    for i, process in enumerate(processes):
+        time.sleep(max(0.0, start + i * args.ramp / len(processes) - time.perf_counter()))
+        process.start()
+    for process in processes:
+        process.join()
+    events.put(None)
+    drainer.join()
+
+
+# Server target
+
+
+class ServerSession:
+    """One browser tab: widget ids learned from the deltas, and their values."""
+
+    def __init__(self, ws):
+        self.ws = ws
+        # label -> (widget id, element type, fragment id)
+        self.widgets = {}
+        self.states = {}
+
+    async def rerun(self, fragment_id=""):
+        """Send a rerun and wait for it to finish; returns ``True`` on success."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        if fragment_id:
+            msg.rerun_script.fragment_id = fragment_id
+        await self.ws.send(msg.SerializeToString())
+        ok = True
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await self.ws.recv())
+            kind = forward.WhichOneof("type")
+            if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type == "exception":
+                    ok = False
+                    continue
+                widget = getattr(element, element_type)
+                if hasattr(widget, "id") and hasattr(widget, "label"):
+                    self.widgets[widget.label] = (widget.id, element_type, forward.delta.fragment_id)
+            elif kind == "script_finished":
+                status = forward.script_finished
+                return ok and status in (ForwardMsg.FINISHED_SUCCESSFULLY,
+                                         ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY)
+
+    def set_value(self, label, value):
+        """Set a widget like the browser does; returns its fragment id, or ``None``."""
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        if label not in self.widgets:
+            return None
+        widget_id, element_type, fragment_id = self.widgets[label]
+        state = WidgetState(id=widget_id)
+        if element_type == "slider":
+            state.double_array_value.data[:] = [value]
+        else:
+            state.string_value = value
+        self.states[widget_id] = state
+        return fragment_id
+
+
+async def server_session(url, actions, think, rng, recorder, timeout):
+    import websockets
+
+    async with websockets.connect(f"{url}/_stcore/stream", subprotocols=["streamlit"],
+                                  max_size=None) as ws:
+        session = ServerSession(ws)
+        section = "Introduction"
+        for action in [None] + actions:
+            fragment_id = ""
+            if action is not None:
+                await asyncio.sleep(rng.uniform(0, 2 * think))
+                kind, label, value = action
+                if kind == "section":
+                    section = value
+                fragment_id = session.set_value(label, value)
+                if fragment_id is None:
+                    recorder.start(section)
+                    recorder.finish(section, 0.0, ok=False)
+                    continue
+            recorder.start(section)
+            start = time.perf_counter()
+            try:
+                ok = await asyncio.wait_for(session.rerun(fragment_id), timeout)
+            except Exception:
+                ok = False
+            recorder.finish(section, time.perf_counter() - start, ok, fragment=bool(fragment_id))
+            if not ok:
+                return
+
+
+async def run_server_sessions(url, plans, args, recorder):
+    async def delayed(i, actions, rng):
+        await asyncio.sleep(i * args.ramp / len(plans))
+        await server_session(url, actions, args.think, rng, recorder, args.timeout)
+
+    await asyncio.gather(*(delayed(i, actions, rng) for i, (actions, rng) in enumerate(plans)))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port):
+    """``streamlit run app.py`` on ``port``, once its health check answers."""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP, "--server.headless", "true",
+         "--server.address", "127.0.0.1", "--server.port", str(port),
+         "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"streamlit exited with status {server.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("streamlit did not become healthy within 60 s")
+
+
+def print_report(rows):
+    print(f"{'section':36} {'reruns':>6} {'frag':>5} {'err':>4} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'max ms':>8} {'rerun/s':>8} {'peak RSS MB':>12}")
+    for name, row in rows.items():
+        times = " ".join(f"{row[k]:8.1f}" if k in row else f"{'-':>8}"
+                         for k in ("p50_ms", "p95_ms", "p99_ms", "max_ms"))
+        rss = f"{row['peak_rss_mb']:12.1f}" if row["peak_rss_mb"] else f"{'-':>12}"
+        print(f"{name:36} {row['reruns']:6} {row['fragment_reruns']:5} {row['errors']:4} {times} "
+              f"{row['reruns_per_s']:8.2f} {rss}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--steps", type=int, default=15, help="actions per session after the first load")
+    parser.add_argument("--ramp", type=float, default=10.0, help="seconds over which sessions start")
+    parser.add_argument("--think", type=float, default=1.0, help="mean seconds between actions")
+    parser.add_argument("--target", choices=["server", "apptest"], default="server")
+    parser.add_argument("--url", help="existing server, e.g. ws://127.0.0.1:8501 (server target)")
+    parser.add_argument("--pid", type=int, help="server process to sample RSS from, with --url")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds allowed per rerun")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    plans = []
+    for i in range(args.sessions):
+        rng = random.Random(args.seed * 100_003 + i)
+        plans.append((journey(rng, args.steps), rng))
+
+    recorder = Recorder()
+    server = None
+    pid = os.getpid()
+    if args.target == "server":
+        if args.url:
+            url, pid = args.url.rstrip("/"), args.pid
+        else:
+            port = free_port()
+            server = start_server(port)
+            url, pid = f"ws://127.0.0.1:{port}", server.pid
+
+    stop = threading.Event()
+    if pid:
+        threading.Thread(target=sample_rss, args=(pid, recorder, stop), daemon=True).start()
+    start = time.perf_counter()
+    try:
+        if args.target == "apptest":
+            run_apptest(plans, args, recorder)
+        else:
+            asyncio.run(run_server_sessions(url, plans, args, recorder))
+    finally:
+        elapsed = time.perf_counter() - start
+        stop.set()
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    rows = recorder.report(elapsed)
+    print(f"{args.sessions} sessions x {args.steps} actions, target {args.target}, {elapsed:.1f} s")
+    print_report(rows)
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump({"target": args.target, "sessions": args.sessions, "steps": args.steps,
+                       "ramp_s": args.ramp, "think_s": args.think, "seed": args.seed,
+                       "elapsed_s": round(elapsed, 2), "sections": rows}, fh, indent=2)
+            fh.write("\n")
+    return 1 if rows.get("all", {}).get("errors") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""Performance regression suite for every code path behind app.py.
+
+Times, headless, the work each section does on a rerun:
+
+* parsing: ``parse_polynomial`` and the ``sp.sympify`` / ``sp.Poly`` path
+  the solver workers use, on the Exercise 1 polynomials;
+* solving: ``sp.solve`` and the app's ``solve`` / ``solve_rational`` on the
+  exercises, ``sp.solve`` on random degree 2-4 inputs, ``find_roots`` on
+  random degree 2-10 inputs, and cubics through ``np.roots`` and the
+  closed forms;
+* grid evaluation: ``horner`` on the old 400-point grid, ``y_range`` and
+  ``adaptive_sample``;
+* charts: building a Matplotlib figure and encoding it as PNG the way
+  ``st.pyplot`` does, updating a reused one, and the Vega-Lite spec;
+* full-page reruns of every section through Streamlit's ``AppTest``.
+
+Each case reports the best of several repeats, in ms per call. Every
+library case runs in a fresh interpreter, so it is not timed against a
+heap and caches left behind by the cases before it; that matters most for
+the sub-millisecond ones. Results are compared with
+``benchmarks/baselines.json``: a case more than ``--threshold`` (default
+30%) and more than :data:`ABSOLUTE_SLACK_MS` slower than its baseline is a
+regression, and the run exits with status 1. To carry baselines across
+machines, every time is divided by a fixed pure-Python calibration loop
+measured right before and after it, so baselines are really ratios.
+``--update`` rewrites the baselines (only the selected cases with
+``--filter``).
+
+    python benchmarks/regression.py [--filter SUBSTRING] [--no-apptest]
+                                    [--threshold 0.3] [--update]
+"""
+
+import argparse
+import gc
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baselines.json")
+DEFAULT_THRESHOLD = 0.30
+# Differences below this many ms are noise, whatever the ratio: on a shared
+# machine the sub-millisecond cases move by a third between identical runs.
+ABSOLUTE_SLACK_MS = 0.5
+REPEAT = 5
+# Re-measurements of a case that looks slower before it counts as a regression.
+CONFIRM = 3
+# Calls per repeat are raised until one repeat takes at least this long.
+MIN_REPEAT_MS = 50
+
+EXERCISES = ["x^2 - 2x - 8", "4s^2 - 4s + 1", "6x^2 - 3 - 7x", "4u^2 + 8u", "t^2 - 15",
+             "3x^2 - x - 4", "2x^3 - 5x^2 - 14x + 8", "x^3 - 3x + 1"]
+SECTIONS = ["Introduction", "Geometrical Meaning of Zeroes", "Zeroes & Coefficients Relationship",
+            "Important Points & Formulas", "Practice Questions", "Answer Key", "Interactive Tools"]
+
+
+def best_ms(fn, repeat=REPEAT):
+    """Best time per call in ms, with calls per repeat chosen as ``timeit.autorange``.
+
+    The garbage collector is off while timing, as in ``timeit``, so cases
+    that run after SymPy has filled the heap are not charged for its
+    collections.
+    """
+    gc.collect()
+    gc.disable()
+    try:
+        return _best_ms(fn, repeat)
+    finally:
+        gc.enable()
+
+
+def _best_ms(fn, repeat):
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if (time.perf_counter() - start) * 1e3 >= MIN_REPEAT_MS:
+            break
+        number *= 2
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best * 1e3
+
+
+def calibrate():
+    """A fixed pure-Python workload; the unit all cases are expressed in."""
+    def work():
+        total = 0
+        for i in range(50_000):
+            total += i * i % 7
+        return total
+    return best_ms(work)
+
+
+def random_polys(degrees, count, seed):
+    rng = random.Random(seed)
+    polys = []
+    for _ in range(count):
+        n = rng.choice(degrees)
+        coeffs = [rng.randint(-9, 9) for _ in range(n + 1)]
+        coeffs[0] = rng.choice([-3, -2, -1, 1, 2, 3])
+        polys.append(coeffs)
+    return polys
+
+
+def library_cases():
+    """``(name, fn)`` for the non-Streamlit code paths."""
+    import numpy as np
+    import sympy as sp
+
+    from polytools.analysis import parse, solve, solve_rational
+    from polytools.cache import canonical_form
+    from polytools.closed_form import solve_closed_form
+    from polytools.horner import horner
+    from polytools.parser import parse_polynomial
+    from polytools.plotting import LineChart
+    from polytools.polynomial import Polynomial
+    from polytools.roots import find_roots
+    from polytools.sampling import adaptive_sample, y_range
+    from polytools.vega import line_chart_spec
+
+    polys = [parse_polynomial(text) for text in EXERCISES]
+    canonicals = []
+    for poly in polys:
+        _, scale = canonical_form(poly)
+        canonicals.append(Polynomial([c / scale for c in poly.all_coeffs()]))
+    exprs = [(poly.as_expr(), poly.to_sympy().gens[0]) for poly in polys]
+    texts = [str(expr) for expr, _ in exprs]
+    x = sp.Symbol("x")
+    small = [sp.Poly([int(c) for c in coeffs], x).as_expr() for coeffs in random_polys([2, 3, 4], 9, 1)]
+    numeric = random_polys(list(range(2, 11)), 20, 2)
+    cubics = random_polys([3], 50, 3)
+    cubic_floats = [[float(c) for c in coeffs] for coeffs in cubics]
+    grid = np.linspace(-10, 10, 400)
+    curve = [1.0, 0.0, -4.0, 0.0]
+    xs, ys = adaptive_sample(curve, xlim=(-10, 10), ylim=(-20, 20))
+    chart_data = dict(x=xs, y=ys, title="Graph of y = x³ - 4x", label="y = x³ - 4x",
+                      zeroes=[-2.0, 0.0, 2.0], xlim=(-10, 10), ylim=(-20, 20))
+    reused = LineChart(figsize=(10, 6))
+
+    def png(figure):
+        figure.savefig(io.BytesIO(), format="png", dpi=200, bbox_inches="tight")
+
+    return [
+        ("parse/parse_polynomial exercises", lambda: [parse_polynomial(t) for t in EXERCISES]),
+        ("parse/parse (cached) exercises", lambda: [parse(t) for t in EXERCISES]),
+        ("parse/sympify + Poly exercises",
+         lambda: [sp.Poly(sp.sympify(t)).all_coeffs() for t in texts]),
+        ("solve/sp.solve exercises", lambda: [sp.solve(e, v) for e, v in exprs]),
+        ("solve/solve (worker) exercises", lambda: [solve(c) for c in canonicals]),
+        ("solve/solve_rational exercises", lambda: [solve_rational(c) for c in canonicals]),
+        ("solve/sp.solve random degree 2-4", lambda: [sp.solve(e, x) for e in small]),
+        ("solve/find_roots random degree 2-10", lambda: [find_roots(c) for c in numeric]),
+        ("solve/np.roots cubics", lambda: [np.roots(c) for c in cubic_floats]),
+        ("solve/closed form cubics",
+         lambda: [solve_closed_form(c, decimal=True) for c in cubic_floats]),
+        ("grid/horner 400 points", lambda: horner(curve, grid)),
+        ("grid/y_range cubic", lambda: y_range(curve, -10, 10)),
+        ("grid/adaptive_sample cubic",
+         lambda: adaptive_sample(curve, xlim=(-10, 10), ylim=(-20, 20))),
+        ("chart/new figure + png", lambda: png(LineChart(figsize=(10, 6)).update(**chart_data))),
+        ("chart/reused figure + png", lambda: png(reused.update(**chart_data))),
+        ("chart/vega spec", lambda: json.dumps(line_chart_spec(**chart_data))),
+    ]
+
+
+def apptest_cases():
+    """Warm full-page reruns of each section (the first run is not timed)."""
+    from streamlit.testing.v1 import AppTest
+
+    cases = []
+    for section in SECTIONS:
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120).run()
+        if section != "Introduction":
+            at.sidebar.radio[0].set_value(section).run()
+        if at.exception:
+            raise RuntimeError(f"{section}: {at.exception}")
+        cases.append((f"app/rerun {section}", lambda at=at: at.run()))
+    return cases
+
+
+def run_isolated(name, repeat):
+    """``(ratio, unit)`` of library case ``name``, measured in a new interpreter."""
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--case", name,
+                           "--repeat", str(repeat)],
+                          capture_output=True, text=True, cwd=ROOT, check=True)
+    result = json.loads(proc.stdout.splitlines()[-1])
+    return result["ratio"], result["unit"]
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, metavar="PATH")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown as a fraction (default %(default)s)")
+    parser.add_argument("--filter", default="", metavar="SUBSTRING", help="only run matching cases")
+    parser.add_argument("--no-apptest", action="store_true", help="skip the AppTest reruns")
+    parser.add_argument("--update", action="store_true", help="write the results as the new baseline")
+    # Internal: time one library case in this process and print the result.
+    parser.add_argument("--case", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--repeat", type=int, default=REPEAT, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Solve inline: a worker process would add IPC and start-up noise.
+    os.environ.setdefault("POLYTOOLS_SOLVER_WORKERS", "0")
+
+    def measure(fn, repeat=REPEAT):
+        # Calibrate on both sides of every case, so drift in machine speed
+        # cancels out; noise only ever slows a loop, so keep the faster one.
+        before = calibrate()
+        ms = best_ms(fn, repeat)
+        unit = min(before, calibrate())
+        return ms / unit, unit
+
+    if args.case is not None:
+        fn = dict(library_cases())[args.case]
+        ratio, unit = measure(fn, args.repeat)
+        print(json.dumps({"ratio": ratio, "unit": unit}))
+        return 0
+
+    names = [name for name, _ in library_cases()]
+    cases = [(name, None) for name in names]
+    cases += [] if args.no_apptest else apptest_cases()
+    cases = [case for case in cases if args.filter in case[0]]
+    baseline = load_baseline(args.baseline)
+    print(f"{'case':44} {'baseline ms':>12} {'ms':>10} {'change':>8}")
+
+    def timed(name, fn, repeat=REPEAT):
+        return run_isolated(name, repeat) if fn is None else measure(fn, repeat)
+
+    results, regressions, units = {}, {}, []
+    for name, fn in cases:
+        ratio, unit = timed(name, fn)
+        expected = baseline["cases"].get(name) if baseline else None
+        for _ in range(CONFIRM):
+            if expected is None or ratio <= expected * (1 + args.threshold):
+                break
+            # Confirm before reporting: a busy machine slows single runs.
+            again, unit_again = timed(name, fn, 2 * REPEAT)
+            if again < ratio:
+                ratio, unit = again, unit_again
+        results[name] = ratio
+        units.append(unit)
+        ms = ratio * unit
+        if expected is None:
+            print(f"{name:44} {'-':>12} {ms:10.3f} {'new':>8}")
+            continue
+        change = ratio / expected - 1
+        status = ""
+        if change > args.threshold and ms - expected * unit > ABSOLUTE_SLACK_MS:
+            status = "  REGRESSION"
+            regressions[name] = change
+        print(f"{name:44} {expected * unit:12.3f} {ms:10.3f} {change:+8.0%}{status}")
+
+    if args.update:
+        cases_out = dict(baseline["cases"]) if baseline and args.filter else {}
+        cases_out.update(results)
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, cwd=ROOT).stdout.strip()
+        with open(args.baseline, "w") as fh:
+            json.dump({"commit": commit, "python": sys.version.split()[0],
+                       "calibration_ms": min(units),
+                       "cases": dict(sorted(cases_out.items()))}, fh, indent=2)
+            fh.write("\n")
+        print(f"\nbaseline written to {args.baseline}")
+        return 0
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""Soak test: thousands of slider changes must not grow memory.
+
+Drives the three charts of the app through random slider values exactly as
+a rerun does: ``get_chart`` on a per-session store, ``LineChart.update`` and
+a PNG render like ``st.pyplot``. Resident memory is sampled after a warm-up,
+and the run fails if it grows by more than ``--max-growth-mb``.
+
+``--legacy`` runs the old per-rerun ``plt.subplots`` code instead, which
+shows the leak this guards against.
+
+    python benchmarks/soak_plotting.py [--iterations 2000] [--sessions 4] [--legacy]
+"""
+
+import argparse
+import gc
+import io
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from polytools.plotting import get_chart
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def rss_mb():
+    with open("/proc/self/statm") as fh:
+        return int(fh.read().split()[1]) * PAGE_SIZE / 2**20
+
+
+def render(fig):
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png")
+    return buf.getbuffer().nbytes
+
+
+def rerun(store, rng):
+    x = np.linspace(-10, 10, 400)
+    kind = rng.choice(["linear", "quadratic", "plotter"])
+    a, b, c = rng.uniform(-3, 3), rng.uniform(-10, 10), rng.uniform(-10, 10)
+    if kind == "linear":
+        chart = get_chart(store, "linear_expander_chart", figsize=(8, 5), max_zeroes=1)
+        zeroes = [-b / a] if a else []
+        fig = chart.update(x, a * x + b, f"Graph of y = {a:.1f}x + {b:.1f}", label="line",
+                           zeroes=zeroes, zero_labels=[f"Zero at x = {z:.2f}" for z in zeroes])
+    elif kind == "quadratic":
+        chart = get_chart(store, "quadratic_expander_chart", figsize=(8, 5), max_zeroes=2)
+        d = b * b - 4 * a * c
+        zeroes = [(-b + s * np.sqrt(d)) / (2 * a) for s in (1, -1)] if d >= 0 and a else []
+        fig = chart.update(x, a * x**2 + b * x + c, "Graph of a quadratic", label="parabola",
+                           zeroes=zeroes, ylim=(-20, 20))
+    else:
+        chart = get_chart(store, "graph_plotter_chart", figsize=(10, 6), label_fontsize=12, title_fontsize=14)
+        y = a * x**3 + b * x**2 + c * x
+        fig = chart.update(x, y, "Graph of a cubic", label="cubic",
+                           ylim=(min(-20, y.min()), max(20, y.max())))
+    return render(fig)
+
+
+def legacy_rerun(store, rng):
+    import matplotlib.pyplot as plt
+
+    x = np.linspace(-10, 10, 400)
+    a, b = rng.uniform(-3, 3), rng.uniform(-10, 10)
+    fig, ax = plt.subplots(figsize=(8, 5))
+    ax.plot(x, a * x + b, "b-", linewidth=2, label="line")
+    ax.legend()
+    return render(fig)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--max-growth-mb", type=float, default=20.0)
+    parser.add_argument("--legacy", action="store_true", help="use the old plt.subplots code path")
+    args = parser.parse_args()
+
+    import matplotlib
+    matplotlib.use("Agg")
+
+    step = legacy_rerun if args.legacy else rerun
+    rng = random.Random(0)
+    stores = [{} for _ in range(args.sessions)]
+
+    for i in range(args.warmup):
+        step(stores[i % args.sessions], rng)
+    gc.collect()
+    baseline = rss_mb()
+    print(f"after {args.warmup} warm-up reruns: {baseline:.1f} MB")
+
+    checkpoint = max(1, args.iterations // 10)
+    for i in range(1, args.iterations + 1):
+        step(stores[i % args.sessions], rng)
+        if i % checkpoint == 0:
+            gc.collect()
+            print(f"{i:6d} reruns: {rss_mb():.1f} MB")
+
+    gc.collect()
+    growth = rss_mb() - baseline
+    print(f"growth: {growth:+.1f} MB (limit {args.max_growth_mb} MB)")
+    if growth > args.max_growth_mb:
+        sys.exit("FAIL: memory grew during the soak")
+    print("PASS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""Polynomial engine behind the Class X Polynomials guide."""
+
+from .horner import horner, horner_batch
+from .parser import PolynomialSyntaxError, parse_polynomial
+from .polynomial import Polynomial
+
+__all__ = ["Polynomial", "PolynomialSyntaxError", "horner", "horner_batch", "parse_polynomial"]
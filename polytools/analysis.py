@@ -0,0 +1,331 @@
+"""Cached parse/solve results for the Interactive Tools tabs.
+
+``parse`` and ``analyze`` sit in front of :func:`parse_with_surds` and
+SymPy's ``solve``. Parse results are keyed on the input text; solve results
+are keyed on the canonical form of the polynomial (see
+:func:`polytools.cache.canonical_form`), so scalar multiples and a different
+variable letter share one entry.
+
+Rational polynomials first go through :mod:`polytools.exact`: rational
+zeroes are found and divided out with integer arithmetic, so textbook
+polynomials never reach SymPy at all, and only the remainder is passed to
+``sp.solve``. Above :data:`EXACT_MAX_DEGREE` zeroes are found numerically
+with :func:`polytools.roots.find_roots` (radicals for quartics are
+unreadable and there are none in general from degree 5), except that
+rational zeroes stay exact and, up to :data:`ISOLATION_MAX_DEGREE`, real
+zeroes come from exact isolating intervals.
+
+Cache size and lifetime come from ``POLYTOOLS_CACHE_SIZE`` (entries, default
+1024) and ``POLYTOOLS_CACHE_TTL`` (seconds, default 3600, ``0`` disables
+expiry); a numeric stand-in for a timed-out exact solve expires after
+``POLYTOOLS_FALLBACK_TTL`` (default 30). Behind the in-memory cache, :data:`solve_store` keeps results on
+disk across processes and restarts when ``POLYTOOLS_SOLVE_DB`` is set (see
+:mod:`polytools.diskcache`), and with ``POLYTOOLS_SOLVER_SERVICE`` set
+misses are solved by a shared :mod:`polytools.service` instead of in this
+process whenever it is reachable.
+"""
+
+import os
+import time
+
+from fractions import Fraction
+
+from .cache import LRUCache, canonical_form
+from .diskcache import DB_PATH, SolveStore
+from .exact import isolate_real_roots, rational_roots
+from .horner import horner
+from .metrics import record, stage
+from .parser import parse_with_surds
+from .pool import SolveCancelled, SolveTimeout, solver_pool
+from .polynomial import Polynomial
+from .roots import Root, find_roots
+from .service import SERVICE_ADDRESS, ServiceClient, ServiceUnavailable
+from .vieta import elementary_symmetric
+
+CACHE_SIZE = int(os.environ.get("POLYTOOLS_CACHE_SIZE", "1024"))
+CACHE_TTL = float(os.environ.get("POLYTOOLS_CACHE_TTL", "3600")) or None
+# A numeric stand-in after a timed-out exact solve is only kept this long,
+# so a slow queue or a cold worker does not fix it in place for CACHE_TTL.
+FALLBACK_TTL = float(os.environ.get("POLYTOOLS_FALLBACK_TTL", "30"))
+EXACT_MAX_DEGREE = 3
+ISOLATION_MAX_DEGREE = 100
+# Width, relative to the zero, that isolating intervals are refined to.
+ISOLATION_WIDTH = Fraction(1, 2 ** 52)
+
+parse_cache = LRUCache(maxsize=CACHE_SIZE, ttl=CACHE_TTL)
+analysis_cache = LRUCache(maxsize=CACHE_SIZE, ttl=CACHE_TTL)
+solve_store = SolveStore(DB_PATH) if DB_PATH else None
+solver_service = ServiceClient(SERVICE_ADDRESS) if SERVICE_ADDRESS else None
+
+
+class Analysis:
+    """Solve results for one canonical polynomial.
+
+    ``zeroes`` are the distinct exact zeroes, rational ones first as
+    ``Fraction`` and then those ``sp.solve`` found for the rest, and
+    ``values`` the verification ``p(zero)`` for each: exactly 0, or a
+    15-digit residual when expanding does not reduce it to 0. ``symmetric``
+    holds the expanded (not simplified) elementary symmetric sums of
+    ``zeroes`` (sum, sum of pairwise products, ..., product) next to the
+    matching Vieta ratios in ``vieta``; :func:`polytools.vieta.relations`
+    compares the two. It is empty when a repeated zero leaves fewer
+    distinct zeroes than the degree.
+    ``discriminant`` belongs to the canonical polynomial, use
+    :meth:`discriminant_of` for a scaled one; it is ``None`` above
+    :data:`EXACT_MAX_DEGREE`. ``exact`` is false when the zeroes are numeric
+    approximations, either because of the degree or because the exact solve
+    ran out of time; ``roots`` then holds the :class:`polytools.roots.Root`
+    list with error bounds and multiplicities, and ``symmetric`` counts
+    repeated zeroes by multiplicity. ``latex`` is set once the result has
+    passed through :data:`solve_store` (see
+    :func:`polytools.diskcache.render_latex`).
+    """
+
+    __slots__ = ("key", "degree", "zeroes", "real_zeroes", "values",
+                 "symmetric", "vieta", "discriminant", "exact", "roots", "latex")
+
+    def __init__(self, key, degree, zeroes, real_zeroes, values, symmetric, vieta, discriminant,
+                 exact=True, roots=None):
+        self.key = key
+        self.degree = degree
+        self.zeroes = zeroes
+        self.real_zeroes = real_zeroes
+        self.values = values
+        self.symmetric = symmetric
+        self.vieta = vieta
+        self.discriminant = discriminant
+        self.exact = exact
+        self.roots = roots
+        self.latex = None
+
+    def discriminant_of(self, poly):
+        # disc(k * p) = k^(2n - 2) * disc(p)
+        if self.discriminant is None:
+            return None
+        _, scale = canonical_form(poly)
+        return scale ** (2 * self.degree - 2) * self.discriminant
+
+
+def parse(text):
+    """Cached :func:`parse_with_surds`; syntax errors are not cached."""
+    key = text.strip()
+    return parse_cache.get_or_compute(key, lambda: parse_with_surds(key))
+
+
+def solve_rational(canonical):
+    """:func:`solve` without SymPy, or ``None`` if some zero is irrational.
+
+    Succeeds for rational polynomials whose zeroes are all rational, which
+    covers nearly every textbook exercise.
+    """
+    if not canonical.is_rational:
+        return None
+    found, rest = rational_roots(canonical.all_coeffs())
+    if len(rest) > 1:
+        return None
+    zeroes = [r for r, _ in found]
+    with stage("verify"):
+        values = [canonical(r) for r in zeroes]
+    symmetric = elementary_symmetric(zeroes) if len(zeroes) == canonical.degree else []
+    return zeroes, list(zeroes), values, symmetric
+
+
+def solve(canonical):
+    """Uncached solve of a canonical :class:`Polynomial`.
+
+    Rational zeroes are split off first; ``sp.solve`` only sees the rest,
+    and which of its zeroes are real is decided by counting isolating
+    intervals rather than by ``is_real``, which is often undecided for
+    nested radicals.
+    """
+    return _solve_timed(canonical)[0]
+
+
+def _solve_timed(canonical):
+    """:func:`solve` plus the seconds spent verifying the zeroes.
+
+    This runs in a solver worker, where no rerun is being timed, so the
+    verification time is returned for the caller to :func:`record`.
+    """
+    import sympy as sp
+
+    poly = canonical.to_sympy()
+    x = poly.gens[0]
+    expr = poly.as_expr()
+    if canonical.is_rational:
+        found, rest = rational_roots(canonical.all_coeffs())
+        rational = [sp.Rational(r.numerator, r.denominator) for r, _ in found]
+        others = sp.solve(sp.Poly(rest, x).as_expr(), x) if len(rest) > 1 else []
+        n_real = len(isolate_real_roots(rest)) if len(rest) > 1 else 0
+        # Exactly n_real of the others are real: those nearest the real axis.
+        order = sorted(range(len(others)), key=lambda i: abs(complex(sp.N(others[i], 30)).imag))
+        real = sorted(order[:n_real])
+        zeroes = rational + others
+        real_zeroes = rational + [others[i] for i in real]
+        start = time.perf_counter()
+        values = [canonical(r) for r, _ in found] + [_residual(expr, x, z) for z in others]
+    else:
+        zeroes = sp.solve(expr, x)
+        real_zeroes = [z for z in zeroes if z.is_real]
+        start = time.perf_counter()
+        values = [_residual(expr, x, z) for z in zeroes]
+    verify_seconds = time.perf_counter() - start
+    # Only expanded: sp.simplify on Cardano radicals takes seconds to
+    # minutes. polytools.vieta does the comparison with -b/a, c/a, ...
+    symmetric = []
+    if len(zeroes) == canonical.degree:
+        symmetric = [sp.expand(e) for e in elementary_symmetric(zeroes)]
+    return (zeroes, real_zeroes, values, symmetric), verify_seconds
+
+
+def _residual(expr, x, zero):
+    """``expr`` at ``zero``: exactly 0 when expanding and rationalising
+    denominators show it, else evaluated to 15 digits."""
+    import sympy as sp
+
+    value = sp.expand(expr.subs(x, zero))
+    if value != 0:
+        value = sp.expand(sp.radsimp(value))
+    return value if value == 0 else sp.N(value, 15)
+
+
+def _tidy(z, tol=1e-9):
+    z = complex(z)
+    z = complex(round(z.real, 10), round(z.imag, 10))
+    # "+ 0.0" turns -0.0 into 0.0 for display.
+    return z.real + 0.0 if abs(z.imag) <= tol * max(1.0, abs(z)) else z
+
+
+def _exact_real_roots(canonical):
+    """:class:`Root` list for a rational polynomial, exact where possible.
+
+    Rational zeroes get radius 0 and real zeroes of the rest come from
+    refined isolating intervals; only non-real zeroes are numeric. Returns
+    ``None`` when the rest is too large to isolate or the numeric count of
+    non-real zeroes disagrees with the exact count of real ones.
+    """
+    found, rest = rational_roots(canonical.all_coeffs())
+    roots = [Root(float(r), 0.0, m, real=True) for r, m in found]
+    if len(rest) > 1:
+        if len(rest) - 1 > ISOLATION_MAX_DEGREE:
+            return None
+        n_real = 0
+        for interval in isolate_real_roots(rest):
+            scale = max(1, abs(interval.lo), abs(interval.hi))
+            interval = interval.refine(ISOLATION_WIDTH * scale)
+            roots.append(Root(float(interval), float(interval.hi - interval.lo) / 2,
+                              interval.multiplicity, real=True))
+            n_real += interval.multiplicity
+        non_real = [r for r in find_roots(rest) if not r.real]
+        if sum(r.multiplicity for r in non_real) != len(rest) - 1 - n_real:
+            return None
+        roots.extend(non_real)
+    roots.sort(key=lambda root: (not root.real, complex(root.value).real, complex(root.value).imag))
+    return roots
+
+
+def solve_numeric(canonical):
+    """Float counterpart of :func:`solve`; also returns the :class:`Root` list."""
+    roots = _exact_real_roots(canonical) if canonical.is_rational else None
+    if roots is None:
+        roots = find_roots(canonical.coeffs)
+    zeroes = [_tidy(r.value) for r in roots]
+    real_zeroes = [z for r, z in zip(roots, zeroes) if r.real]
+    with stage("verify"):
+        values = [_tidy(v) for v in horner(canonical.coeffs, [complex(r.value) for r in roots])]
+    expanded = [complex(r.value) for r in roots for _ in range(r.multiplicity)]
+    symmetric = [_tidy(e) for e in elementary_symmetric(expanded)]
+    return zeroes, real_zeroes, values, symmetric, roots
+
+
+def analyze(poly, timeout=None, cancel=None, numeric_only=False):
+    """Cached :class:`Analysis` of ``poly``.
+
+    The exact solve runs in :data:`polytools.pool.solver_pool` with a time
+    budget (``timeout`` seconds, default the pool's). When the budget runs
+    out, or the degree is above :data:`EXACT_MAX_DEGREE`, the zeroes are
+    approximated numerically instead and the result is marked
+    ``exact=False``. ``cancel`` is polled while waiting; if it returns
+    true :class:`polytools.pool.SolveCancelled` is raised and nothing is
+    cached. ``numeric_only`` skips the exact solve unless its result is
+    already cached, and does not cache the approximation, so it never
+    stands in for an exact result later. Concurrent calls for the same
+    canonical polynomial share one solve; the callers that waited for it are
+    counted as ``coalesced`` in :func:`cache_stats`, and ``cancel`` is still
+    polled while they wait.
+    """
+    key, scale = canonical_form(poly)
+
+    def compute():
+        if solve_store is not None:
+            stored = solve_store.get(key)
+            if stored is not None:
+                return stored
+        if solver_service is not None and solver_service.available():
+            try:
+                return solver_service.analyze(poly, timeout, numeric_only, cancel)
+            except ServiceUnavailable:
+                pass
+        canonical = Polynomial([c / scale for c in poly.all_coeffs()])
+        exact, roots = True, None
+        if canonical.degree > EXACT_MAX_DEGREE or numeric_only:
+            exact = False
+        else:
+            result = solve_rational(canonical)
+            try:
+                if result is None:
+                    result, verify_seconds = solver_pool.run(_solve_timed, canonical,
+                                                             timeout=timeout, cancel=cancel)
+                    record("verify", verify_seconds)
+                zeroes, real_zeroes, values, symmetric = result
+            except SolveTimeout:
+                exact = False
+        if not exact:
+            zeroes, real_zeroes, values, symmetric, roots = solve_numeric(canonical)
+        discriminant = None
+        if 1 <= canonical.degree <= EXACT_MAX_DEGREE:
+            discriminant = canonical.discriminant()
+        result = Analysis(key, canonical.degree, zeroes, real_zeroes, values, symmetric,
+                          canonical.vieta(), discriminant, exact, roots)
+        # Numeric results below the exact degree are stand-ins (timeout or
+        # low memory) and must not outlive the process.
+        if solve_store is not None and (exact or canonical.degree > EXACT_MAX_DEGREE):
+            solve_store.put(result)
+        return result
+
+    def timed_compute():
+        with stage("solve"):
+            return compute()
+
+    if numeric_only:
+        cached = analysis_cache.get(key)
+        return cached if cached is not None else timed_compute()
+
+    def poll():
+        if cancel is not None and cancel():
+            raise SolveCancelled("cancelled while waiting for a shared solve")
+
+    def ttl(analysis):
+        if analysis.exact or analysis.degree > EXACT_MAX_DEGREE:
+            return analysis_cache.ttl
+        return FALLBACK_TTL
+
+    return analysis_cache.get_or_compute(key, timed_compute, poll=poll, ttl=ttl)
+
+
+def cache_stats():
+    return {"parse": parse_cache.stats(), "analysis": analysis_cache.stats()}
+
+
+def service_stats():
+    """:meth:`ServiceClient.stats` of :data:`solver_service`, or ``None`` without one."""
+    return solver_service.stats() if solver_service is not None else None
+
+
+def store_stats():
+    """:meth:`SolveStore.stats` of :data:`solve_store`, or ``None`` without one."""
+    return solve_store.stats() if solve_store is not None else None
+
+
+def pool_stats():
+    return solver_pool.stats()
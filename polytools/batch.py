@@ -0,0 +1,289 @@
+"""Headless batch analysis of polynomials, one JSON line per input.
+
+Runs the Polynomial Analyzer / Zero Finder analysis over whole worksheets
+and question banks without the UI::
+
+    python -m polytools.batch [FILE ...] [-o OUT] [--jobs N] [--field NAME]
+                              [--format auto|csv|jsonl|text] [--timeout SECONDS]
+
+Inputs are read lazily from each FILE (``-`` or none for stdin): CSV with
+the polynomial in column ``--field`` (default ``polynomial``, else the
+first column), JSON lines holding either a string or an object with that
+field, or plain text with one polynomial per line. ``auto`` picks by file
+extension; on stdin each line that starts with ``{`` or ``"`` is read as
+JSON. An ``id`` in a CSV row or JSON object is copied to the output. A
+JSON line that does not parse, is neither a string nor an object, or lacks
+the field gets an ``error`` record like a polynomial that does not parse.
+
+Chunks of :data:`CHUNK_SIZE` inputs are analysed in a process pool with at
+most :data:`WINDOW` chunks per process in flight, so memory stays bounded
+however long the input, and results are written in input order. Exact
+solves get :data:`TIMEOUT` seconds (``--timeout``) before falling back to
+numeric zeroes; an irreducible cubic costs SymPy up to about a second.
+
+Each output line carries ``degree``, ``type``, ``exact_zeroes`` (strings,
+or ``null`` when the zeroes are only approximated), ``numeric_zeroes`` (a
+number, or ``[re, im]``), the ``discriminant`` of the polynomial as
+written, the elementary symmetric sums (counting repeated zeroes) next to
+the Vieta ratios with their ``vieta_ok`` check from
+:func:`polytools.vieta.relations` (``null`` for a constant), or an
+``error``. Progress and throughput go to stderr; the exit status is 1 if
+any input could not be analysed.
+"""
+
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+CHUNK_SIZE = 32
+# Default exact-solve budget in seconds. Offline there is no one waiting on
+# a rerun, and a killed SymPy worker restarts with cold caches, which makes
+# the next solves slower still.
+TIMEOUT = 10.0
+WINDOW = 4
+PROGRESS_INTERVAL = 1.0
+TYPES = {-1: "zero", 0: "constant", 1: "linear", 2: "quadratic", 3: "cubic", 4: "quartic"}
+
+
+def _number(value):
+    z = complex(value)
+    if abs(z.imag) <= 1e-12 * max(1.0, abs(z.real)):
+        return z.real
+    return [z.real, z.imag]
+
+
+def analysis_record(poly, analysis):
+    """JSON-ready summary of ``analysis`` for ``poly`` (see the module docstring)."""
+    from .vieta import relations
+
+    discriminant = analysis.discriminant_of(poly)
+    checks = relations(poly, analysis)
+    return {
+        "polynomial": str(poly),
+        "degree": poly.degree,
+        "type": TYPES.get(poly.degree, f"degree {poly.degree}"),
+        "exact": analysis.exact,
+        "exact_zeroes": [str(z) for z in analysis.zeroes] if analysis.exact else None,
+        "numeric_zeroes": [_number(z) for z in analysis.zeroes],
+        "real_zeroes": len(analysis.real_zeroes),
+        "discriminant": None if discriminant is None else str(discriminant),
+        "symmetric_sums": [str(r.rounded()) for r in checks],
+        "vieta_ratios": [str(r.ratio) for r in checks],
+        "vieta_ok": all(r.holds for r in checks) if checks else None,
+    }
+
+
+def analyze_text(text, timeout=None):
+    """:func:`analysis_record` of the polynomial ``text``, or ``{"error": ...}``."""
+    from .analysis import analyze, parse
+    from .parser import PolynomialSyntaxError
+
+    try:
+        poly = parse(text)
+        return analysis_record(poly, analyze(poly, timeout=timeout))
+    except (PolynomialSyntaxError, ValueError, ZeroDivisionError) as exc:
+        return {"error": str(exc)}
+
+
+def _analyze_chunk(chunk, timeout):
+    results = []
+    for meta, text in chunk:
+        record = dict(meta, input=text)
+        if "error" not in meta:
+            record.update(analyze_text(text, timeout))
+        results.append(record)
+    return results
+
+
+def _init_worker():
+    from .pool import solver_pool
+
+    # One SymPy worker (for the time budget) per batch process is enough;
+    # the batch processes already use every core.
+    solver_pool.workers = min(solver_pool.workers, 1)
+
+
+# Input
+
+def _from_json(line, field):
+    """``(meta, text)`` for one JSON line; ``meta`` has an ``error`` if it holds no polynomial."""
+    try:
+        value = json.loads(line)
+    except ValueError as exc:
+        return {"error": f"invalid JSON: {exc}"}, line
+    if isinstance(value, str):
+        return {}, value
+    if not isinstance(value, dict):
+        return {"error": f"expected a string or an object, not {type(value).__name__}"}, line
+    meta = {"id": value["id"]} if "id" in value else {}
+    if field not in value:
+        return dict(meta, error=f"no {field!r} field"), line
+    return meta, str(value[field])
+
+
+def read_inputs(stream, fmt, field="polynomial"):
+    """Yield ``(meta, text)`` for each polynomial in ``stream``.
+
+    ``meta`` holds the ``id``, and an ``error`` for a JSON line that could
+    not be read; ``text`` is then the line itself.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        column = field if field in (reader.fieldnames or []) else (reader.fieldnames or [None])[0]
+        for row in reader:
+            text = (row.get(column) or "").strip()
+            if text:
+                yield ({"id": row["id"]} if "id" in row else {}), text
+        return
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        if fmt == "jsonl" or (fmt == "auto" and line[0] in "{\""):
+            yield _from_json(line, field)
+        else:
+            yield {}, line
+
+
+def _format_of(path, fmt):
+    if fmt != "auto" or path == "-":
+        return fmt
+    ext = os.path.splitext(path)[1].lower()
+    return {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".json": "jsonl"}.get(ext, "text")
+
+
+def iter_inputs(paths, fmt="auto", field="polynomial"):
+    for path in paths or ["-"]:
+        if path == "-":
+            stream = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="")
+            yield from read_inputs(stream, _format_of(path, fmt), field)
+        else:
+            with open(path, encoding="utf-8", newline="") as stream:
+                yield from read_inputs(stream, _format_of(path, fmt), field)
+
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# Run
+
+class Progress:
+    """Counts written records and reports throughput to ``stream``."""
+
+    def __init__(self, stream=sys.stderr, interval=PROGRESS_INTERVAL, quiet=False):
+        self.stream = stream
+        self.interval = interval
+        self.quiet = quiet
+        self.started = time.perf_counter()
+        self._last = self.started
+        self.done = 0
+        self.errors = 0
+        self.approximate = 0
+
+    def add(self, record):
+        self.done += 1
+        if "error" in record:
+            self.errors += 1
+        elif not record["exact"]:
+            self.approximate += 1
+        now = time.perf_counter()
+        if not self.quiet and now - self._last >= self.interval:
+            self._last = now
+            self._report(now, "\r")
+
+    def _report(self, now, end):
+        elapsed = now - self.started
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        self.stream.write(f"{end}{self.done} analysed, {self.errors} errors, "
+                          f"{self.approximate} approximate, {rate:.1f}/s, {elapsed:.1f}s")
+        self.stream.flush()
+
+    def finish(self):
+        if not self.quiet:
+            self._report(time.perf_counter(), "\r")
+            self.stream.write("\n")
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started
+        return {"analysed": self.done, "errors": self.errors, "approximate": self.approximate,
+                "seconds": round(elapsed, 3),
+                "per_second": round(self.done / elapsed, 1) if elapsed > 0 else 0.0}
+
+
+def run(inputs, out, jobs=None, timeout=TIMEOUT, chunk_size=CHUNK_SIZE, progress=None):
+    """Analyse ``(meta, text)`` pairs into JSON lines on ``out``; returns ``progress``.
+
+    ``jobs`` processes (default one per CPU; ``0`` analyses in this process)
+    each have at most :data:`WINDOW` chunks queued.
+    """
+    progress = progress or Progress(quiet=True)
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+
+    def write(records):
+        for record in records:
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            progress.add(record)
+
+    if jobs <= 0:
+        for chunk in _chunks(inputs, chunk_size):
+            write(_analyze_chunk(chunk, timeout))
+        return progress
+    with ProcessPoolExecutor(jobs, initializer=_init_worker) as executor:
+        pending = deque()
+        for chunk in _chunks(inputs, chunk_size):
+            if len(pending) >= jobs * WINDOW:
+                write(pending.popleft().result())
+            pending.append(executor.submit(_analyze_chunk, chunk, timeout))
+        while pending:
+            write(pending.popleft().result())
+    return progress
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m polytools.batch",
+                                     description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", metavar="FILE", help="inputs (default stdin)")
+    parser.add_argument("-o", "--output", default="-", metavar="PATH",
+                        help="JSON lines output (default stdout)")
+    parser.add_argument("--format", choices=["auto", "csv", "jsonl", "text"], default="auto")
+    parser.add_argument("--field", default="polynomial",
+                        help="CSV column or JSON field holding the polynomial")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="worker processes (default one per CPU, 0 for none)")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT,
+                        help="seconds per exact solve before approximating (default %(default)s)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("-q", "--quiet", action="store_true", help="no progress report")
+    args = parser.parse_args(argv)
+
+    progress = Progress(quiet=args.quiet)
+    inputs = iter_inputs(args.files, args.format, args.field)
+    if args.output == "-":
+        run(inputs, sys.stdout, args.jobs, args.timeout, args.chunk_size, progress)
+    else:
+        with open(args.output, "w", encoding="utf-8") as out:
+            run(inputs, out, args.jobs, args.timeout, args.chunk_size, progress)
+    progress.finish()
+    if not args.quiet:
+        print(json.dumps(progress.summary()), file=sys.stderr)
+    return 1 if progress.errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,176 @@
+"""Thread-safe bounded LRU cache with TTL, shared by every Streamlit session.
+
+Streamlit reruns the whole script on each widget interaction, so the same
+polynomial text is parsed and solved again and again. Module-level caches
+live for the lifetime of the server process and are shared across sessions.
+
+Misses are single-flight: when several sessions ask for the same key at once
+(a class opening the Zero Finder on its default polynomial), one computes
+and the others wait for its result instead of repeating the work.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from fractions import Fraction
+from math import gcd, lcm
+
+_MISSING = object()
+# Seconds between calls of the ``poll`` hook while waiting on another caller.
+POLL_INTERVAL = 0.05
+
+
+class _Flight:
+    """A computation in progress that other callers may wait on."""
+
+    __slots__ = ("done", "value", "failed")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = _MISSING
+        self.failed = False
+
+
+class LRUCache:
+    """Least-recently-used mapping with an optional time-to-live per entry.
+
+    ``maxsize`` bounds the number of entries; ``ttl`` (seconds, ``None`` for
+    no expiry) bounds how long an entry may be served after it was stored,
+    unless :meth:`put` is given a ttl for that entry.
+    ``coalesced`` counts misses served by another caller's computation.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None, clock=time.monotonic):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    def get(self, key, default=None, count=True):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                value, stored, ttl = entry
+                if ttl is not None and self._clock() - stored > ttl:
+                    del self._data[key]
+                    self.expirations += 1
+                else:
+                    self._data.move_to_end(key)
+                    if count:
+                        self.hits += 1
+                    return value
+            if count:
+                self.misses += 1
+            return default
+
+    def put(self, key, value, ttl=_MISSING):
+        with self._lock:
+            self._data[key] = (value, self._clock(), self.ttl if ttl is _MISSING else ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute, poll=None, ttl=None):
+        """Return the cached value for ``key``, computing and storing it on a miss.
+
+        ``compute`` runs outside the lock, so a slow computation does not block
+        lookups of other keys. Concurrent misses on the same key wait for the
+        first caller's ``compute`` and share its result; if it raises, its
+        exception propagates to that caller only and the waiters retry, one
+        of them computing in turn. ``poll``, if given, is called every
+        :data:`POLL_INTERVAL` seconds while waiting and may raise to give up.
+        ``ttl``, if given, is called with the computed value and returns the
+        ttl to store it with.
+        """
+        while True:
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = _Flight()
+            if leader:
+                try:
+                    value = compute()
+                except BaseException:
+                    flight.failed = True
+                    raise
+                else:
+                    flight.value = value
+                    if ttl is None:
+                        self.put(key, value)
+                    else:
+                        self.put(key, value, ttl(value))
+                    return value
+                finally:
+                    with self._lock:
+                        del self._flights[key]
+                    flight.done.set()
+            while not flight.done.wait(POLL_INTERVAL if poll is not None else None):
+                poll()
+            if not flight.failed:
+                with self._lock:
+                    self.coalesced += 1
+                return flight.value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._flights),
+            }
+
+
+def canonical_form(poly):
+    """Return ``(key, scale)`` such that ``poly == scale * canonical(key)``.
+
+    Rational polynomials are scaled to integer coefficients with gcd 1 and a
+    positive leading coefficient, so ``2x^2 - 6x - 8``, ``x^2 - 3x - 4`` and
+    ``-x^2 + 3x + 4`` share one key. Zeroes and Vieta ratios only depend on
+    the key; the variable name is not part of it.
+    """
+    coeffs = poly.all_coeffs()
+    if poly.is_rational:
+        den = lcm(*(c.denominator for c in coeffs))
+        nums = [c.numerator * (den // c.denominator) for c in coeffs]
+        g = gcd(*nums) or 1
+        if nums[0] < 0:
+            g = -g
+        return ("q", tuple(n // g for n in nums)), Fraction(g, den)
+    lead = coeffs[0]
+    if poly.exact is not None:
+        # Exact irrational coefficients (sqrt(2), ...): normalise by the
+        # leading coefficient and key on the printed form.
+        return ("s", tuple(str(c / lead) for c in coeffs)), lead
+    return ("f", tuple(float(c / lead) for c in coeffs)), lead
@@ -0,0 +1,152 @@
+"""Closed-form zeroes of linear, quadratic and cubic polynomials.
+
+The textbook formulas misbehave in floating point: ``(-b ± sqrt(D)) / 2a``
+loses every digit of the small zero when ``b^2 >> 4ac``, and deciding
+``D == 0`` or "is this root real" from float results misclassifies
+repeated and nearly repeated zeroes. :func:`solve_closed_form` instead
+
+- computes discriminants exactly (a float is an exact binary fraction, and
+  with ``decimal=True`` slider and input values are read as the decimals
+  they print as, so ``0.1x^2 + 0.2x + 0.1`` has a double zero);
+- takes the larger-magnitude quadratic zero from the formula and the other
+  from ``c / (a x1)``;
+- solves cubics with three real zeroes trigonometrically and the others
+  with Cardano's formula, using cube roots that avoid cancellation, then
+  polishes with a Newton step; repeated cubic zeroes are rational functions
+  of the coefficients and are computed exactly;
+- returns rational zeroes of rational inputs as exact ``Fraction`` values.
+
+All of this is a few dozen arithmetic operations, cheap enough for every
+rerun.
+"""
+
+import math
+from fractions import Fraction
+
+from .exact import rational_roots
+
+
+def _exact(value, decimal):
+    if isinstance(value, float) and decimal:
+        return Fraction(repr(value))
+    return Fraction(value)
+
+
+def _sqrt_exact(value):
+    """Exact square root of a non-negative Fraction, or ``None`` if irrational."""
+    num, den = value.numerator, value.denominator
+    rn, rd = math.isqrt(num), math.isqrt(den)
+    if rn * rn == num and rd * rd == den:
+        return Fraction(rn, rd)
+    return None
+
+
+def _quadratic(a, b, c):
+    d = b * b - 4 * a * c
+    if d == 0:
+        return [(-b / (2 * a), 2)]
+    if d < 0:
+        re = float(-b / (2 * a))
+        im = math.sqrt(float(-d)) / abs(float(2 * a))
+        return [(complex(re, -im), 1), (complex(re, im), 1)]
+    root = _sqrt_exact(d)
+    if root is not None:
+        # Rational zeroes: the formula is exact in Fractions.
+        zeroes = [(-b - root) / (2 * a), (-b + root) / (2 * a)]
+    else:
+        # q has the sign of -b, so -b and -sign(b)sqrt(D) never cancel.
+        q = -(float(b) + math.copysign(math.sqrt(float(d)), float(b))) / 2
+        zeroes = [q / float(a), float(c) / q]
+    return [(z, 1) for z in sorted(zeroes)]
+
+
+def _polish(coeffs, x):
+    """One Newton step on the cubic; keeps ``x`` if the step makes |p| worse."""
+    p = dp = 0.0
+    for c in coeffs:
+        dp = dp * x + p
+        p = p * x + c
+    if dp == 0:
+        return x
+    y = x - p / dp
+    py = 0.0
+    for c in coeffs:
+        py = py * y + c
+    return y if abs(py) <= abs(p) else x
+
+
+def _cubic(a, b, c, d):
+    disc = 18 * a * b * c * d - 4 * b ** 3 * d + b * b * c * c - 4 * a * c ** 3 - 27 * a * a * d * d
+    d0 = b * b - 3 * a * c
+    if disc == 0:
+        if d0 == 0:
+            return [(-b / (3 * a), 3)]
+        double = (9 * a * d - b * c) / (2 * d0)
+        single = (4 * a * b * c - 9 * a * a * d - b ** 3) / (a * d0)
+        return _sort([(double, 2), (single, 1)])
+
+    floats = [float(a), float(b), float(c), float(d)]
+    shift = float(b / (3 * a))
+    p = float((3 * a * c - b * b) / (3 * a * a))
+    q = float((2 * b ** 3 - 9 * a * b * c + 27 * a * a * d) / (27 * a ** 3))
+    if disc > 0:
+        # Three distinct real zeroes (p < 0): Viète's trigonometric form.
+        m = 2 * math.sqrt(-p / 3)
+        arg = max(-1.0, min(1.0, 3 * q / (p * m)))
+        theta = math.acos(arg) / 3
+        zeroes = [_polish(floats, m * math.cos(theta - 2 * math.pi * k / 3) - shift) for k in range(3)]
+        return [(z, 1) for z in sorted(zeroes)]
+
+    # One real zero: Cardano with the cube root chosen to avoid cancellation.
+    s = math.sqrt(q * q / 4 + p ** 3 / 27)
+    u = math.cbrt(-q / 2 - math.copysign(s, q))
+    t = u - p / (3 * u) if u != 0 else math.cbrt(-q)
+    real = _polish(floats, t - shift)
+    # Deflate: a x^2 + (b + a r) x + (c + (b + a r) r) holds the complex pair.
+    fa, fb, fc, _ = floats
+    qb = fb + fa * real
+    qc = fc + qb * real
+    re = -qb / (2 * fa)
+    im = math.sqrt(max(0.0, 4 * fa * qc - qb * qb)) / abs(2 * fa)
+    return [(real, 1), (complex(re, -im), 1), (complex(re, im), 1)]
+
+
+def solve_closed_form(coeffs, decimal=False):
+    """Zeroes of a polynomial of degree 1 to 3, highest power first.
+
+    Returns ``[(zero, multiplicity), ...]``: real zeroes in increasing order
+    (``Fraction`` when rational and the coefficients are exact, ``float``
+    otherwise), then any complex pair. ``decimal=True`` reads float
+    coefficients as the decimals they print as; without it, floats are
+    taken at their exact binary value and no rational zeroes are looked for.
+    """
+    exact_input = decimal or not any(isinstance(c, float) for c in coeffs)
+    coeffs = [_exact(c, decimal) for c in coeffs]
+    while coeffs and coeffs[0] == 0:
+        coeffs.pop(0)
+    degree = len(coeffs) - 1
+    if not 1 <= degree <= 3:
+        raise ValueError(f"closed form needs degree 1 to 3, got {degree}")
+    if degree == 1:
+        return [(-coeffs[1] / coeffs[0], 1)]
+    if degree == 2:
+        return _quadratic(*coeffs)
+    # Split off rational zeroes first; what is left is 1 or a quadratic
+    # without rational zeroes.
+    found, rest = rational_roots(coeffs) if exact_input else ([], None)
+    if found:
+        zeroes = list(found)
+        if len(rest) == 3:
+            zeroes += _quadratic(*rest)
+        return _sort(zeroes)
+    return _cubic(*coeffs)
+
+
+def _sort(zeroes):
+    real = sorted((z for z in zeroes if not isinstance(z[0], complex)), key=lambda z: z[0])
+    return real + [z for z in zeroes if isinstance(z[0], complex)]
+
+
+def real_zeroes(coeffs, decimal=False):
+    """Distinct real zeroes of a degree 1–3 polynomial as floats, in increasing order."""
+    return [float(z) for z, _ in solve_closed_form(coeffs, decimal) if not isinstance(z, complex)]
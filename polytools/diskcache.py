@@ -0,0 +1,270 @@
+"""Persistent solve results in SQLite, shared by processes and restarts.
+
+:data:`polytools.analysis.analysis_cache` lives and dies with one server
+process. With ``POLYTOOLS_SOLVE_DB`` set to a file on local disk, every
+exact :class:`polytools.analysis.Analysis` (degree, exact and numeric
+zeroes, discriminant, Vieta checks) is also written to that SQLite
+database, keyed by the canonical form of the polynomial, together with
+LaTeX for its zeroes, discriminant and symmetric sums. A miss in memory
+then becomes a disk read instead of a solve, in this process or any other
+pointed at the same file.
+
+Several processes may share the file: it is opened in WAL mode, so readers
+never block the single writer, and writers wait up to :data:`BUSY_TIMEOUT`
+seconds for each other. Stored values are bounded by ``POLYTOOLS_SOLVE_DB_MB``
+(default 64): when a write takes them over, the least recently read entries
+are dropped down to :data:`EVICT_TO` of the limit. Read times are only
+refreshed once every :data:`TOUCH_INTERVAL` seconds per entry, so hits do
+not turn into a write each.
+
+Values are pickled; the file must be as trusted as the code. An entry that
+no longer loads (after an upgrade, say) is dropped and solved again, and a
+database error of any kind is counted, warned about once and treated as a
+miss, so the app never depends on the file.
+
+Preload the textbook exercises and the app's default inputs with::
+
+    python -m polytools.diskcache warm [--db PATH] [--timeout SECONDS]
+    python -m polytools.diskcache stats [--db PATH]
+"""
+
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import warnings
+
+DB_PATH = os.environ.get("POLYTOOLS_SOLVE_DB") or None
+DB_MB = float(os.environ.get("POLYTOOLS_SOLVE_DB_MB", "64"))
+BUSY_TIMEOUT = 5.0
+EVICT_TO = 0.9
+TOUCH_INTERVAL = 60.0
+# Bumped whenever the pickled Analysis changes shape; older files are emptied.
+SCHEMA_VERSION = 1
+
+# Exercise 1 and 2 of the Practice Questions, then the app's default inputs
+# and worked examples. Entries with surds are coefficient lists, since the
+# text parser only takes rational coefficients.
+WARM_INPUTS = [
+    "x^2 - 2x - 8", "4s^2 - 4s + 1", "6x^2 - 3 - 7x", "4u^2 + 8u", "t^2 - 15", "3x^2 - x - 4",
+    "4x^2 - x - 4", [3, "-3*sqrt(2)", 1], [1, 0, "sqrt(5)"], "x^2 - x + 1", "4x^2 + x + 1",
+    "x^2 - 4x + 1",
+    "x^2 - 3x - 4", "x^2 + 7x + 10", "2x^2 - 8x + 6", "2x^3 - 5x^2 - 14x + 8", "x^3 - 3x + 1",
+    "x^3 - 4x", "x^2 - 4",
+]
+
+
+def render_latex(analysis):
+    """LaTeX for the zeroes, discriminant and symmetric sums of ``analysis``."""
+    import sympy as sp
+
+    def tex(value):
+        if isinstance(value, float):
+            return f"{value:.10g}"
+        if isinstance(value, complex):
+            return sp.latex(sp.Float(value.real, 10) + sp.Float(value.imag, 10) * sp.I)
+        return sp.latex(sp.sympify(value))
+
+    return {
+        "zeroes": [tex(z) for z in analysis.zeroes],
+        "discriminant": None if analysis.discriminant is None else tex(analysis.discriminant),
+        "symmetric": [tex(s) for s in analysis.symmetric],
+        "vieta": [tex(v) for v in analysis.vieta],
+    }
+
+
+class SolveStore:
+    """SQLite table of pickled analyses, keyed by ``repr`` of the canonical key."""
+
+    def __init__(self, path, max_mb=DB_MB):
+        self.path = path
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._warned = False
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def _connect(self):
+        # One connection per thread (and per process, should one fork).
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # Truncate the write-ahead log after checkpoints instead of leaving it
+        # at its high-water mark.
+        conn.execute(f"PRAGMA journal_size_limit={self.max_bytes}")
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS solves")
+                conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            conn.execute("CREATE TABLE IF NOT EXISTS solves (key TEXT PRIMARY KEY, degree INTEGER, "
+                         "exact INTEGER, value BLOB, latex TEXT, size INTEGER, "
+                         "stored REAL, accessed REAL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS solves_accessed ON solves (accessed)")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _failed(self, exc):
+        self._count("errors")
+        if not self._warned:
+            self._warned = True
+            warnings.warn(f"solve store {self.path} unavailable, solving without it: {exc}")
+
+    def get(self, key):
+        """The stored analysis for canonical ``key``, with ``latex`` set, or ``None``."""
+        try:
+            conn = self._connect()
+            row = conn.execute("SELECT value, latex, accessed FROM solves WHERE key = ?",
+                               (repr(key),)).fetchone()
+            if row is None:
+                self._count("misses")
+                return None
+            try:
+                analysis = pickle.loads(row[0])
+                analysis.latex = json.loads(row[1])
+            except Exception:
+                conn.execute("DELETE FROM solves WHERE key = ?", (repr(key),))
+                self._count("misses")
+                return None
+            now = time.time()
+            if now - row[2] > TOUCH_INTERVAL:
+                conn.execute("UPDATE solves SET accessed = ? WHERE key = ?", (now, repr(key)))
+        except sqlite3.Error as exc:
+            self._failed(exc)
+            return None
+        self._count("hits")
+        return analysis
+
+    def put(self, analysis):
+        """Store ``analysis`` (rendering its LaTeX first) and evict if over the limit."""
+        if analysis.latex is None:
+            analysis.latex = render_latex(analysis)
+        value = pickle.dumps(analysis, protocol=pickle.HIGHEST_PROTOCOL)
+        latex = json.dumps(analysis.latex)
+        now = time.time()
+        try:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("INSERT OR REPLACE INTO solves VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                             (repr(analysis.key), analysis.degree, int(analysis.exact), value,
+                              latex, len(value) + len(latex), now, now))
+                self._evict(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as exc:
+            self._failed(exc)
+            return
+        self._count("writes")
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM solves").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - int(self.max_bytes * EVICT_TO)
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM solves ORDER BY accessed"):
+            if excess <= 0:
+                break
+            doomed.append((key,))
+            excess -= size
+        conn.executemany("DELETE FROM solves WHERE key = ?", doomed)
+        with self._lock:
+            self.evictions += len(doomed)
+
+    def clear(self):
+        try:
+            self._connect().execute("DELETE FROM solves")
+        except sqlite3.Error as exc:
+            self._failed(exc)
+
+    def stats(self):
+        entries = size = 0
+        try:
+            entries, size = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM solves").fetchone()
+        except sqlite3.Error as exc:
+            self._failed(exc)
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "size_mb": round(size / 2 ** 20, 2),
+                "max_mb": round(self.max_bytes / 2 ** 20, 2),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "errors": self.errors,
+            }
+
+
+def warm(inputs=WARM_INPUTS, timeout=None):
+    """Solve ``inputs`` into :data:`polytools.analysis.solve_store`; returns the count stored."""
+    import sympy as sp
+
+    from . import analysis
+    from .polynomial import Polynomial
+
+    if analysis.solve_store is None:
+        raise RuntimeError("no solve store: set POLYTOOLS_SOLVE_DB or pass --db")
+    before = analysis.solve_store.writes
+    for item in inputs:
+        if isinstance(item, str):
+            poly = analysis.parse(item)
+        else:
+            poly = Polynomial([sp.sympify(c) for c in item])
+        analysis.analyze(poly, timeout=timeout)
+    return analysis.solve_store.writes - before
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m polytools.diskcache",
+                                     description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["warm", "stats"])
+    parser.add_argument("--db", default=DB_PATH, metavar="PATH",
+                        help="database file (default $POLYTOOLS_SOLVE_DB)")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="seconds per exact solve (default the solver pool's)")
+    args = parser.parse_args(argv)
+    if args.db is None:
+        parser.error("no database: set POLYTOOLS_SOLVE_DB or pass --db")
+
+    from . import analysis
+
+    analysis.solve_store = SolveStore(args.db)
+    if args.command == "warm":
+        start = time.perf_counter()
+        stored = warm(timeout=args.timeout)
+        print(f"stored {stored} of {len(WARM_INPUTS)} inputs in {time.perf_counter() - start:.1f}s "
+              f"(others were already stored or share a canonical form)")
+    for name, value in analysis.solve_store.stats().items():
+        print(f"{name:10} {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
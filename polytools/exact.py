@@ -0,0 +1,352 @@
+"""Exact rational zeroes and real-root isolation for rational polynomials.
+
+Most textbook polynomials (``x^2 - 3x - 4``, ``6x^2 - 7x - 3``,
+``x^3 - 6x^2 + 11x - 6``) have only rational zeroes, and ``sp.solve`` is a
+slow way to find them. Here integer arithmetic does the work:
+
+- :func:`rational_roots` tries the candidates of the rational root theorem
+  and divides out each zero as often as it repeats;
+- :func:`square_free` splits the rest by multiplicity (Yun's algorithm);
+- :func:`isolate_real_roots` finds disjoint intervals with rational end
+  points, one per real zero, by Descartes' rule of signs with bisection
+  (Vincent–Collins–Akritas); :meth:`RealRoot.refine` narrows them.
+
+Only the part without rational zeroes is ever handed to SymPy, and the
+number of real zeroes is known exactly, even where SymPy cannot decide
+whether a radical expression is real.
+
+Polynomials are lists of ``int`` (or ``Fraction``), highest power first.
+"""
+
+from fractions import Fraction
+from math import gcd, isqrt, lcm
+
+# Largest constant or leading coefficient whose divisors are enumerated for
+# the rational root theorem (trial division up to its square root).
+DIVISOR_LIMIT = 10 ** 12
+# Above this many ``p/q`` pairs, only those next to a numeric real zero are tried.
+CANDIDATE_LIMIT = 2000
+
+
+class RealRoot:
+    """A real zero of multiplicity ``multiplicity`` inside ``[lo, hi]``.
+
+    ``lo == hi`` for a rational zero. Otherwise the zero is the only zero of
+    the square-free integer polynomial ``factor`` in the open interval, and
+    ``factor`` has opposite signs at the two ends.
+    """
+
+    __slots__ = ("lo", "hi", "multiplicity", "factor")
+
+    def __init__(self, lo, hi, multiplicity, factor):
+        self.lo = lo
+        self.hi = hi
+        self.multiplicity = multiplicity
+        self.factor = factor
+
+    @property
+    def is_rational(self):
+        return self.lo == self.hi
+
+    def refine(self, width):
+        """Bisect until ``hi - lo <= width``; returns a new :class:`RealRoot`."""
+        lo, hi = self.lo, self.hi
+        if lo == hi:
+            return self
+        sign_lo = sign_at(self.factor, lo)
+        while hi - lo > width:
+            mid = (lo + hi) / 2
+            sign_mid = sign_at(self.factor, mid)
+            if sign_mid == 0:
+                lo = hi = mid
+            elif sign_mid == sign_lo:
+                lo = mid
+            else:
+                hi = mid
+        return RealRoot(lo, hi, self.multiplicity, self.factor)
+
+    def __float__(self):
+        return float((self.lo + self.hi) / 2)
+
+    def __repr__(self):
+        return f"RealRoot({self.lo}, {self.hi}, multiplicity={self.multiplicity})"
+
+
+def primitive(coeffs):
+    """Integer multiple of ``coeffs`` with gcd 1 and a positive leading coefficient."""
+    coeffs = _trim([Fraction(c) for c in coeffs])
+    den = lcm(*(c.denominator for c in coeffs))
+    nums = [int(c * den) for c in coeffs]
+    g = gcd(*nums) or 1
+    if nums[0] < 0:
+        g = -g
+    return [n // g for n in nums]
+
+
+def _trim(coeffs):
+    start = 0
+    while start < len(coeffs) - 1 and coeffs[start] == 0:
+        start += 1
+    return list(coeffs[start:])
+
+
+def _derivative(coeffs):
+    n = len(coeffs) - 1
+    return [c * (n - i) for i, c in enumerate(coeffs[:-1])] or [0]
+
+
+def _divmod(a, b):
+    """Long division over the rationals: ``a = q * b + r``."""
+    r = [Fraction(c) for c in a]
+    if len(a) < len(b):
+        return [Fraction(0)], _trim(r)
+    q = []
+    for i in range(len(a) - len(b) + 1):
+        factor = r[i] / b[0]
+        q.append(factor)
+        if factor:
+            for j, c in enumerate(b):
+                r[i + j] -= factor * c
+    return q, _trim(r[len(q):] or [Fraction(0)])
+
+
+def _quotient(a, b):
+    """Primitive part of ``a / b`` for integer polynomials where ``b`` divides ``a``."""
+    q, _ = _divmod(a, b)
+    return primitive(q)
+
+
+def _pseudo_remainder(a, b):
+    r = list(a)
+    while len(r) >= len(b) and any(r):
+        factor = r[0]
+        r = [b[0] * c for c in r]
+        for j, c in enumerate(b):
+            r[j] -= factor * c
+        r = _trim(r[1:]) if len(r) > 1 else [0]
+    return r
+
+
+def _gcd(a, b):
+    """Primitive gcd of two integer polynomials (primitive remainder sequence).
+
+    Taking the primitive part of every pseudo-remainder keeps coefficients
+    small; Euclid over ``Fraction`` blows up already at degree 40.
+    """
+    a, b = primitive(a), primitive(b) if any(b) else [0]
+    while any(b):
+        r = _pseudo_remainder(a, b)
+        a, b = b, primitive(r) if any(r) else [0]
+    return a
+
+
+def square_free(coeffs):
+    """Square-free decomposition: ``[(factor, multiplicity), ...]``.
+
+    Factors are primitive integer polynomials of degree at least 1, pairwise
+    coprime, and their product (with multiplicities) is ``coeffs`` up to a
+    constant. Uses Musser's algorithm, which only needs everything up to
+    constant factors, so each step can stay in primitive integers.
+    """
+    f = primitive(coeffs)
+    if len(f) < 2:
+        return []
+    g = _gcd(f, _derivative(f))
+    if len(g) == 1:
+        return [(f, 1)]
+    w = _quotient(f, g)
+    factors = []
+    multiplicity = 1
+    while len(w) > 1:
+        y = _gcd(w, g)
+        z = _quotient(w, y)
+        if len(z) > 1:
+            factors.append((z, multiplicity))
+        w = y
+        g = _quotient(g, y)
+        multiplicity += 1
+    return factors
+
+
+def _divisors(n):
+    """Positive divisors of ``n``, or ``None`` when ``n`` is too large to factor."""
+    n = abs(n)
+    if n > DIVISOR_LIMIT:
+        return None
+    small, large = [], []
+    for d in range(1, isqrt(n) + 1):
+        if n % d == 0:
+            small.append(d)
+            if d * d != n:
+                large.append(n // d)
+    return small + large[::-1]
+
+
+def _scaled_value(coeffs, num, den):
+    """``den^n * p(num / den)`` by homogeneous Horner, in integers."""
+    result = 0
+    scale = 1
+    for c in coeffs:
+        result = result * num + c * scale
+        scale *= den
+    return result
+
+
+def sign_at(coeffs, value):
+    """Sign (-1, 0 or 1) of the integer polynomial ``coeffs`` at a rational ``value``."""
+    value = Fraction(value)
+    result = _scaled_value(coeffs, value.numerator, value.denominator)
+    return (result > 0) - (result < 0)
+
+
+def _deflate(coeffs, num, den):
+    """Divide an integer polynomial by ``den x - num``, which must divide it."""
+    quotient = []
+    carry = 0
+    for c in coeffs[:-1]:
+        carry = (c + num * carry) // den
+        quotient.append(carry)
+    return quotient
+
+
+def _at_one(coeffs):
+    return sum(coeffs)
+
+
+def _at_minus_one(coeffs):
+    n = len(coeffs) - 1
+    return sum(c if (n - i) % 2 == 0 else -c for i, c in enumerate(coeffs))
+
+
+def rational_roots(coeffs):
+    """Rational zeroes of a rational polynomial and what is left without them.
+
+    Returns ``(roots, rest)``: ``roots`` is a sorted list of
+    ``(Fraction, multiplicity)`` and ``rest`` the primitive integer
+    polynomial left after dividing them out. When the constant coefficient
+    is too large to factor (see :data:`DIVISOR_LIMIT`) or there are too many
+    candidates (:data:`CANDIDATE_LIMIT`), the candidates are the real
+    numeric zeroes rounded to each allowed denominator instead; every
+    candidate is still checked exactly. When the leading coefficient
+    is too large as well only zero is tried, and ``rest`` may still have
+    rational zeroes.
+    """
+    f = primitive(coeffs)
+    roots = []
+    zeros = 0
+    while len(f) > 1 and f[-1] == 0:
+        f.pop()
+        zeros += 1
+    if zeros:
+        roots.append((Fraction(0), zeros))
+    if len(f) < 2:
+        return roots, f
+    nums, dens = _divisors(f[-1]), _divisors(f[0])
+    if dens is None:
+        return roots, f
+    if nums is None or len(nums) * len(dens) > CANDIDATE_LIMIT:
+        candidates = _numeric_candidates(f, dens)
+    else:
+        candidates = sorted({Fraction(s * p, q) for p in nums for q in dens for s in (1, -1)})
+    at_one, at_minus_one = _at_one(f), _at_minus_one(f)
+    for r in candidates:
+        p, q = r.numerator, r.denominator
+        # If p/q is a zero, f = (qx - p) g with g integral, so (q - p) | f(1)
+        # and (q + p) | f(-1).
+        if q != p and at_one % (q - p):
+            continue
+        if q != -p and at_minus_one % (q + p):
+            continue
+        multiplicity = 0
+        while len(f) > 1 and _scaled_value(f, p, q) == 0:
+            f = _deflate(f, p, q)
+            multiplicity += 1
+        if multiplicity:
+            roots.append((r, multiplicity))
+            if len(f) < 2:
+                break
+            at_one, at_minus_one = _at_one(f), _at_minus_one(f)
+    roots.sort()
+    return roots, f
+
+
+def _numeric_candidates(f, dens):
+    from .roots import find_roots
+
+    try:
+        approximations = [r.value for r in find_roots(f) if r.real]
+    except ValueError:
+        return []
+    return sorted({Fraction(round(x * q), q) for x in approximations for q in dens})
+
+
+def _shift_one(coeffs):
+    """Coefficients of ``p(x + 1)`` (Taylor shift, O(n^2) additions)."""
+    a = list(coeffs)
+    n = len(a) - 1
+    for i in range(n):
+        for j in range(1, n - i + 1):
+            a[j] += a[j - 1]
+    return a
+
+
+def _sign_changes(coeffs):
+    signs = [c > 0 for c in coeffs if c]
+    return sum(s != t for s, t in zip(signs, signs[1:]))
+
+
+def _isolate_positive(f):
+    """Isolating intervals for the zeroes of square-free ``f`` in ``(0, inf)``.
+
+    Every zero lies below the Cauchy bound ``B``, a power of two; the search
+    starts from ``q(t) = f(B t)`` on ``(0, 1)`` and bisects while Descartes'
+    rule of signs on ``(t + 1)^n q(1 / (t + 1))`` allows more than one zero.
+    """
+    n = len(f) - 1
+    bound = 1
+    limit = 1 + max(Fraction(abs(c), abs(f[0])) for c in f[1:])
+    while bound < limit:
+        bound *= 2
+    q = [c * bound ** (n - i) for i, c in enumerate(f)]
+    found = []
+    stack = [(q, Fraction(0), Fraction(bound))]
+    while stack:
+        q, lo, hi = stack.pop()
+        if q[-1] == 0:
+            # A zero exactly at the left end (only ever a bisection midpoint).
+            found.append((lo, lo))
+            q = q[:-1]
+        if len(q) < 2:
+            continue
+        variations = _sign_changes(_shift_one(q[::-1]))
+        if variations == 0:
+            continue
+        # One sign change means exactly one zero inside; also insist on a
+        # nonzero value at the right end so refinement can bisect on signs.
+        if variations == 1 and sum(q) != 0:
+            found.append((lo, hi))
+            continue
+        mid = (lo + hi) / 2
+        left = [c << i for i, c in enumerate(q)]
+        stack.append((_shift_one(left), mid, hi))
+        stack.append((left, lo, mid))
+    return found
+
+
+def isolate_real_roots(coeffs):
+    """All real zeroes of a rational polynomial as sorted :class:`RealRoot` intervals.
+
+    Rational zeroes come back exactly (``lo == hi``); every other interval
+    contains one irrational zero and no other zero.
+    """
+    roots, rest = rational_roots(coeffs)
+    result = [RealRoot(r, r, m, [r.denominator, -r.numerator]) for r, m in roots]
+    for factor, multiplicity in square_free(rest):
+        n = len(factor) - 1
+        mirrored = [c if (n - i) % 2 == 0 else -c for i, c in enumerate(factor)]
+        for lo, hi in _isolate_positive(factor):
+            result.append(RealRoot(lo, hi, multiplicity, factor))
+        for lo, hi in _isolate_positive(mirrored):
+            result.append(RealRoot(-hi, -lo, multiplicity, factor))
+    result.sort(key=lambda root: (root.lo, root.hi))
+    return result
@@ -0,0 +1,361 @@
+"""Randomised practice problems in the style of Exercises 1 and 2.
+
+``find_zeroes`` problems are built backwards from their zeroes: each row
+draws ``degree`` rational zeroes ``p/q`` (``|p| <= max_numerator``, ``q``
+from ``denominators``) and an integer factor ``k`` up to ``max_leading``,
+and multiplies out ``k * prod(q x - p)``, so the polynomial has integer
+coefficients and its zeroes are known exactly. ``from_sum_product``
+problems draw a rational sum and product and answer with the smallest
+integer multiple of ``x^2 - Sx + P``.
+
+Everything is done on whole NumPy batches of int64 rows: drawing,
+multiplying out, the optional ``max_coeff`` and ``distinct`` filters, and
+the checks. Every generated row is verified before it is kept, exactly and
+in bulk: each zero must make the polynomial vanish (homogeneous Horner,
+``sum a_j p^(n-j) q^j == 0``) and the elementary symmetric sums of the
+zeroes must equal ``(-1)^k a_k / a_0`` (cross-multiplied, so no division).
+With ``unique`` (the default) problems are deduplicated on their canonical
+form, as in :func:`polytools.cache.canonical_form`, so scalar multiples
+and different variable names count as one problem. Parameters whose
+worst case would overflow int64 are rejected up front.
+
+The result is a :class:`Problems` of arrays; :meth:`Problems.questions`
+turns it into question-bank rows (:mod:`polytools.questions`), and the
+command line writes them as JSON lines for ``POLYTOOLS_QUESTION_BANK`` or
+:mod:`polytools.batch`::
+
+    python -m polytools.generator -n 100000 [--kind find_zeroes|from_sum_product]
+        [--degree 2] [--max-numerator 9] [--denominators 1,2,3]
+        [--max-leading 3] [--max-coeff N] [--distinct] [--seed S] [-o bank.jsonl]
+"""
+
+import json
+import sys
+import time
+
+import numpy as np
+
+KINDS = ("find_zeroes", "from_sum_product")
+VARIABLES = ("x", "y", "s", "t", "u", "v")
+# Smallest batch drawn; later batches are sized to what is still missing.
+BATCH_MIN = 1024
+BATCH_MAX = 1 << 20
+OVERSAMPLE = 1.25
+# Give up when this many batches in a row add no new problem.
+STALL = 3
+_INT64_MAX = 2 ** 63 - 1
+
+
+class Problems:
+    """A batch of generated problems as parallel arrays, one row per problem.
+
+    ``coeffs`` are int64 coefficients, highest power first. For
+    ``find_zeroes``, ``num / den`` are the zeroes (``degree`` columns, in
+    increasing order); for ``from_sum_product`` they are the sum and the
+    product. ``difficulty`` indexes :data:`polytools.questions.DIFFICULTIES`.
+    """
+
+    __slots__ = ("kind", "coeffs", "num", "den", "variables", "difficulty", "drawn", "rejected")
+
+    def __init__(self, kind, coeffs, num, den, variables, difficulty, drawn=0, rejected=0):
+        self.kind = kind
+        self.coeffs = coeffs
+        self.num = num
+        self.den = den
+        self.variables = variables
+        self.difficulty = difficulty
+        self.drawn = drawn
+        self.rejected = rejected
+
+    def __len__(self):
+        return len(self.coeffs)
+
+    def verify(self):
+        """Boolean mask of the rows whose answers check out exactly."""
+        if self.kind == "find_zeroes":
+            return verify_zeroes(self.coeffs, self.num, self.den)
+        return verify_sum_product(self.coeffs, self.num, self.den)
+
+    def questions(self):
+        """Yield question-bank rows (see :mod:`polytools.questions`)."""
+        from .questions import DIFFICULTIES
+
+        find = self.kind == "find_zeroes"
+        rows = zip(self.coeffs.tolist(), self.num.tolist(), self.den.tolist(),
+                   self.variables.tolist(), self.difficulty.tolist())
+        for coeffs, num, den, var, level in rows:
+            text = polynomial_text(coeffs, var)
+            question = {
+                "id": f"gen-{'fz' if find else 'sp'}-{var}-" + "_".join(map(str, coeffs)),
+                "exercise": ("Generated: Find Zeroes and Verify Relationships" if find
+                             else "Generated: Find Quadratic Polynomials"),
+                "topic": "zeroes-and-coefficients" if find else "polynomial-from-zeroes",
+                "kind": self.kind,
+                "degree": len(coeffs) - 1,
+                "difficulty": DIFFICULTIES[level],
+            }
+            if find:
+                question["polynomial"] = text
+                question["zeroes"] = [_fraction_text(p, q) for p, q in zip(num, den)]
+                question["text"] = (f"Find the zeroes of the polynomial \\({text}\\) and verify "
+                                    f"the relationship between zeroes and coefficients.")
+            else:
+                (s, p), (s_den, p_den) = num, den
+                question["sum"] = _fraction_text(s, s_den)
+                question["product"] = _fraction_text(p, p_den)
+                question["answer"] = text
+                question["text"] = (f"Find a quadratic polynomial with the sum and product of its "
+                                    f"zeroes as Sum = \\({_fraction_tex(s, s_den)}\\), "
+                                    f"Product = \\({_fraction_tex(p, p_den)}\\).")
+            yield question
+
+
+def _fraction_text(p, q):
+    return str(p) if q == 1 else f"{p}/{q}"
+
+
+def _fraction_tex(p, q):
+    if q == 1:
+        return str(p)
+    return ("-" if p < 0 else "") + f"\\frac{{{abs(p)}}}{{{q}}}"
+
+
+def polynomial_text(coeffs, var="x"):
+    """``coeffs`` (integers, highest power first) as typed, e.g. ``2x^2 - x - 4``."""
+    n = len(coeffs) - 1
+    terms = []
+    for i, c in enumerate(coeffs):
+        if c == 0:
+            continue
+        power = n - i
+        magnitude = abs(c)
+        text = "" if power and magnitude == 1 else str(magnitude)
+        if power:
+            text += var if power == 1 else f"{var}^{power}"
+        if terms:
+            terms.append(("- " if c < 0 else "+ ") + text)
+        else:
+            terms.append(("-" if c < 0 else "") + text)
+    return " ".join(terms) or "0"
+
+
+# Vectorised construction and checks
+
+def _reduce(num, den):
+    g = np.gcd(num, den)
+    return num // g, den // g
+
+
+def multiply_out(num, den, leading=None):
+    """Coefficients of ``leading * prod(den x - num)`` for each row of zeroes."""
+    rows, degree = num.shape
+    coeffs = np.zeros((rows, degree + 1), dtype=np.int64)
+    coeffs[:, 0] = 1 if leading is None else leading
+    for i in range(degree):
+        # Multiply by (q x - p): the shifted row times q minus the row times p.
+        p, q = num[:, i:i + 1], den[:, i:i + 1]
+        coeffs[:, 1:i + 2] = coeffs[:, 1:i + 2] * q - coeffs[:, :i + 1] * p
+        coeffs[:, 0] *= den[:, i]
+    return coeffs
+
+
+def verify_zeroes(coeffs, num, den):
+    """Rows where every ``num/den`` is a zero and Vieta's formulas hold exactly."""
+    degree = coeffs.shape[1] - 1
+    ok = np.ones(len(coeffs), dtype=bool)
+    # Each zero makes the polynomial vanish: sum a_j p^(n-j) q^j == 0.
+    for i in range(num.shape[1]):
+        p, q = num[:, i], den[:, i]
+        value = coeffs[:, 0].copy()
+        q_power = np.ones_like(q)
+        for j in range(1, degree + 1):
+            q_power *= q
+            value = value * p + coeffs[:, j] * q_power
+        ok &= value == 0
+    # e_k = E_k / Q with Q = prod q and E_k built by the usual recurrence
+    # on (p, q) pairs; then e_k == (-1)^k a_k / a_0 is E_k a_0 == (-1)^k a_k Q.
+    e = np.zeros((len(coeffs), degree + 1), dtype=np.int64)
+    e[:, 0] = 1
+    for i in range(degree):
+        p, q = num[:, i:i + 1], den[:, i:i + 1]
+        e[:, 1:i + 2] = e[:, 1:i + 2] * q + e[:, :i + 1] * p
+        e[:, 0] *= den[:, i]
+    total_den = e[:, :1]
+    signs = np.where(np.arange(1, degree + 1) % 2, -1, 1)
+    ok &= np.all(e[:, 1:] * coeffs[:, :1] == signs * coeffs[:, 1:] * total_den, axis=1)
+    return ok
+
+
+def verify_sum_product(coeffs, num, den):
+    """Rows where ``-b/a`` is the sum and ``c/a`` the product, exactly."""
+    a, b, c = coeffs[:, 0], coeffs[:, 1], coeffs[:, 2]
+    return (-b * den[:, 0] == num[:, 0] * a) & (c * den[:, 1] == num[:, 1] * a) & (a > 0)
+
+
+def _check_range(kind, degree, max_numerator, denominators, max_leading):
+    # Worst cases of the coefficients and of the verification products,
+    # computed with Python integers.
+    top = max(max_numerator, max(denominators))
+    if kind == "find_zeroes":
+        coeff = max_leading * (max_numerator + max(denominators)) ** degree
+        worst = max((degree + 1) * coeff * top ** degree, coeff * (top + 1) ** degree * top ** degree)
+    else:
+        coeff = max(denominators) ** 2 * max_numerator
+        worst = coeff * top
+    if worst > _INT64_MAX:
+        raise ValueError("degree, max_numerator, denominators or max_leading too large for "
+                         "exact int64 checks; lower one of them")
+
+
+def _draw_zeroes(rng, rows, degree, max_numerator, denominators, max_leading, max_coeff,
+                 distinct):
+    num = rng.integers(-max_numerator, max_numerator + 1, (rows, degree), dtype=np.int64)
+    den = rng.choice(np.asarray(denominators, dtype=np.int64), (rows, degree))
+    num, den = _reduce(num, den)
+    order = np.argsort(num / den, axis=1, kind="stable")
+    num, den = np.take_along_axis(num, order, 1), np.take_along_axis(den, order, 1)
+    # prod(q x - p) with every p/q in lowest terms is primitive (Gauss's
+    # lemma), so it is the canonical form used for deduplication.
+    primitive = multiply_out(num, den)
+    leading = rng.integers(1, max_leading + 1, rows, dtype=np.int64)
+    coeffs = primitive * leading[:, None]
+    keep = np.ones(rows, dtype=bool)
+    if distinct and degree > 1:
+        keep &= np.all((num[:, 1:] != num[:, :-1]) | (den[:, 1:] != den[:, :-1]), axis=1)
+    if max_coeff is not None:
+        keep &= np.abs(coeffs).max(axis=1) <= max_coeff
+    # Difficulty: easy for a monic quadratic with integer zeroes, hard for
+    # higher degrees or coefficients past the times tables, else medium.
+    integral = np.all(den == 1, axis=1) & (coeffs[:, 0] == 1)
+    level = np.where(integral, 0, 1)
+    if degree > 2:
+        level[:] = 2
+    level[np.abs(coeffs).max(axis=1) > 100] = 2
+    return coeffs, primitive, num, den, level, keep
+
+
+def _draw_sum_product(rng, rows, max_numerator, denominators, max_coeff):
+    num = rng.integers(-max_numerator, max_numerator + 1, (rows, 2), dtype=np.int64)
+    den = rng.choice(np.asarray(denominators, dtype=np.int64), (rows, 2))
+    num, den = _reduce(num, den)
+    # Smallest integer multiple of x^2 - Sx + P: scale by lcm of the denominators.
+    scale = den[:, 0] * den[:, 1] // np.gcd(den[:, 0], den[:, 1])
+    coeffs = np.stack([scale, -num[:, 0] * (scale // den[:, 0]), num[:, 1] * (scale // den[:, 1])],
+                      axis=1)
+    keep = np.ones(rows, dtype=bool)
+    if max_coeff is not None:
+        keep &= np.abs(coeffs).max(axis=1) <= max_coeff
+    level = (den != 1).sum(axis=1)
+    return coeffs, coeffs, num, den, level, keep
+
+
+def generate(n, kind="find_zeroes", degree=2, max_numerator=9, denominators=(1,), max_leading=1,
+             max_coeff=None, distinct=False, unique=True, variables=VARIABLES, seed=None):
+    """:class:`Problems` of ``n`` verified problems (see the module docstring).
+
+    ``degree`` and ``max_leading`` only apply to ``find_zeroes``. Raises
+    ``ValueError`` for out-of-range settings, or when ``unique`` is set and
+    the settings allow fewer than ``n`` distinct problems.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"kind must be one of {', '.join(KINDS)}")
+    if kind == "from_sum_product":
+        degree = 2
+    if n < 0 or degree < 1 or max_numerator < 0 or max_leading < 1:
+        raise ValueError("n, degree, max_numerator and max_leading must be non-negative "
+                         "(degree and max_leading at least 1)")
+    if not denominators or min(denominators) < 1:
+        raise ValueError("denominators must be positive integers")
+    _check_range(kind, degree, max_numerator, denominators, max_leading)
+    rng = np.random.default_rng(seed)
+
+    key_type = np.dtype((np.void, 8 * (degree + 1)))
+    parts, seen = [], set()
+    have = drawn = rejected = stalled = 0
+    rate = 1.0
+    while have < n:
+        # Size the batch by the share of the last one that was kept, since
+        # duplicates grow as the pool fills up.
+        rows = min(BATCH_MAX, max(BATCH_MIN, int((n - have) / rate * OVERSAMPLE)))
+        if kind == "find_zeroes":
+            batch = _draw_zeroes(rng, rows, degree, max_numerator, denominators, max_leading,
+                                 max_coeff, distinct)
+        else:
+            batch = _draw_sum_product(rng, rows, max_numerator, denominators, max_coeff)
+        coeffs, primitive, num, den, level, keep = batch
+        drawn += rows
+        verified = Problems(kind, coeffs, num, den, None, level).verify()
+        rejected += int(np.count_nonzero(keep & ~verified))
+        keep = np.flatnonzero(keep & verified)
+        if unique:
+            keys = np.ascontiguousarray(primitive[keep]).view(key_type).ravel()
+            # First occurrence of each canonical form in the batch, in order,
+            # then only those not kept from an earlier batch.
+            _, first = np.unique(keys, return_index=True)
+            first.sort()
+            new = [i for i, key in zip(first.tolist(), keys[first].tolist()) if key not in seen]
+            seen.update(keys[new].tolist())
+            keep = keep[new]
+        keep = keep[:n - have]
+        parts.append((coeffs[keep], num[keep], den[keep], level[keep]))
+        have += len(keep)
+        rate = max(len(keep) / rows, 1 / BATCH_MAX)
+        stalled = 0 if len(keep) else stalled + 1
+        if stalled >= STALL:
+            raise ValueError(f"only {have} distinct problems found with these settings, "
+                             f"{n} requested")
+
+    if not parts:
+        empty = np.empty((0, degree + 1 if kind == "find_zeroes" else 3), dtype=np.int64)
+        parts.append((empty, empty[:, :-1], empty[:, :-1], np.empty(0, dtype=np.int64)))
+    coeffs, num, den, level = (np.concatenate(column) for column in zip(*parts))
+    names = np.asarray(variables)[rng.integers(0, len(variables), len(coeffs))]
+    return Problems(kind, coeffs, num, den, names, level, drawn, rejected)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m polytools.generator",
+                                     description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--count", type=int, default=1000)
+    parser.add_argument("--kind", choices=KINDS, default="find_zeroes")
+    parser.add_argument("--degree", type=int, default=2)
+    parser.add_argument("--max-numerator", type=int, default=9,
+                        help="largest |numerator| of a zero, or of the sum and product")
+    parser.add_argument("--denominators", default="1",
+                        help="comma-separated denominators to draw from (default 1)")
+    parser.add_argument("--max-leading", type=int, default=1,
+                        help="largest extra integer factor of a find_zeroes polynomial")
+    parser.add_argument("--max-coeff", type=int, default=None, help="drop larger coefficients")
+    parser.add_argument("--distinct", action="store_true", help="no repeated zeroes")
+    parser.add_argument("--allow-duplicates", action="store_true")
+    parser.add_argument("--variables", default=",".join(VARIABLES))
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("-o", "--output", default="-", metavar="PATH",
+                        help="JSON lines output (default stdout)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        problems = generate(args.count, args.kind, args.degree, args.max_numerator,
+                            [int(d) for d in args.denominators.split(",")], args.max_leading,
+                            args.max_coeff, args.distinct, not args.allow_duplicates,
+                            args.variables.split(","), args.seed)
+    except ValueError as exc:
+        parser.error(str(exc))
+    generated = time.perf_counter() - start
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        out.writelines(json.dumps(q) + "\n" for q in problems.questions())
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(json.dumps({"problems": len(problems), "drawn": problems.drawn,
+                      "rejected": problems.rejected, "generate_seconds": round(generated, 3),
+                      "total_seconds": round(time.perf_counter() - start, 3)}), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,606 @@
+"""Bulk grading of student answers against the question bank.
+
+Each submission names a question of :data:`polytools.questions.bank` (or
+the bank given with ``--bank``), optionally the ``part`` answered and the
+``answer`` as typed:
+
+- ``zeroes``: a list such as ``4, -2``, ``x = 1/2 and x = 1/2``,
+  ``sqrt(15), -sqrt(15)`` or ``2 ± √3``. A repeated zero may be given once
+  or as often as it repeats.
+- ``sum`` / ``product``: one value, the sum or product of the zeroes.
+- ``polynomial``: e.g. ``4x^2 - x - 4``. Any non-zero scalar multiple in
+  any variable is accepted, as in the Exercise 2 answers, so
+  ``x^2 - 1/4x - 1`` is right too.
+
+Without a ``part``, ``find_zeroes`` questions expect the zeroes and
+``from_sum_product`` questions the polynomial.
+
+Comparison is exact. Rational values and polynomials go through
+:func:`polytools.parser.parse_polynomial` and are compared as ``Fraction``
+values or on :func:`polytools.cache.canonical_form`. Answers with surds
+are read by SymPy after a whitelist check (digits, ``+ - * / ( )``,
+``sqrt`` and one variable, small integer powers; see
+:func:`polytools.parser.surd_text`). They are compared numerically
+first, and only near-equal values are confirmed with ``sp.simplify``. The reference for each question (zeroes with
+multiplicity, sum, product, canonical polynomial) is worked out once.
+
+Submissions repeat heavily, so each distinct (question, part, answer) is
+graded once and the verdict reused. That is what makes millions of
+answers a minute possible: the remaining cost is reading and counting.
+With ``--jobs`` chunks are graded in worker processes as well::
+
+    python -m polytools.grader SUBMISSIONS [...] [--bank PATH] [-o RESULTS]
+                               [--stats STATS] [--format auto|csv|jsonl] [--jobs N]
+
+Submissions are CSV with columns ``student,question,part,answer`` or JSON
+lines with those fields. ``-o`` writes one JSON line per submission with
+its ``verdict``: ``correct``, ``wrong``, ``invalid`` (the answer, or the
+JSON line itself, could not be read) or ``unknown`` (no such question or
+part). The per-question
+statistics go to ``--stats`` (default stdout), one JSON line per question
+and part.
+"""
+
+import csv
+import io
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from math import lcm
+
+from .cache import LRUCache, canonical_form
+
+PARTS = ("zeroes", "sum", "product", "polynomial")
+ALIASES = {"zeros": "zeroes", "roots": "zeroes", "zero": "zeroes", "poly": "polynomial"}
+VERDICTS = ("correct", "wrong", "invalid", "unknown")
+CHUNK_SIZE = 4096
+WINDOW = 4
+# Verdicts remembered per grader; a worksheet has far fewer distinct answers.
+MEMO_SIZE = 1 << 18
+# Most common wrong answers kept per question in the statistics.
+COMMON_WRONG = 3
+# Relative tolerance of the numeric pre-check; exact equality is then
+# confirmed with SymPy.
+TOLERANCE = 1e-9
+MAX_ANSWER = 200
+
+_SPLIT = re.compile(r",|;|\band\b")
+_VARIABLE = re.compile(r"^\s*[a-zA-Z]\s*=\s*")
+_PLUS_MINUS = re.compile(r"±|\+/-")
+
+
+def _answer(submission):
+    # A JSON answer of 0 is an answer, not a missing one.
+    answer = submission.get("answer")
+    return "" if answer is None else answer
+
+
+def _normalise(answer):
+    # JSON answers may be a number or a list of zeroes.
+    if isinstance(answer, (list, tuple)):
+        answer = ", ".join(map(str, answer))
+    return " ".join(str(answer).split())
+
+
+# Reading answers
+
+def _rational(text):
+    """``text`` as a ``Fraction``, or ``None`` if it is not a rational number."""
+    from .parser import PolynomialSyntaxError, parse_polynomial
+
+    try:
+        return Fraction(text.replace(" ", ""))
+    except (ValueError, ZeroDivisionError):
+        pass
+    try:
+        poly = parse_polynomial(text)
+    except (PolynomialSyntaxError, ValueError, ZeroDivisionError):
+        return None
+    if poly.degree > 0 or not poly.is_rational:
+        return None
+    return poly.all_coeffs()[0]
+
+
+def _surd_text(text):
+    """``text`` rewritten for SymPy, or ``None`` if too long or not only surds."""
+    from .parser import surd_text
+
+    if len(text) > MAX_ANSWER:
+        return None
+    return surd_text(text)
+
+
+def _surd(text):
+    import sympy as sp
+
+    text = _surd_text(text)
+    if text is None:
+        return None
+    try:
+        value = sp.sympify(text, rational=True)
+    except (sp.SympifyError, SyntaxError, TypeError, ZeroDivisionError):
+        return None
+    # "sqrt" alone gives a function and "1, 2" a tuple, not a number.
+    if not isinstance(value, sp.Expr) or not value.is_number or value.has(sp.zoo, sp.nan):
+        return None
+    return value
+
+
+def read_value(text):
+    """A typed number: ``Fraction`` when rational, else a SymPy surd; ``None`` if unreadable."""
+    text = _VARIABLE.sub("", text).strip()
+    if not text:
+        return None
+    value = _rational(text)
+    if value is None:
+        value = _surd(text)
+    if value is not None and not isinstance(value, Fraction) and value.is_Rational:
+        value = Fraction(int(value.p), int(value.q))
+    return value
+
+
+def read_values(text):
+    """The values listed in ``text``, ``a ± b`` counting as two; ``None`` if any is unreadable."""
+    values = []
+    for item in _SPLIT.split(text):
+        item = _VARIABLE.sub("", item).strip()
+        if not item:
+            continue
+        halves = _PLUS_MINUS.split(item, 1)
+        if len(halves) == 2:
+            items = [f"({halves[0]}) + ({halves[1]})", f"({halves[0]}) - ({halves[1]})"]
+            if not halves[0].strip():
+                items = [halves[1], f"-({halves[1]})"]
+        else:
+            items = [item]
+        for part in items:
+            value = read_value(part)
+            if value is None:
+                return None
+            values.append(value)
+    return values or None
+
+
+def read_polynomial(text):
+    """``text`` as a :class:`~polytools.polynomial.Polynomial`, or ``None``.
+
+    Surd coefficients (``3x^2 - 3sqrt(2)x + 1``) are read with SymPy, see
+    :func:`polytools.parser.parse_with_surds`.
+    """
+    from .parser import PolynomialSyntaxError, parse_with_surds
+
+    try:
+        return parse_with_surds(text)
+    except (PolynomialSyntaxError, ValueError, ZeroDivisionError):
+        return None
+
+
+# Comparison
+
+def _complex(value):
+    return complex(value) if isinstance(value, (Fraction, int, float, complex)) else complex(value.evalf())
+
+
+def equal(a, b):
+    """Exact equality of two values read by :func:`read_value` or from a reference."""
+    import sympy as sp
+
+    if isinstance(a, Fraction) and isinstance(b, Fraction):
+        return a == b
+    x, y = _complex(a), _complex(b)
+    if abs(x - y) > TOLERANCE * max(1.0, abs(y)):
+        return False
+    if isinstance(a, (float, complex)) or isinstance(b, (float, complex)):
+        # A numeric reference (the exact solve timed out) can only be
+        # matched numerically.
+        return True
+    return sp.simplify(sp.sympify(a) - sp.sympify(b)) == 0
+
+
+def same_zeroes(answer, reference):
+    """``answer`` lists the zeroes ``reference`` (with multiplicity), or each distinct one once."""
+    remaining = list(reference)
+    for value in answer:
+        for i, zero in enumerate(remaining):
+            if equal(value, zero):
+                del remaining[i]
+                break
+        else:
+            remaining = None
+            break
+    if remaining == []:
+        return True
+    distinct = []
+    for zero in reference:
+        if not any(equal(zero, d) for d in distinct):
+            distinct.append(zero)
+    return (len(answer) == len(distinct)
+            and all(any(equal(value, zero) for zero in distinct) for value in answer)
+            and all(any(equal(value, zero) for value in answer) for zero in distinct))
+
+
+def proportional(poly, reference):
+    """``poly`` is a non-zero scalar multiple of ``reference``."""
+    if poly.degree != reference.degree or poly.degree < 0:
+        return False
+    if poly.is_rational and reference.is_rational:
+        return canonical_form(poly)[0] == canonical_form(reference)[0]
+    a, b = poly.all_coeffs(), reference.all_coeffs()
+    # a_i b_0 == b_i a_0 for every i, so a == (a_0 / b_0) b.
+    return all(equal(x * b[0], y * a[0]) for x, y in zip(a, b))
+
+
+# References
+
+class Reference:
+    """What a correct answer to one question is, worked out once.
+
+    The zeroes of a ``from_sum_product`` question are only solved for if
+    some answer asks for them.
+    """
+
+    __slots__ = ("question", "kind", "poly", "sum", "product", "_zeroes")
+
+    def __init__(self, question, poly, total, product, zeroes=None):
+        self.question = question
+        self.kind = question["kind"]
+        self.poly = poly
+        self.sum = total
+        self.product = product
+        self._zeroes = zeroes
+
+    @property
+    def zeroes(self):
+        """The zeroes, repeated by multiplicity when that is known."""
+        if self._zeroes is None:
+            from .analysis import analyze
+            from .vieta import zeroes_with_multiplicity
+
+            analysis = analyze(self.poly)
+            zeroes = zeroes_with_multiplicity(self.poly, analysis)
+            if zeroes is None:
+                zeroes = list(analysis.zeroes)
+            self._zeroes = [z if isinstance(z, (Fraction, float, complex)) else _exact(z)
+                            for z in zeroes]
+        return self._zeroes
+
+    def default_part(self):
+        return "zeroes" if self.kind == "find_zeroes" else "polynomial"
+
+
+def _exact(value):
+    import sympy as sp
+
+    if isinstance(value, Fraction):
+        return value
+    if isinstance(value, str):
+        try:
+            return Fraction(value)
+        except (ValueError, ZeroDivisionError):
+            pass
+    value = sp.nsimplify(value) if isinstance(value, float) else sp.sympify(value)
+    return Fraction(int(value.p), int(value.q)) if value.is_Rational else value
+
+
+def reference(question):
+    """:class:`Reference` for ``question``; zeroes come from its ``zeroes`` field or the solver."""
+    from .polynomial import Polynomial
+    from .questions import question_polynomial
+
+    zeroes = [_exact(z) for z in question["zeroes"]] if "zeroes" in question else None
+    if question["kind"] == "from_sum_product":
+        total, product = _exact(question["sum"]), _exact(question["product"])
+        if isinstance(total, Fraction) and isinstance(product, Fraction):
+            k = lcm(total.denominator, product.denominator)
+            poly = Polynomial([k, -k * total, k * product])
+        else:
+            poly = question_polynomial(question)
+        return Reference(question, poly, total, product, zeroes)
+    poly = question_polynomial(question)
+    coeffs, n = poly.all_coeffs(), poly.degree
+    if n < 1:
+        return Reference(question, poly, None, None, [])
+    total = _exact(-coeffs[1] / coeffs[0])
+    product = _exact((-1) ** n * coeffs[-1] / coeffs[0])
+    return Reference(question, poly, total, product, zeroes)
+
+
+def _read(read, answer):
+    """``read(answer)``, or ``None`` if reading fails in any way.
+
+    The readers return ``None`` for answers they reject, but SymPy can
+    still raise on input nobody thought of; one such answer must not stop
+    a run over a whole cohort.
+    """
+    try:
+        return read(answer)
+    except Exception:
+        return None
+
+
+class Grader:
+    """Grades answers to the questions of one bank, remembering every verdict."""
+
+    def __init__(self, bank=None):
+        if bank is None:
+            from .questions import bank
+        self.bank = bank
+        self._references = LRUCache(maxsize=4096)
+        self._memo = {}
+        self.graded = 0
+        self.reused = 0
+
+    def reference(self, question_id):
+        question = self.bank.find(question_id)
+        if question is None:
+            return None
+        return self._references.get_or_compute(question_id, lambda: reference(question))
+
+    def grade(self, question_id, answer, part=None):
+        """``(part, verdict)`` for one answer; ``part`` defaults by question kind."""
+        part = ALIASES.get(part, part) if part else None
+        key = (question_id, part, _normalise(answer))
+        verdict = self._memo.get(key)
+        if verdict is not None:
+            self.reused += 1
+            return verdict
+        verdict = self._grade(question_id, key[2], part)
+        self.graded += 1
+        if len(self._memo) >= MEMO_SIZE:
+            self._memo.clear()
+        self._memo[key] = verdict
+        return verdict
+
+    def _grade(self, question_id, answer, part):
+        ref = self.reference(question_id)
+        if ref is None:
+            return part or "", "unknown"
+        part = part or ref.default_part()
+        if part not in PARTS:
+            return part, "unknown"
+        if len(answer) > MAX_ANSWER:
+            return part, "invalid"
+        if part == "polynomial":
+            poly = _read(read_polynomial, answer)
+            if poly is None:
+                return part, "invalid"
+            return part, "correct" if proportional(poly, ref.poly) else "wrong"
+        if part == "zeroes":
+            values = _read(read_values, answer)
+            if values is None:
+                return part, "invalid"
+            return part, "correct" if same_zeroes(values, ref.zeroes) else "wrong"
+        value = _read(read_value, answer)
+        if value is None:
+            return part, "invalid"
+        expected = ref.sum if part == "sum" else ref.product
+        return part, "correct" if expected is not None and equal(value, expected) else "wrong"
+
+
+# Statistics
+
+class QuestionStats:
+    """Counts for one question and part."""
+
+    __slots__ = ("attempts", "verdicts", "students", "wrong_answers")
+
+    def __init__(self):
+        self.attempts = 0
+        self.verdicts = Counter()
+        self.students = set()
+        self.wrong_answers = Counter()
+
+    def add(self, student, answer, verdict):
+        self.attempts += 1
+        self.verdicts[verdict] += 1
+        if student is not None:
+            self.students.add(student)
+        if verdict == "wrong":
+            self.wrong_answers[_normalise(answer)] += 1
+
+    def record(self, question, part):
+        correct = self.verdicts["correct"]
+        return {
+            "question": question,
+            "part": part,
+            "attempts": self.attempts,
+            "students": len(self.students),
+            **{verdict: self.verdicts[verdict] for verdict in VERDICTS},
+            "correct_rate": round(correct / self.attempts, 4) if self.attempts else 0.0,
+            "common_wrong": self.wrong_answers.most_common(COMMON_WRONG),
+        }
+
+
+class Report:
+    """Per-question statistics of a grading run."""
+
+    def __init__(self):
+        self.questions = {}
+        self.verdicts = Counter()
+        self.started = time.perf_counter()
+
+    def add(self, submission, part, verdict):
+        key = (submission.get("question"), part)
+        stats = self.questions.get(key)
+        if stats is None:
+            stats = self.questions[key] = QuestionStats()
+        stats.add(submission.get("student"), _answer(submission), verdict)
+        self.verdicts[verdict] += 1
+
+    def records(self):
+        for (question, part), stats in self.questions.items():
+            yield stats.record(question, part)
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started
+        total = sum(self.verdicts.values())
+        return {"graded": total, **{v: self.verdicts[v] for v in VERDICTS},
+                "seconds": round(elapsed, 3),
+                "per_minute": round(total / elapsed * 60) if elapsed > 0 else 0}
+
+
+# Input and running
+
+class Unreadable(dict):
+    """A JSON line that holds no submission: its ``line`` and the ``error``.
+
+    It is written out and counted as ``invalid`` without being graded.
+    """
+
+
+def read_submissions(stream, fmt):
+    """Yield submission dicts (``student``, ``question``, ``part``, ``answer``) from ``stream``.
+
+    A JSON line that does not parse or is not an object is yielded as
+    :class:`Unreadable`.
+    """
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            submission = json.loads(line)
+        except ValueError as exc:
+            yield Unreadable(line=line, error=f"invalid JSON: {exc}")
+            continue
+        if isinstance(submission, dict):
+            yield submission
+        else:
+            yield Unreadable(line=line, error=f"expected an object, not {type(submission).__name__}")
+
+
+def _format_of(path, fmt):
+    if fmt != "auto":
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def iter_submissions(paths, fmt="auto"):
+    for path in paths or ["-"]:
+        if path == "-":
+            stream = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="")
+            yield from read_submissions(stream, "jsonl" if fmt == "auto" else fmt)
+        else:
+            with open(path, encoding="utf-8", newline="") as stream:
+                yield from read_submissions(stream, _format_of(path, fmt))
+
+
+_worker = None
+
+
+def _init_worker(bank_path):
+    from .questions import QuestionBank
+
+    global _worker
+    _worker = Grader(QuestionBank(bank_path) if bank_path else None)
+
+
+def _grade_chunk(items):
+    return [_worker.grade(*item) for item in items]
+
+
+def _chunks(submissions, size):
+    chunk = []
+    for submission in submissions:
+        chunk.append(submission)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def grade(submissions, out=None, jobs=0, bank_path=None, report=None):
+    """Grade ``submissions`` (dicts) into ``report``, writing results to ``out`` if given.
+
+    ``jobs`` worker processes grade chunks of :data:`CHUNK_SIZE`; with
+    ``0`` everything is graded in this process.
+    """
+    report = report or Report()
+
+    def finish(chunk, verdicts):
+        verdicts = iter(verdicts)
+        for submission in chunk:
+            if isinstance(submission, Unreadable):
+                part, verdict = "", "invalid"
+            else:
+                part, verdict = next(verdicts)
+            report.add(submission, part, verdict)
+            if out is not None:
+                out.write(json.dumps(dict(submission, part=part, verdict=verdict),
+                                     ensure_ascii=False) + "\n")
+
+    def items(chunk):
+        return [(s.get("question"), _normalise(_answer(s)), s.get("part"))
+                for s in chunk if not isinstance(s, Unreadable)]
+
+    if jobs <= 0:
+        from .questions import QuestionBank
+
+        grader = Grader(QuestionBank(bank_path) if bank_path else None)
+        for chunk in _chunks(submissions, CHUNK_SIZE):
+            finish(chunk, [grader.grade(*item) for item in items(chunk)])
+        return report
+    with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(bank_path,)) as executor:
+        pending = deque()
+        for chunk in _chunks(submissions, CHUNK_SIZE):
+            if len(pending) >= jobs * WINDOW:
+                done, future = pending.popleft()
+                finish(done, future.result())
+            pending.append((chunk, executor.submit(_grade_chunk, items(chunk))))
+        while pending:
+            done, future = pending.popleft()
+            finish(done, future.result())
+    return report
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m polytools.grader",
+                                     description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", metavar="SUBMISSIONS", help="inputs (default stdin)")
+    parser.add_argument("--bank", default=None, metavar="PATH",
+                        help="question bank (default $POLYTOOLS_QUESTION_BANK or the bundled one)")
+    parser.add_argument("-o", "--output", default=None, metavar="PATH",
+                        help="JSON lines with the verdict of every submission")
+    parser.add_argument("--stats", default="-", metavar="PATH",
+                        help="per-question statistics as JSON lines (default stdout)")
+    parser.add_argument("--format", choices=["auto", "csv", "jsonl"], default="auto")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="worker processes (default one per CPU, none on a single CPU)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no summary on stderr")
+    args = parser.parse_args(argv)
+    jobs = args.jobs
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+        jobs = 0 if jobs == 1 else jobs
+
+    submissions = iter_submissions(args.files, args.format)
+    out = None if args.output is None else open(args.output, "w", encoding="utf-8")
+    try:
+        report = grade(submissions, out, jobs, args.bank)
+    finally:
+        if out is not None:
+            out.close()
+    stats = sys.stdout if args.stats == "-" else open(args.stats, "w", encoding="utf-8")
+    try:
+        stats.writelines(json.dumps(record, ensure_ascii=False) + "\n" for record in report.records())
+    finally:
+        if stats is not sys.stdout:
+            stats.close()
+    if not args.quiet:
+        print(json.dumps(report.summary()), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,59 @@
+"""Vectorised Horner evaluation for one or many polynomials over a grid.
+
+Expressions like ``a * x**3 + b * x**2 + c * x + d`` allocate a temporary
+array per operator and use ``power``, and have to be written out once per
+degree. Horner's rule needs one multiply and one add per coefficient, works
+for any degree and can run entirely in a caller-supplied buffer.
+
+Coefficients are highest power first, as everywhere in :mod:`polytools`.
+"""
+
+import numpy as np
+
+
+def horner(coeffs, x, out=None):
+    """Evaluate one polynomial at every point of ``x``.
+
+    ``out``, if given, must have the shape of ``x`` and a dtype that can hold
+    the result; it is filled in place and returned.
+    """
+    coeffs = np.asarray(coeffs)
+    x = np.asarray(x)
+    if out is None:
+        out = np.empty(x.shape, dtype=np.result_type(coeffs, x, np.float64))
+    if coeffs.size == 0:
+        out.fill(0)
+        return out
+    out.fill(coeffs[0])
+    for c in coeffs[1:]:
+        out *= x
+        out += c
+    return out
+
+
+def horner_batch(coeffs, x, out=None):
+    """Evaluate each row of a 2-D coefficient matrix over a shared grid.
+
+    ``coeffs`` has shape ``(m, n + 1)`` (pad lower-degree rows with leading
+    zeros); ``x`` is 1-D with ``k`` points. Returns an ``(m, k)`` array,
+    written into ``out`` when one is given.
+    """
+    coeffs = np.asarray(coeffs)
+    if coeffs.ndim != 2:
+        raise ValueError("coeffs must be a 2-D array, one polynomial per row")
+    x = np.asarray(x)
+    if x.ndim != 1:
+        raise ValueError("x must be a 1-D grid")
+    shape = (coeffs.shape[0], x.shape[0])
+    if out is None:
+        out = np.empty(shape, dtype=np.result_type(coeffs, x, np.float64))
+    elif out.shape != shape:
+        raise ValueError(f"out has shape {out.shape}, expected {shape}")
+    if coeffs.shape[1] == 0:
+        out.fill(0)
+        return out
+    out[:] = coeffs[:, :1]
+    for j in range(1, coeffs.shape[1]):
+        out *= x
+        out += coeffs[:, j:j + 1]
+    return out
@@ -0,0 +1,408 @@
+"""Opt-in memory profiling and a per-session memory budget.
+
+Streamlit keeps every session's ``st.session_state`` until the session
+ends, and the heaviest thing in it is a Matplotlib chart: after
+``st.pyplot`` the figure keeps the RGBA buffer it was rasterised into,
+about 8 MB at Streamlit's 200 dpi. Shared caches hold SymPy expression
+trees for the lifetime of the process.
+
+Profiling. With ``POLYTOOLS_TRACEMALLOC=N`` (frames per traceback, unset
+or ``0`` for off) :mod:`tracemalloc` starts on import and :func:`profile`
+brackets each section run and each tool run. Every run records its net
+allocation and its peak above the starting point, which costs next to
+nothing. Snapshots are not cheap: grouping the hundreds of thousands of
+traced blocks of a process that has loaded SymPy and Matplotlib takes
+seconds. So a scope also takes a snapshot before and after a run at most
+once per :data:`SNAPSHOT_INTERVAL` seconds, with one such pair in flight
+at a time, and keeps the lines that allocated most of the difference.
+:func:`top_allocators` lists the lines holding the most traced memory in
+the whole process, on demand. Tracing is process-wide, so a scope also
+counts what concurrent sessions allocated meanwhile, and it slows Python
+down several times over; it is for diagnosis, not for class. Raster
+buffers are allocated outside Python and never traced, which is what
+:func:`footprint` is for.
+
+Budget. :class:`SessionBudget` estimates what a session holds after each
+tool run and, while that is above ``POLYTOOLS_SESSION_MEMORY_MB`` (default
+32, ``0`` for no limit), degrades one level at a time. The default leaves
+room for all three charts of the app, about 19 MB once every section has
+been visited, so normal navigation never degrades:
+
+1. ``release``: charts free their raster buffer after each render and
+   draw into a fresh one next time, at no measurable cost per render;
+2. ``vega``: the session's figures are dropped and its charts are drawn
+   by the browser with Vega-Lite, which keeps nothing on the server.
+
+Above ``POLYTOOLS_PROCESS_MEMORY_MB`` of resident memory (default ``0``,
+no limit) the shared parse/analysis caches are cleared, freed memory is
+returned to the system, and new solves are numeric only (no SymPy) until
+resident memory is back below :data:`RECOVER_FRACTION` of the limit. The
+purge happens when the limit is crossed and, if memory that was not given
+back keeps the process over it, again at most every
+:data:`PURGE_INTERVAL` seconds, so the caches still work in between.
+"""
+
+import gc
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+PROFILE_FRAMES = int(os.environ.get("POLYTOOLS_TRACEMALLOC", "0"))
+SESSION_BUDGET = int(float(os.environ.get("POLYTOOLS_SESSION_MEMORY_MB", "32")) * 2 ** 20)
+PROCESS_LIMIT = int(float(os.environ.get("POLYTOOLS_PROCESS_MEMORY_MB", "0")) * 2 ** 20)
+RECOVER_FRACTION = 0.9
+# Seconds between purges while resident memory stays over the limit.
+PURGE_INTERVAL = 60.0
+TOP_N = 10
+SNAPSHOT_INTERVAL = 60.0
+LEVELS = ("normal", "release", "vega")
+
+
+# Profiling
+
+
+class ScopeProfile:
+    """Allocations of the runs of one section or tool, in bytes."""
+
+    __slots__ = ("runs", "last_bytes", "total_bytes", "peak_bytes", "top", "snapshot_at")
+
+    def __init__(self):
+        self.runs = 0
+        self.last_bytes = 0
+        self.total_bytes = 0
+        self.peak_bytes = 0
+        # [(file:line, bytes, blocks)] of the last sampled run, largest first.
+        self.top = []
+        self.snapshot_at = None
+
+    def as_dict(self):
+        return {
+            "runs": self.runs,
+            "last_net_kb": round(self.last_bytes / 1024, 1),
+            "mean_net_kb": round(self.total_bytes / self.runs / 1024, 1) if self.runs else 0.0,
+            "max_peak_kb": round(self.peak_bytes / 1024, 1),
+        }
+
+
+class _Run:
+    __slots__ = ("scope", "start", "peak", "before", "began")
+
+    def __init__(self, scope, start):
+        self.scope = scope
+        self.start = start
+        self.peak = start
+        self.before = None
+        self.began = time.monotonic()
+
+
+profiles = {}
+_profiles_lock = threading.Lock()
+_open_runs = threading.local()
+# The run holding a "before" snapshot; only one at a time.
+_snapshot_run = None
+
+
+def start_profiling(frames=None):
+    """Start :mod:`tracemalloc`, keeping ``frames`` frames per allocation."""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames or PROFILE_FRAMES or 1)
+
+
+def profiling():
+    return tracemalloc.is_tracing()
+
+
+def _location(stat):
+    frame = stat.traceback[0]
+    filename = frame.filename
+    # Relative to the sys.path entry it was imported from: "sympy/core/basic.py".
+    for root in sorted((p for p in sys.path if p), key=len, reverse=True):
+        if filename.startswith(root + os.sep):
+            filename = filename[len(root) + 1:]
+            break
+    return f"{filename}:{frame.lineno}"
+
+
+def _top(stats, limit, attribute):
+    """The ``limit`` largest entries of ``stats`` not from the profiler or imports."""
+    rows = []
+    for stat in sorted(stats, key=lambda stat: getattr(stat, attribute), reverse=True):
+        filename = stat.traceback[0].filename
+        if filename in (__file__, tracemalloc.__file__) or filename.startswith("<"):
+            continue
+        if getattr(stat, attribute) <= 0 or len(rows) == limit:
+            break
+        rows.append((_location(stat), getattr(stat, attribute),
+                     stat.count_diff if attribute == "size_diff" else stat.count))
+    return rows
+
+
+def _track_peak(stack):
+    # The traced peak is process-wide; fold it into every open run before
+    # resetting it.
+    current, peak = tracemalloc.get_traced_memory()
+    for run in stack:
+        run.peak = max(run.peak, peak)
+    tracemalloc.reset_peak()
+    return current
+
+
+def begin(scope):
+    """Start profiling a run of ``scope``; returns a token for :func:`end`, or ``None``."""
+    global _snapshot_run
+    if not tracemalloc.is_tracing():
+        return None
+    stack = getattr(_open_runs, "stack", None)
+    if stack is None:
+        stack = _open_runs.stack = []
+    # A run of the same scope that never ended was cut short (a script
+    # stopped for a rerun); forget it.
+    stack[:] = [run for run in stack if run.scope != scope]
+    run = _Run(scope, _track_peak(stack))
+    now = time.monotonic()
+    with _profiles_lock:
+        profile = profiles.get(scope)
+        due = profile is None or profile.snapshot_at is None or \
+            now - profile.snapshot_at >= SNAPSHOT_INTERVAL
+        abandoned = _snapshot_run is not None and now - _snapshot_run.began >= SNAPSHOT_INTERVAL
+        if due and (_snapshot_run is None or abandoned):
+            if abandoned:
+                _snapshot_run.before = None
+            _snapshot_run = run
+            run.before = True
+    if run.before:
+        run.before = tracemalloc.take_snapshot()
+    stack.append(run)
+    return run
+
+
+def end(run, limit=TOP_N):
+    """Record the run started by :func:`begin` into :data:`profiles`."""
+    global _snapshot_run
+    if run is None or not tracemalloc.is_tracing():
+        return
+    stack = _open_runs.stack
+    current = _track_peak(stack)
+    if run in stack:
+        stack.remove(run)
+    top = None
+    before, run.before = run.before, None
+    if before is not None:
+        top = _top(tracemalloc.take_snapshot().compare_to(before, "lineno"), limit, "size_diff")
+    with _profiles_lock:
+        if _snapshot_run is run:
+            _snapshot_run = None
+        profile = profiles.get(run.scope)
+        if profile is None:
+            profile = profiles[run.scope] = ScopeProfile()
+        profile.runs += 1
+        profile.last_bytes = current - run.start
+        profile.total_bytes += current - run.start
+        profile.peak_bytes = max(profile.peak_bytes, run.peak - run.start)
+        if top is not None:
+            profile.top = top
+            profile.snapshot_at = time.monotonic()
+
+
+@contextmanager
+def profile(scope):
+    """Profile the enclosed block as a run of ``scope``; free when not tracing."""
+    token = begin(scope)
+    try:
+        yield
+    finally:
+        end(token)
+
+
+def profile_table():
+    with _profiles_lock:
+        return {scope: profile.as_dict() for scope, profile in profiles.items()}
+
+
+def top_allocators(limit=TOP_N):
+    """``[(file:line, bytes, blocks)]`` holding the most traced memory right now.
+
+    Takes a snapshot, so it is slow; call it on demand.
+    """
+    if not tracemalloc.is_tracing():
+        return []
+    return _top(tracemalloc.take_snapshot().statistics("lineno"), limit, "size")
+
+
+def report(limit=TOP_N):
+    """Plain-text profile of every scope and the top allocators, for logs."""
+    lines = []
+    with _profiles_lock:
+        items = sorted(profiles.items(), key=lambda item: item[1].peak_bytes, reverse=True)
+        for scope, profile in items:
+            row = profile.as_dict()
+            lines.append(f"{scope}: {row['runs']} runs, net {row['last_net_kb']} KB last, "
+                         f"{row['mean_net_kb']} KB mean, peak {row['max_peak_kb']} KB")
+            lines.extend(f"    {size / 1024:10.1f} KB {count:8} blocks  {where}"
+                         for where, size, count in profile.top[:limit])
+    lines.append("top allocators:")
+    lines.extend(f"    {size / 1024:10.1f} KB {count:8} blocks  {where}"
+                 for where, size, count in top_allocators(limit))
+    return "\n".join(lines)
+
+
+if PROFILE_FRAMES > 0:
+    start_profiling()
+
+
+# Footprints
+
+
+def rss():
+    """Resident memory of this process in bytes, or ``None`` off Linux."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def footprint(value, _seen=None):
+    """Estimated bytes held by ``value``.
+
+    Objects with a ``memory_footprint()`` method report themselves (charts
+    count their raster buffer, which ``sys.getsizeof`` cannot see) and
+    containers add their items. Any other object counts its own size only,
+    so an estimate never walks into a large shared structure.
+    """
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if hasattr(type(value), "memory_footprint"):
+        return value.memory_footprint()
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(footprint(k, seen) + footprint(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(footprint(item, seen) for item in value)
+    return size
+
+
+def session_footprint(store):
+    """Estimated bytes held by the session state ``store``."""
+    seen = set()
+    return sum(footprint(store[key], seen) for key in list(store.keys()))
+
+
+def _charts(store):
+    return [key for key in list(store.keys()) if hasattr(type(store[key]), "release")]
+
+
+# Budget
+
+
+class SessionBudget:
+    """A session's memory estimate and how far it has been degraded."""
+
+    __slots__ = ("limit", "level", "footprint")
+
+    def __init__(self, limit=SESSION_BUDGET):
+        self.limit = limit
+        self.level = 0
+        self.footprint = 0
+
+    @property
+    def mode(self):
+        return LEVELS[self.level]
+
+    def enforce(self, store):
+        """Measure ``store`` and degrade until it fits the budget or nothing is left to give up."""
+        self.footprint = session_footprint(store)
+        while self.limit and self.footprint > self.limit and self.level < len(LEVELS) - 1:
+            self.level += 1
+            if LEVELS[self.level] == "release":
+                for key in _charts(store):
+                    store[key].release()
+            else:
+                for key in _charts(store):
+                    del store[key]
+            self.footprint = session_footprint(store)
+        return self.level
+
+    def summary(self):
+        return {
+            "mode": self.mode,
+            "estimate_mb": round(self.footprint / 2 ** 20, 2),
+            "budget_mb": round(self.limit / 2 ** 20, 2) if self.limit else "none",
+        }
+
+
+def get_session_budget(store, key="memory_budget"):
+    """Return the session's :class:`SessionBudget` from ``store``, creating it once."""
+    budget = store.get(key)
+    if budget is None:
+        budget = store[key] = SessionBudget()
+    return budget
+
+
+_numeric_only = False
+_pressure_lock = threading.Lock()
+_last_purge = None
+pressure_events = 0
+
+
+def numeric_only():
+    """Whether memory pressure has switched solving to numeric only."""
+    return _numeric_only
+
+
+def release_free_memory():
+    """Collect garbage and hand freed heap pages back to the system (glibc only)."""
+    gc.collect()
+    try:
+        import ctypes
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+def check_process(limit=None):
+    """Relieve memory pressure when resident memory is over ``limit`` bytes.
+
+    Crossing the limit clears the shared caches and turns
+    :func:`numeric_only` on; it turns off again below
+    :data:`RECOVER_FRACTION` of the limit. While the process stays over the
+    limit the caches are cleared again at most every :data:`PURGE_INTERVAL`
+    seconds rather than on every call.
+    """
+    global _numeric_only, _last_purge, pressure_events
+    limit = PROCESS_LIMIT if limit is None else limit
+    current = rss() if limit else None
+    if current is None:
+        return False
+    with _pressure_lock:
+        now = time.monotonic()
+        if current > limit:
+            if not _numeric_only or now - _last_purge >= PURGE_INTERVAL:
+                from .analysis import analysis_cache, parse_cache
+                parse_cache.clear()
+                analysis_cache.clear()
+                release_free_memory()
+                _last_purge = now
+                pressure_events += 1
+            _numeric_only = True
+        elif _numeric_only and current < RECOVER_FRACTION * limit:
+            _numeric_only = False
+        return _numeric_only
+
+
+def process_summary():
+    traced, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (None, None)
+    current = rss()
+    return {
+        "rss_mb": round(current / 2 ** 20, 1) if current else "n/a",
+        "limit_mb": round(PROCESS_LIMIT / 2 ** 20, 1) if PROCESS_LIMIT else "none",
+        "numeric_only": _numeric_only,
+        "pressure_events": pressure_events,
+        "traced_mb": round(traced / 2 ** 20, 1) if traced is not None else "off",
+        "traced_peak_mb": round(peak / 2 ** 20, 1) if peak is not None else "off",
+    }
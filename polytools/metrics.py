@@ -0,0 +1,296 @@
+"""Per-section, per-stage latency histograms with a Prometheus export.
+
+A rerun of the app is bracketed by :func:`begin` and :func:`end` (or
+:func:`rerun` for a fragment rerun), labelled with the sidebar section.
+Inside it, :func:`stage` times the expensive steps: ``parse``, ``solve``,
+``verify`` (checking ``p(zero) == 0``), ``sample`` (curve points) and
+``render`` (chart update and ``st.pyplot`` / Vega-Lite). Stages may nest;
+each records its exclusive time, so a ``verify`` inside a ``solve`` is not
+counted twice. Durations measured elsewhere, such as verification inside a
+solver worker process, are added with :func:`record`. Without an active
+rerun :func:`stage` does nothing.
+
+Finished reruns go into process-wide histograms, shared by every session:
+
+- ``polytools_rerun_seconds{section, scope}``, scope ``full`` or ``fragment``;
+- ``polytools_stage_seconds{section, stage}``, including ``other`` for the
+  time outside any stage.
+
+They are exported in the Prometheus text format to the file named by
+``POLYTOOLS_METRICS_FILE`` (rewritten atomically at most every
+:data:`EXPORT_INTERVAL` seconds, for the node_exporter textfile collector)
+and/or served at ``http://127.0.0.1:$POLYTOOLS_METRICS_PORT/metrics``.
+"""
+
+import atexit
+import contextvars
+import multiprocessing
+import os
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+
+METRICS_FILE = os.environ.get("POLYTOOLS_METRICS_FILE") or None
+METRICS_PORT = int(os.environ.get("POLYTOOLS_METRICS_PORT", "0"))
+EXPORT_INTERVAL = 5.0
+# Upper bounds in seconds; a rerun of a static section is a few ms, a cold
+# exact solve can take the whole solver budget.
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STAGES = ("parse", "solve", "verify", "sample", "render")
+
+_current = contextvars.ContextVar("polytools_metrics_rerun", default=None)
+# Spawned solver workers re-run the app script as ``__main__`` before they
+# know their parent, but after taking their own process name; only the
+# server process exports.
+_EXPORTER = multiprocessing.current_process().name == "MainProcess"
+
+
+class Histogram:
+    """Cumulative-bucket histogram of durations in seconds."""
+
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += seconds
+
+
+class Registry:
+    """Histograms keyed by label values, safe to update from any session."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reruns = {}
+        self.stages = {}
+
+    def observe(self, section, scope, total, stages):
+        with self._lock:
+            key = (section, scope)
+            histogram = self.reruns.get(key)
+            if histogram is None:
+                histogram = self.reruns[key] = Histogram()
+            histogram.observe(total)
+            for stage, seconds in stages.items():
+                key = (section, stage)
+                histogram = self.stages.get(key)
+                if histogram is None:
+                    histogram = self.stages[key] = Histogram()
+                histogram.observe(seconds)
+
+    def clear(self):
+        with self._lock:
+            self.reruns.clear()
+            self.stages.clear()
+
+    def render(self):
+        """All histograms in the Prometheus text exposition format."""
+        with self._lock:
+            lines = []
+            _render_family(lines, "polytools_rerun_seconds",
+                           "Wall time of one app rerun.", ("section", "scope"), self.reruns)
+            _render_family(lines, "polytools_stage_seconds",
+                           "Exclusive time of one stage within a rerun.", ("section", "stage"),
+                           self.stages)
+            return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _render_family(lines, name, help_text, label_names, histograms):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for values in sorted(histograms):
+        histogram = histograms[values]
+        labels = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(label_names, values))
+        cumulative = 0
+        for bound, n in zip(BUCKETS, histogram.counts):
+            cumulative += n
+            lines.append(f'{name}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+        lines.append(f"{name}_sum{{{labels}}} {histogram.sum:.9g}")
+        lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+
+registry = Registry()
+
+
+class Rerun:
+    """Stage timings of one rerun in progress."""
+
+    __slots__ = ("section", "scope", "started", "stages", "stack")
+
+    def __init__(self, section, scope):
+        self.section = section
+        self.scope = scope
+        self.started = time.perf_counter()
+        self.stages = {}
+        # [name, start, time spent in nested stages] for each open stage.
+        self.stack = []
+
+    def add(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+        if self.stack:
+            self.stack[-1][2] += seconds
+
+    def finish(self):
+        """Observe this rerun into :data:`registry`; returns its breakdown in ms."""
+        total = time.perf_counter() - self.started
+        stages = dict(self.stages)
+        stages["other"] = max(0.0, total - sum(stages.values()))
+        registry.observe(self.section, self.scope, total, stages)
+        _maybe_export()
+        breakdown = {name: round(seconds * 1e3, 3) for name, seconds in stages.items()}
+        breakdown["total"] = round(total * 1e3, 3)
+        return breakdown
+
+
+def current():
+    """The rerun being timed in this thread, or ``None``."""
+    return _current.get()
+
+
+def begin(section, scope="full"):
+    """Start timing a rerun of ``section``; replaces any unfinished one."""
+    if METRICS_PORT > 0 and _server is None and _EXPORTER:
+        serve()
+    run = Rerun(section, scope)
+    _current.set(run)
+    return run
+
+
+def end():
+    """Finish the current rerun; returns its breakdown in ms, or ``None``."""
+    run = _current.get()
+    if run is None:
+        return None
+    _current.set(None)
+    return run.finish()
+
+
+@contextmanager
+def rerun(section, scope="fragment"):
+    """Time a rerun unless one is already being timed (a fragment in a full run).
+
+    Yields the breakdown holder: a dict filled with the rerun's breakdown in
+    ms when this call timed it, and left empty otherwise.
+    """
+    result = {}
+    if _current.get() is not None:
+        yield result
+        return
+    begin(section, scope)
+    try:
+        yield result
+    finally:
+        result.update(end() or {})
+
+
+@contextmanager
+def stage(name):
+    """Time the enclosed block as stage ``name`` of the current rerun."""
+    run = _current.get()
+    if run is None:
+        yield
+        return
+    frame = [name, time.perf_counter(), 0.0]
+    run.stack.append(frame)
+    try:
+        yield
+    finally:
+        run.stack.pop()
+        elapsed = time.perf_counter() - frame[1]
+        run.stages[name] = run.stages.get(name, 0.0) + elapsed - frame[2]
+        if run.stack:
+            run.stack[-1][2] += elapsed
+
+
+def record(name, seconds):
+    """Add ``seconds`` measured elsewhere to stage ``name`` of the current rerun."""
+    run = _current.get()
+    if run is not None:
+        run.add(name, seconds)
+
+
+# Export
+
+_export_lock = threading.Lock()
+_last_export = None
+_server = None
+
+
+def write_metrics(path=None):
+    """Write :meth:`Registry.render` to ``path`` atomically (temp file, then rename)."""
+    path = path or METRICS_FILE
+    if path is None:
+        return
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.write(registry.render())
+    os.replace(tmp, path)
+
+
+def _maybe_export():
+    global _last_export
+    if METRICS_FILE is None or not _EXPORTER:
+        return
+    now = time.monotonic()
+    with _export_lock:
+        if _last_export is None:
+            # Also write the final numbers when the server shuts down.
+            atexit.register(write_metrics)
+        elif now - _last_export < EXPORT_INTERVAL:
+            return
+        _last_export = now
+    write_metrics()
+
+
+def serve(port=None, host="127.0.0.1"):
+    """Serve ``/metrics`` over HTTP from a daemon thread; started once per process.
+
+    Called by the first :func:`begin` in the server process when
+    ``POLYTOOLS_METRICS_PORT`` is set. If the port is taken a warning is
+    issued once and the app runs without the endpoint.
+    """
+    global _server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    port = METRICS_PORT if port is None else port
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    with _export_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, port), Handler)
+            except OSError as exc:
+                _server = False
+                warnings.warn(f"metrics endpoint not started on {host}:{port}: {exc}")
+                return None
+            threading.Thread(target=_server.serve_forever, name="polytools-metrics",
+                             daemon=True).start()
+    return _server or None
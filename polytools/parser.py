@@ -0,0 +1,362 @@
+"""Purpose-built parser for polynomial text typed into the app.
+
+Turns strings such as ``"x^2 - 3x - 4"``, ``"6x^2 - 3 - 7x"`` or
+``"4u² + 8u"`` straight into a :class:`~polytools.polynomial.Polynomial`
+with exact ``Fraction`` coefficients. Nothing is evaluated with ``eval``,
+and inputs that would expand to something huge are refused before any
+arithmetic is done.
+
+Supported syntax: integers and decimals, ``+ - * /``, ``^`` or ``**`` with a
+non-negative integer exponent, unicode superscript exponents, parentheses,
+implicit multiplication (``3x``, ``2(x+1)``, ``(x-1)(x+2)``) and any single
+letter as the variable. ``1/4x`` reads as ``(1/4)x``, as in the textbook.
+``x2``, ``1e5`` and ``2E-3`` are refused rather than read as ``2x``,
+``5e`` and ``2E - 3``.
+
+:func:`parse_with_surds` also takes square roots of whole numbers in the
+coefficients (``3x^2 - 3√2x + 1``, ``sqrt(2)*x**2 - 1``). Those are read
+by SymPy, but only after :func:`surd_text` has checked that nothing else
+is in the text.
+"""
+
+import re
+from fractions import Fraction
+from math import lcm
+
+from .polynomial import Polynomial
+
+MAX_LENGTH = 2000
+MAX_DEGREE = 1000
+MAX_DEPTH = 50
+MAX_COEFF_BITS = 4096
+# SymPy reads surd input, so it gets a much tighter length limit.
+MAX_SURD_LENGTH = 200
+
+_SUPERSCRIPTS = str.maketrans("⁰¹²³⁴⁵⁶⁷⁸⁹", "0123456789")
+_REPLACEMENTS = str.maketrans({"−": "-", "–": "-", "×": "*", "·": "*", "⋅": "*", "÷": "/"})
+
+_TOKEN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<number>[0-9]+(?:\.[0-9]*)?|\.[0-9]+)
+  | (?P<sup>[⁰¹²³⁴⁵⁶⁷⁸⁹]+)
+  | (?P<name>[^\W\d_⁰¹²³⁴⁵⁶⁷⁸⁹]+)
+  | (?P<op>\*\*|[-+*/^()])
+""", re.VERBOSE)
+_EXPONENT = re.compile(r"[eE][+-]?[0-9]+")
+_SURD = re.compile(r"^[0-9+\-*/().\s]*$")
+
+
+class PolynomialSyntaxError(ValueError):
+    """Raised when text is not a polynomial the parser accepts."""
+
+
+def tokenize(text):
+    tokens = []
+    pos = 0
+    text = text.translate(_REPLACEMENTS)
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if match is None:
+            raise PolynomialSyntaxError(f"unexpected character {text[pos]!r} at position {pos}")
+        kind = match.lastgroup
+        value = match.group()
+        if kind == "name" and len(value) > 1:
+            raise PolynomialSyntaxError(f"unknown name {value!r}; use a single letter as the variable")
+        # Otherwise 1e5 would read as 5e, 2E-3 as 2E - 3 and x2 as 2x: a
+        # different polynomial from the one meant, with no error.
+        exponent = _EXPONENT.match(text, match.end()) if kind == "number" else None
+        if exponent:
+            raise PolynomialSyntaxError(f"scientific notation {value + exponent.group()!r} at position {pos} "
+                                        "is not supported; write the number out in full")
+        digit = text[match.end():match.end() + 1]
+        if kind == "name" and digit and digit in "0123456789":
+            raise PolynomialSyntaxError(f"{value + digit!r} at position {pos} is ambiguous; "
+                                        f"write {value}^{digit} for a power or {digit}{value} for a product")
+        if kind == "sup":
+            value = value.translate(_SUPERSCRIPTS)
+        if kind != "space":
+            tokens.append((kind, value, pos))
+        pos = match.end()
+    return tokens
+
+
+# Intermediate values are sparse {power: Fraction} dictionaries.
+
+def _scaled(p):
+    """Integer numerators of ``p`` over their common denominator."""
+    den = lcm(*(v.denominator for v in p.values()))
+    return [(k, v.numerator * (den // v.denominator)) for k, v in p.items()], den
+
+
+def _mul(p, q):
+    if not p or not q:
+        return {}
+    # Convolve plain ints and divide once; Fraction arithmetic in the inner
+    # loop is an order of magnitude slower.
+    ps, pd = _scaled(p)
+    qs, qd = _scaled(q)
+    out = {}
+    for i, a in ps:
+        for j, b in qs:
+            out[i + j] = out.get(i + j, 0) + a * b
+    den = pd * qd
+    return {k: Fraction(v, den) for k, v in out.items() if v}
+
+
+def _height_bits(p):
+    """Bits needed for the scaled coefficients of ``p``; bounds growth under powers."""
+    if not p:
+        return 0
+    scaled, den = _scaled(p)
+    return sum(abs(v) for _, v in scaled).bit_length() + den.bit_length()
+
+
+def _degree(p):
+    return max(p) if p else 0
+
+
+class _Parser:
+    def __init__(self, tokens, max_degree):
+        self.tokens = tokens
+        self.index = 0
+        self.depth = 0
+        self.max_degree = max_degree
+        self.var = None
+
+    def peek(self):
+        return self.tokens[self.index] if self.index < len(self.tokens) else (None, None, None)
+
+    def take(self):
+        token = self.peek()
+        self.index += 1
+        return token
+
+    def error(self, message):
+        _, value, pos = self.peek()
+        where = f" at position {pos}" if pos is not None else " at end of input"
+        raise PolynomialSyntaxError(message + where)
+
+    def check_degree(self, degree):
+        if degree > self.max_degree:
+            raise PolynomialSyntaxError(f"degree {degree} exceeds the limit of {self.max_degree}")
+
+    def expression(self):
+        result = self.term()
+        while self.peek()[1] in ("+", "-"):
+            sign = self.take()[1]
+            term = self.term()
+            for k, v in term.items():
+                result[k] = result.get(k, 0) + (v if sign == "+" else -v)
+            result = {k: v for k, v in result.items() if v}
+        return result
+
+    def term(self):
+        negative = False
+        while self.peek()[1] in ("+", "-"):
+            negative ^= self.take()[1] == "-"
+        result = self.power()
+        while True:
+            kind, value, _ = self.peek()
+            if value in ("*", "/"):
+                self.take()
+                factor = self.power()
+                if value == "*":
+                    self.check_degree(_degree(result) + _degree(factor))
+                    result = _mul(result, factor)
+                else:
+                    if set(factor) - {0}:
+                        raise PolynomialSyntaxError("division by a non-constant is not a polynomial")
+                    if not factor:
+                        raise PolynomialSyntaxError("division by zero")
+                    divisor = factor[0]
+                    result = {k: v / divisor for k, v in result.items()}
+            elif kind in ("name", "number") or value == "(":
+                # Implicit multiplication: 3x, x(x+1), (x-1)(x+2). Two bare
+                # numbers next to each other are a typo, not a product.
+                if kind == "number" and self.tokens[self.index - 1][0] == "number":
+                    self.error("missing operator between numbers")
+                factor = self.power()
+                self.check_degree(_degree(result) + _degree(factor))
+                result = _mul(result, factor)
+            else:
+                break
+        if negative:
+            result = {k: -v for k, v in result.items()}
+        return result
+
+    def power(self):
+        base = self.atom()
+        kind, value, _ = self.peek()
+        if kind == "sup":
+            self.take()
+            exponent = int(value)
+        elif value in ("^", "**"):
+            self.take()
+            exponent = self.exponent()
+        else:
+            return base
+        # Refuse before expanding: (x+1)^100000 never gets multiplied out.
+        self.check_degree(_degree(base) * exponent)
+        if set(base) <= {0} and exponent > self.max_degree:
+            raise PolynomialSyntaxError(f"exponent {exponent} exceeds the limit of {self.max_degree}")
+        if exponent * _height_bits(base) > MAX_COEFF_BITS:
+            raise PolynomialSyntaxError("coefficients would be too large")
+        result = {0: Fraction(1)}
+        while exponent:
+            if exponent & 1:
+                result = _mul(result, base)
+            exponent >>= 1
+            if exponent:
+                base = _mul(base, base)
+        return result
+
+    def exponent(self):
+        kind, value, _ = self.peek()
+        if value == "(":
+            self.take()
+            exponent = self.exponent()
+            if self.take()[1] != ")":
+                self.index -= 1
+                self.error("expected ')' after exponent")
+            return exponent
+        if kind == "sup" or (kind == "number" and value.isdigit()):
+            self.take()
+            return int(value)
+        if value == "-":
+            self.error("negative exponents are not allowed in a polynomial")
+        self.error("exponent must be a non-negative whole number")
+
+    def atom(self):
+        kind, value, _ = self.peek()
+        if kind == "number":
+            number = Fraction(value)
+            if number.numerator.bit_length() + number.denominator.bit_length() > MAX_COEFF_BITS:
+                self.error("number too large")
+            self.take()
+            return {0: number} if number else {}
+        if kind == "name":
+            if self.var is None:
+                self.var = value
+            elif value != self.var:
+                self.error(f"more than one variable ({self.var!r} and {value!r})")
+            self.take()
+            return {1: Fraction(1)}
+        if value in ("+", "-"):
+            # Unary sign after an operator, as in 2*-x or x^2/-4.
+            self.take()
+            operand = self.power()
+            return {k: -v for k, v in operand.items()} if value == "-" else operand
+        if value == "(":
+            self.take()
+            self.depth += 1
+            if self.depth > MAX_DEPTH:
+                self.error("parentheses nested too deeply")
+            result = self.expression()
+            self.depth -= 1
+            if self.peek()[1] != ")":
+                self.error("expected ')'")
+            self.take()
+            return result
+        if kind is None:
+            self.error("incomplete expression")
+        self.error(f"unexpected {value!r}")
+
+
+def parse_polynomial(text, max_degree=MAX_DEGREE, default_var="x"):
+    """Parse ``text`` into a :class:`Polynomial` with exact coefficients.
+
+    Raises :class:`PolynomialSyntaxError` for anything that is not a
+    polynomial in a single variable, or whose degree or size is above the
+    configured limits.
+    """
+    if len(text) > MAX_LENGTH:
+        raise PolynomialSyntaxError(f"input longer than {MAX_LENGTH} characters")
+    tokens = tokenize(text)
+    if not tokens:
+        raise PolynomialSyntaxError("empty input")
+    parser = _Parser(tokens, max_degree)
+    terms = parser.expression()
+    if parser.index < len(tokens):
+        parser.error(f"unexpected {parser.peek()[1]!r}")
+    degree = _degree(terms)
+    coeffs = [terms.get(power, Fraction(0)) for power in range(degree, -1, -1)]
+    try:
+        return Polynomial(coeffs, var=parser.var or default_var)
+    except OverflowError:
+        raise PolynomialSyntaxError("coefficients are too large") from None
+
+
+def surd_text(text, variable=None):
+    """``text`` rewritten for ``sp.sympify``, or ``None`` if it has anything but surds.
+
+    Besides digits, ``+ - * / ( )`` and ``sqrt`` or ``√``, only ``variable``
+    may appear, raised to single-digit powers; nothing else may be raised
+    to a power, so no input can make SymPy build a huge number or
+    expansion.
+    """
+    # "#" stands for sqrt while rewriting, so that a variable s, q, r or t
+    # is not found inside it.
+    text = text.translate(_REPLACEMENTS)
+    text = re.sub("[⁰¹²³⁴⁵⁶⁷⁸⁹]+", lambda m: "**" + m.group().translate(_SUPERSCRIPTS), text)
+    text = text.replace("√", "#").replace("sqrt", "#").replace("^", "**")
+    text = re.sub(r"\s*\*\*\s*", "**", text)
+    text = re.sub(r"#\s*(\d+)", r"#(\1)", text)
+    before, after = r"\d|\)", r"#|\("
+    if variable is not None:
+        before, after = f"{before}|{variable}", f"{after}|{variable}"
+    # Implicit multiplication: 3x, 2sqrt(3), sqrt(2)x, (x - 1)(x + 1).
+    text = re.sub(f"({before})\\s*(?={after})", r"\1*", text)
+    # A sqrt without an argument or empty brackets have nothing to read.
+    if re.search(r"#(?!\s*\()|\(\s*\)", text):
+        return None
+    stripped = text.replace("#", "")
+    if variable is not None:
+        stripped = re.sub(re.escape(variable) + r"(\*\*\d(?!\d))?", "", stripped)
+    if "**" in stripped or not _SURD.match(stripped):
+        return None
+    return text.replace("#", "sqrt")
+
+
+def _parse_surds(text, max_degree, default_var):
+    import sympy as sp
+
+    if len(text) > MAX_SURD_LENGTH:
+        return None
+    letters = set(re.findall(r"[a-zA-Z]", text.replace("sqrt", "")))
+    if len(letters) > 1:
+        return None
+    variable = letters.pop() if letters else default_var
+    text = surd_text(text, variable)
+    if text is None:
+        return None
+    symbol = sp.Symbol(variable)
+    try:
+        expr = sp.sympify(text, locals={variable: symbol}, rational=True)
+        if not isinstance(expr, sp.Expr):
+            return None
+        poly = sp.Poly(expr, symbol)
+    except (sp.SympifyError, sp.PolynomialError, SyntaxError, TypeError, ZeroDivisionError):
+        return None
+    coeffs = poly.all_coeffs()
+    if poly.degree() > max_degree or not all(c.is_number for c in coeffs):
+        return None
+    return Polynomial(coeffs, var=variable)
+
+
+def parse_with_surds(text, max_degree=MAX_DEGREE, default_var="x"):
+    """:func:`parse_polynomial`, also taking ``sqrt(n)`` / ``√n`` in coefficients.
+
+    Rational input never reaches SymPy. Raises
+    :class:`PolynomialSyntaxError` as :func:`parse_polynomial` does.
+    """
+    try:
+        return parse_polynomial(text, max_degree, default_var)
+    except PolynomialSyntaxError:
+        if "sqrt" not in text and "√" not in text:
+            raise
+    poly = _parse_surds(text, max_degree, default_var)
+    if poly is None:
+        raise PolynomialSyntaxError(
+            "square roots are only allowed of whole numbers in the coefficients, as in "
+            f"3x^2 - 3√2x + 1, and in input of at most {MAX_SURD_LENGTH} characters")
+    return poly
@@ -0,0 +1,97 @@
+"""Reusable Matplotlib charts for the app's polynomial graphs.
+
+``plt.subplots`` registers every figure in pyplot's global figure manager,
+where it stays until ``plt.close`` is called, so creating one per rerun
+leaks memory under many sessions. :class:`LineChart` builds a plain
+``matplotlib.figure.Figure`` once (never registered with pyplot, so it is
+freed as soon as nothing references it) and on later reruns only updates
+the curve and zero-marker data.
+"""
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.text import Text
+
+# Python-side size of a LineChart's artists, measured with tracemalloc.
+FIGURE_BYTES = 340_000
+
+
+class LineChart:
+    """A curve ``y = p(x)`` with axis lines, a grid and up to ``max_zeroes`` markers."""
+
+    __slots__ = ("figure", "axes", "curve", "markers")
+
+    def __init__(self, figsize=(8, 5), max_zeroes=3, label_fontsize=None, title_fontsize=None):
+        self.figure = Figure(figsize=figsize)
+        FigureCanvasAgg(self.figure)
+        ax = self.axes = self.figure.subplots()
+        ax.axhline(y=0, color='k', linestyle='-', alpha=0.3)
+        ax.axvline(x=0, color='k', linestyle='-', alpha=0.3)
+        ax.set_xlabel('x', fontsize=label_fontsize)
+        ax.set_ylabel('y', fontsize=label_fontsize)
+        if title_fontsize is not None:
+            ax.title.set_fontsize(title_fontsize)
+        ax.grid(True, alpha=0.3)
+        self.curve, = ax.plot([], [], 'b-', linewidth=2)
+        self.markers = [ax.plot([], [], 'ro', markersize=8)[0] for _ in range(max_zeroes)]
+
+    def update(self, x, y, title, label=None, zeroes=(), zero_labels=None,
+               xlim=(-10, 10), ylim=(-10, 10)):
+        """Replace the plotted data and return the figure for ``st.pyplot``.
+
+        Zeroes outside ``xlim`` are not marked. ``zero_labels`` optionally
+        gives a legend label per zero.
+        """
+        self.curve.set_data(x, y)
+        self.curve.set_label(label)
+        shown = [(i, z) for i, z in enumerate(zeroes) if xlim[0] <= z <= xlim[1]]
+        for marker, (i, zero) in zip(self.markers, shown):
+            marker.set_data([zero], [0])
+            marker.set_label(zero_labels[i] if zero_labels else None)
+            marker.set_visible(True)
+        for marker in self.markers[len(shown):]:
+            marker.set_data([], [])
+            marker.set_label(None)
+            marker.set_visible(False)
+
+        ax = self.axes
+        ax.set_title(title)
+        ax.set_xlim(*xlim)
+        ax.set_ylim(*ylim)
+        handles = [artist for artist in [self.curve, *self.markers]
+                   if artist.get_visible() and artist.get_label()]
+        ax.legend(handles=handles)
+        return self.figure
+
+    def memory_footprint(self):
+        """Estimated bytes held, including the raster buffer of the last render."""
+        size = FIGURE_BYTES + sum(line.get_xydata().nbytes for line in [self.curve, *self.markers])
+        renderer = self.figure.canvas.__dict__.get("renderer")
+        if renderer is not None:
+            size += int(renderer.width) * int(renderer.height) * 4
+        return size
+
+    def release(self):
+        """Free the raster buffer of the last render; the next one draws into a new buffer.
+
+        The Agg canvas caches its renderer for reuse, and every text artist
+        keeps a reference to the renderer that last drew it.
+        """
+        canvas = self.figure.canvas
+        canvas.__dict__.pop("renderer", None)
+        canvas._lastKey = None
+        for text in self.figure.findobj(Text):
+            text._renderer = None
+
+
+def get_chart(store, key, **options):
+    """Return the :class:`LineChart` stored under ``key``, creating it once.
+
+    ``store`` is a per-session mapping such as ``st.session_state``, so each
+    session reuses its own figures and they are released with the session.
+    """
+    chart = store.get(key)
+    if chart is None:
+        chart = LineChart(**options)
+        store[key] = chart
+    return chart
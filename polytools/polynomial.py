@@ -0,0 +1,216 @@
+"""Compact array-backed polynomial in one variable.
+
+Coefficients are stored highest power first (the same order as
+``sympy.Poly.all_coeffs`` and ``numpy.roots``). A float64 NumPy vector is
+always kept for fast evaluation; when every coefficient is rational an exact
+tuple of ``Fraction`` values is kept alongside it so degree, coefficients,
+derivative and Vieta ratios stay exact without touching SymPy.
+"""
+
+from fractions import Fraction
+from numbers import Rational
+
+import numpy as np
+
+from .horner import horner
+
+
+def _to_exact(value):
+    if isinstance(value, (bool, np.bool_)):
+        raise TypeError("boolean is not a polynomial coefficient")
+    if isinstance(value, Fraction):
+        return value
+    if isinstance(value, (int, np.integer)):
+        return Fraction(int(value))
+    if isinstance(value, Rational):
+        return Fraction(int(value.numerator), int(value.denominator))
+    # SymPy numbers: rationals become Fractions, exact irrationals such as
+    # sqrt(2) are kept as they are, and floats fall back to float-only mode.
+    if getattr(value, "is_number", False) and not any(a.is_Float for a in value.atoms()):
+        return value
+    return None
+
+
+class Polynomial:
+    """Polynomial ``c[0]*v^n + ... + c[n]`` with float and exact coefficients."""
+
+    __slots__ = ("coeffs", "exact", "var")
+
+    def __init__(self, coeffs, var="x"):
+        coeffs = list(coeffs)
+        exact = [_to_exact(c) for c in coeffs]
+        if any(e is None for e in exact):
+            exact = None
+            values = [float(c) for c in coeffs]
+        else:
+            values = [float(c) for c in exact]
+
+        if not values:
+            values, exact = [0.0], [Fraction(0)]
+
+        # Drop leading zeros so coeffs[0] is the leading coefficient.
+        start = 0
+        source = exact if exact is not None else values
+        while start < len(values) - 1 and source[start] == 0:
+            start += 1
+
+        self.coeffs = np.array(values[start:], dtype=np.float64)
+        self.exact = tuple(exact[start:]) if exact is not None else None
+        self.var = var
+
+    @classmethod
+    def from_roots(cls, roots, leading=1, var="x"):
+        """Build ``leading * prod(v - r)`` from its zeroes."""
+        coeffs = [leading]
+        for r in roots:
+            # Multiply by (v - r): shift down and subtract r times the old row.
+            coeffs = [a - r * b for a, b in zip(coeffs + [0], [0] + coeffs)]
+        return cls(coeffs, var=var)
+
+    @classmethod
+    def from_sympy(cls, expr, var=None):
+        """Convert a SymPy expression or ``Poly`` in one variable."""
+        import sympy as sp
+
+        if isinstance(expr, sp.Poly):
+            poly = expr
+        else:
+            expr = sp.sympify(expr)
+            symbols = sorted(expr.free_symbols, key=str)
+            if var is None:
+                var = symbols[0] if symbols else sp.Symbol("x")
+            elif isinstance(var, str):
+                var = sp.Symbol(var)
+            poly = sp.Poly(expr, var)
+        if len(poly.gens) != 1:
+            raise ValueError("polynomial must be in exactly one variable")
+        return cls(poly.all_coeffs(), var=str(poly.gens[0]))
+
+    @property
+    def degree(self):
+        """Degree of the polynomial; ``-1`` for the zero polynomial."""
+        if len(self.coeffs) == 1 and self.all_coeffs()[0] == 0:
+            return -1
+        return len(self.coeffs) - 1
+
+    @property
+    def is_exact(self):
+        return self.exact is not None
+
+    @property
+    def is_rational(self):
+        return self.exact is not None and all(isinstance(c, Fraction) for c in self.exact)
+
+    def all_coeffs(self):
+        """Coefficients highest power first, exact when available."""
+        if self.exact is not None:
+            return list(self.exact)
+        return self.coeffs.tolist()
+
+    def __call__(self, value):
+        """Evaluate with Horner's rule.
+
+        Python numbers and ``Fraction`` values are evaluated exactly when the
+        polynomial is exact; floats and NumPy arrays use the float64 vector.
+        """
+        if self.exact is not None and isinstance(value, (Rational, Fraction)) and not isinstance(value, bool):
+            result = Fraction(0)
+            for c in self.exact:
+                result = result * value + c
+            return result
+        result = horner(self.coeffs, np.asarray(value, dtype=np.float64))
+        return result if result.ndim else float(result)
+
+    def derivative(self):
+        n = self.degree
+        if n <= 0:
+            return Polynomial([0], var=self.var)
+        source = self.exact if self.exact is not None else self.coeffs.tolist()
+        return Polynomial([c * (n - i) for i, c in enumerate(source[:-1])], var=self.var)
+
+    def vieta(self):
+        """Vieta ratios ``e_k = (-1)^k * c[k] / c[0]`` for ``k = 1..n``.
+
+        ``e_1`` is the sum of the zeroes, ``e_2`` the sum of products taken two
+        at a time, and ``e_n`` the product of all zeroes.
+        """
+        source = self.exact if self.exact is not None else self.coeffs.tolist()
+        lead = source[0]
+        return [(-1) ** k * c / lead for k, c in enumerate(source[1:], start=1)]
+
+    def discriminant(self):
+        """Discriminant for degree 1–3, exact when the coefficients are."""
+        n = self.degree
+        c = self.all_coeffs()
+        if n == 1:
+            return 1
+        if n == 2:
+            a, b, c0 = c
+            return b * b - 4 * a * c0
+        if n == 3:
+            a, b, c1, d = c
+            return (b * b * c1 * c1 - 4 * a * c1 ** 3 - 4 * b ** 3 * d
+                    - 27 * a * a * d * d + 18 * a * b * c1 * d)
+        return self.to_sympy().discriminant()
+
+    def roots(self):
+        """Numeric zeroes (complex128) via the companion matrix."""
+        if self.degree <= 0:
+            return np.array([], dtype=np.complex128)
+        return np.roots(self.coeffs).astype(np.complex128)
+
+    def to_sympy(self):
+        """Exact ``sympy.Poly``; SymPy is only imported here."""
+        import sympy as sp
+
+        source = self.exact if self.exact is not None else self.coeffs.tolist()
+        coeffs = [sp.Rational(c.numerator, c.denominator) if isinstance(c, Fraction) else sp.sympify(c)
+                  for c in source]
+        return sp.Poly(coeffs, sp.Symbol(self.var))
+
+    def as_expr(self):
+        return self.to_sympy().as_expr()
+
+    def exact_roots(self):
+        """Distinct exact (radical) zeroes, computed with SymPy."""
+        import sympy as sp
+
+        poly = self.to_sympy()
+        return sp.solve(poly.as_expr(), poly.gens[0])
+
+    def __eq__(self, other):
+        if not isinstance(other, Polynomial):
+            return NotImplemented
+        if self.exact is not None and other.exact is not None:
+            return self.exact == other.exact
+        return np.array_equal(self.coeffs, other.coeffs)
+
+    def __hash__(self):
+        return hash(self.exact if self.exact is not None else tuple(self.coeffs.tolist()))
+
+    def __repr__(self):
+        return f"Polynomial({self.all_coeffs()!r}, var={self.var!r})"
+
+    def __str__(self):
+        terms = []
+        n = self.degree
+        if n < 0:
+            return "0"
+        for i, c in enumerate(self.all_coeffs()):
+            if c == 0:
+                continue
+            power = n - i
+            if isinstance(c, float) and c.is_integer():
+                c = int(c)
+            negative = bool(c < 0)
+            magnitude = -c if negative else c
+            text = str(magnitude)
+            if power and magnitude == 1:
+                text = ""
+            if power:
+                text += self.var if power == 1 else f"{self.var}^{power}"
+            if not terms:
+                terms.append(("-" if negative else "") + text)
+            else:
+                terms.append(("- " if negative else "+ ") + text)
+        return " ".join(terms)
@@ -0,0 +1,215 @@
+"""Time-boxed, cancellable execution of solver calls in worker processes.
+
+``sp.solve`` can run for seconds or minutes on an unlucky input, and Python
+threads cannot be interrupted. Each worker here is a separate process that
+is terminated (and lazily replaced) when a call runs out of its time budget
+or is cancelled, so one bad polynomial never pins the Streamlit server.
+
+Pool size and the default budget come from ``POLYTOOLS_SOLVER_WORKERS``
+(default: up to 4, one per CPU; ``0`` runs calls inline with no time limit)
+and ``POLYTOOLS_SOLVE_TIMEOUT`` (seconds, default 3).
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+
+POLL_INTERVAL = 0.05
+STARTUP_TIMEOUT = 60.0
+
+
+class SolveTimeout(Exception):
+    """The call did not finish within its time budget."""
+
+
+class SolveCancelled(Exception):
+    """The caller cancelled the call before it finished."""
+
+
+def _worker_main(conn, initializer):
+    if initializer is not None:
+        initializer()
+    conn.send("ready")
+    while True:
+        try:
+            fn, args = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        try:
+            result = (True, fn(*args))
+        except Exception as exc:
+            result = (False, exc)
+        conn.send(result)
+
+
+class _Worker:
+    __slots__ = ("process", "conn")
+
+    def __init__(self, context, initializer):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child, initializer), daemon=True)
+        self.process.start()
+        child.close()
+        try:
+            ready = self.conn.poll(STARTUP_TIMEOUT) and self.conn.recv() == "ready"
+        except EOFError:
+            ready = False
+        if not ready:
+            self.kill()
+            raise RuntimeError("solver worker failed to start")
+
+    def kill(self):
+        self.process.terminate()
+        self.process.join(1)
+        self.conn.close()
+
+
+class SolverPool:
+    """A fixed-size pool of worker processes with per-call deadlines.
+
+    Workers are started on first use and kept warm between calls. Callers
+    that find every worker busy wait in a queue; time spent queued counts
+    towards their budget; starting a new worker (and running ``initializer``
+    in it, typically to import SymPy) does not.
+    """
+
+    def __init__(self, workers=2, timeout=3.0, initializer=None, start_method="spawn"):
+        self.workers = workers
+        self.timeout = timeout
+        self.initializer = initializer
+        self._context = multiprocessing.get_context(start_method)
+        self._idle = []
+        self._started = 0
+        self._cond = threading.Condition()
+        self.waiting = 0
+        self.busy = 0
+        self.completed = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.cancelled = 0
+        self.restarts = 0
+
+    def _count(self, name):
+        with self._cond:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _acquire(self, deadline, cancel):
+        with self._cond:
+            self.waiting += 1
+            try:
+                while not self._idle and self._started >= self.workers:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        raise SolveTimeout("no solver worker became free in time")
+                    if cancel is not None and cancel():
+                        self.cancelled += 1
+                        raise SolveCancelled("cancelled while queued")
+                    self._cond.wait(min(remaining, POLL_INTERVAL))
+                if self._idle:
+                    worker = self._idle.pop()
+                else:
+                    self._started += 1
+                    worker = None
+                self.busy += 1
+            finally:
+                self.waiting -= 1
+        started = time.monotonic()
+        if worker is None:
+            try:
+                worker = _Worker(self._context, self.initializer)
+            except BaseException:
+                self._release(None)
+                raise
+        return worker, time.monotonic() - started
+
+    def _release(self, worker):
+        with self._cond:
+            self.busy -= 1
+            if worker is None:
+                self._started -= 1
+            else:
+                self._idle.append(worker)
+            self._cond.notify()
+
+    def _discard(self, worker):
+        worker.kill()
+        self._count("restarts")
+        self._release(None)
+
+    def run(self, fn, *args, timeout=None, cancel=None):
+        """Run ``fn(*args)`` in a worker process and return its result.
+
+        ``fn`` and its arguments must be picklable. Raises
+        :class:`SolveTimeout` after ``timeout`` seconds (default: the pool's
+        budget) and :class:`SolveCancelled` as soon as the optional ``cancel``
+        callable returns true; in both cases the worker is terminated.
+        Exceptions raised by ``fn`` are re-raised in the caller.
+        """
+        if self.workers <= 0:
+            return fn(*args)
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        worker, startup = self._acquire(deadline, cancel)
+        deadline += startup
+        try:
+            worker.conn.send((fn, args))
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._count("timeouts")
+                    raise SolveTimeout(f"solve did not finish within {timeout:g}s")
+                if cancel is not None and cancel():
+                    self._count("cancelled")
+                    raise SolveCancelled("cancelled by caller")
+                if worker.conn.poll(min(remaining, POLL_INTERVAL)):
+                    ok, value = worker.conn.recv()
+                    break
+        except BaseException:
+            self._discard(worker)
+            raise
+        self._release(worker)
+        if ok:
+            self._count("completed")
+            return value
+        self._count("errors")
+        raise value
+
+    def shutdown(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._started -= len(idle)
+        for worker in idle:
+            worker.kill()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "workers": self.workers,
+                "started": self._started,
+                "busy": self.busy,
+                "queue_depth": self.waiting,
+                "completed": self.completed,
+                "errors": self.errors,
+                "timeouts": self.timeouts,
+                "cancelled": self.cancelled,
+                "restarts": self.restarts,
+            }
+
+
+def _default_workers():
+    return min(4, os.cpu_count() or 1)
+
+
+def _import_sympy():
+    import sympy  # noqa: F401
+
+
+solver_pool = SolverPool(
+    workers=int(os.environ.get("POLYTOOLS_SOLVER_WORKERS", _default_workers())),
+    timeout=float(os.environ.get("POLYTOOLS_SOLVE_TIMEOUT", "3")),
+    initializer=_import_sympy,
+)
+atexit.register(solver_pool.shutdown)
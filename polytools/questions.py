@@ -0,0 +1,309 @@
+"""Question bank behind the Practice Questions and Answer Key sections.
+
+Questions are JSON lines: the bundled ``questions.jsonl`` (Exercises 1 and
+2), or the file named by ``POLYTOOLS_QUESTION_BANK``. Each has an ``id``,
+``exercise``, ``topic`` (a key of :data:`TOPICS`), ``kind``, ``degree``,
+``difficulty`` (one of :data:`DIFFICULTIES`) and ``text``, plus the
+``polynomial`` to solve for kind ``find_zeroes`` or the ``sum`` and
+``product`` of the zeroes of the quadratic to find for kind
+``from_sum_product`` (SymPy syntax, so ``sqrt(2)`` and ``1/3`` work).
+
+:class:`QuestionBank` reads the file once per process, keeping only ids,
+byte offsets and, per topic, degree and difficulty, the positions that have
+it. A query is answered from that index and cached, and a page reads and
+parses just its own lines. Solutions are not written by hand:
+:func:`solution` derives them from :func:`polytools.analysis.analyze`
+(factorisation, zeroes and the check against the coefficients) and caches
+them per question, so a rerun costs the same for a bank of twelve
+questions or of thousands.
+"""
+
+import json
+import os
+import threading
+from fractions import Fraction
+
+from .cache import LRUCache
+from .vieta import LETTERS, relations, zeroes_with_multiplicity
+
+BANK_PATH = (os.environ.get("POLYTOOLS_QUESTION_BANK")
+             or os.path.join(os.path.dirname(os.path.abspath(__file__)), "questions.jsonl"))
+PAGE_SIZE = 10
+TOPICS = {
+    "zeroes-and-coefficients": "Zeroes and coefficients",
+    "polynomial-from-zeroes": "Polynomial from its zeroes",
+}
+DIFFICULTIES = ("easy", "medium", "hard")
+INDEXED = ("topic", "degree", "difficulty")
+
+
+class QuestionBank:
+    """Lazily indexed JSON-lines question file."""
+
+    def __init__(self, path=BANK_PATH, cache_size=1024):
+        self.path = path
+        self._lock = threading.Lock()
+        self._offsets = None
+        self._index = None
+        self._ids = None
+        self._queries = LRUCache(maxsize=256)
+        self._items = LRUCache(maxsize=cache_size)
+
+    def _load(self):
+        with self._lock:
+            if self._offsets is not None:
+                return
+            offsets, index, ids = [], {field: {} for field in INDEXED}, {}
+            with open(self.path, "rb") as fh:
+                offset = 0
+                for line in fh:
+                    if line.strip():
+                        question = json.loads(line)
+                        for field in INDEXED:
+                            index[field].setdefault(question.get(field), []).append(len(offsets))
+                        ids[question["id"]] = len(offsets)
+                        offsets.append(offset)
+                    offset += len(line)
+            self._index, self._ids, self._offsets = index, ids, offsets
+
+    def __len__(self):
+        self._load()
+        return len(self._offsets)
+
+    def values(self, field):
+        """The values of the indexed ``field`` present in the bank, sorted."""
+        self._load()
+        values = [v for v in self._index[field] if v is not None]
+        if field == "difficulty":
+            return sorted(values, key=lambda v: DIFFICULTIES.index(v) if v in DIFFICULTIES else 99)
+        return sorted(values)
+
+    def query(self, topic=None, degree=None, difficulty=None):
+        """Positions of the questions matching every given filter, in file order."""
+        self._load()
+        key = (topic, degree, difficulty)
+
+        def compute():
+            selected = None
+            for field, value in zip(INDEXED, key):
+                if value is not None:
+                    positions = set(self._index[field].get(value, ()))
+                    selected = positions if selected is None else selected & positions
+            return tuple(range(len(self._offsets))) if selected is None else tuple(sorted(selected))
+
+        return self._queries.get_or_compute(key, compute)
+
+    def get(self, position):
+        """The question at ``position``, read from disk on first use."""
+        self._load()
+
+        def read():
+            with open(self.path, "rb") as fh:
+                fh.seek(self._offsets[position])
+                return json.loads(fh.readline())
+
+        return self._items.get_or_compute(position, read)
+
+    def find(self, question_id):
+        """The question with id ``question_id``, or ``None``."""
+        self._load()
+        position = self._ids.get(question_id)
+        return None if position is None else self.get(position)
+
+    def page(self, positions, number, size=PAGE_SIZE):
+        """Questions on page ``number`` (from 1) of ``positions``."""
+        start = (number - 1) * size
+        return [self.get(p) for p in positions[start:start + size]]
+
+    def pages(self, positions, size=PAGE_SIZE):
+        return max(1, -(-len(positions) // size))
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self.get(position)
+
+
+bank = QuestionBank()
+
+
+class Solution:
+    """Worked solution (markdown bullet lines) and one-line answer of a question."""
+
+    __slots__ = ("steps", "answer", "exact")
+
+    def __init__(self, steps, answer, exact=True):
+        self.steps = steps
+        self.answer = answer
+        self.exact = exact
+
+    def markdown(self):
+        return "**Solution:**\n" + "\n".join(f"- {step}" for step in self.steps)
+
+
+_solutions = LRUCache(maxsize=4096)
+
+
+def solution(question):
+    """Cached :class:`Solution` of ``question``, generated by the solver."""
+    solve = {"find_zeroes": _find_zeroes, "from_sum_product": _from_sum_product}[question["kind"]]
+    return _solutions.get_or_compute(question["id"], lambda: solve(question))
+
+
+def question_polynomial(question):
+    """The :class:`polytools.polynomial.Polynomial` a question's solution is built on."""
+    import sympy as sp
+
+    from .analysis import parse
+    from .polynomial import Polynomial
+
+    if question["kind"] == "find_zeroes":
+        return parse(question["polynomial"])
+    s, p = sp.sympify(question["sum"]), sp.sympify(question["product"])
+    k = sp.ilcm(sp.denom(s), sp.denom(p))
+    return Polynomial([k, -k * s, k * p])
+
+
+def _tex(value):
+    import sympy as sp
+
+    if isinstance(value, float):
+        return f"{value:.6g}"
+    if isinstance(value, complex):
+        return sp.latex(sp.Float(value.real, 6) + sp.Float(value.imag, 6) * sp.I)
+    return sp.latex(sp.sympify(value))
+
+
+def _paren(tex):
+    return f"({tex})" if tex.startswith("-") or " + " in tex or " - " in tex else tex
+
+
+def _linear_factor(var, root):
+    # (q x - p) for the rational zero p/q; x itself for zero.
+    if root == 0:
+        return var
+    q = f"{root.denominator}{var}" if root.denominator != 1 else var
+    sign = "-" if root > 0 else "+"
+    return f"({q} {sign} {abs(root.numerator)})"
+
+
+def _factorisation(poly, analysis):
+    """LaTeX factorisation over the reals, or ``None``."""
+    import sympy as sp
+
+    from .exact import rational_roots
+
+    var = poly.var
+    if poly.is_rational:
+        found, rest = rational_roots(poly.all_coeffs())
+        if len(rest) == 1:
+            leading = poly.all_coeffs()[0]
+            for root, multiplicity in found:
+                leading /= Fraction(root.denominator) ** multiplicity
+            factors = []
+            for root, multiplicity in sorted(found, key=lambda f: (f[0] != 0, f[0])):
+                factor = _linear_factor(var, root)
+                if multiplicity > 1:
+                    factor = f"{factor}^{{{multiplicity}}}"
+                factors.append(factor)
+            head = {1: "", -1: "-"}.get(leading, _tex(leading))
+            return head + "".join(factors)
+    if not analysis.exact or len(analysis.real_zeroes) != len(analysis.zeroes):
+        return None
+    if len(analysis.zeroes) != poly.degree:
+        return None
+    x = sp.Symbol(var)
+    leading = poly.all_coeffs()[0]
+    head = {1: "", -1: "-"}.get(leading, _tex(leading))
+    return head + "".join(f"({sp.latex(x - z)})" for z in analysis.zeroes)
+
+
+def _relationship_names(degree):
+    names = []
+    for k in range(1, degree + 1):
+        if k == 1:
+            names.append("Sum")
+        elif k == degree:
+            names.append("Product")
+        else:
+            names.append(f"Sum of products taken {k} at a time")
+    return names
+
+
+def _find_zeroes(question):
+    import sympy as sp
+
+    from .analysis import analyze
+
+    poly = question_polynomial(question)
+    analysis = analyze(poly)
+    var, degree = poly.var, poly.degree
+    written = question["polynomial"]
+    standard = sp.latex(poly.as_expr())
+    steps = []
+    if standard.replace("{", "").replace("}", "").replace(" ", "") != written.replace(" ", ""):
+        steps.append(f"Rewrite: \\({standard}\\)")
+    factored = _factorisation(poly, analysis)
+    if factored is not None:
+        steps.append(f"Factorize: \\({standard} = {factored}\\)")
+
+    expanded = zeroes_with_multiplicity(poly, analysis)
+    distinct = [_tex(z) for z in analysis.zeroes]
+    if not distinct:
+        steps.append("No zeroes")
+    elif len(distinct) == 1 and degree > 1:
+        steps.append(f"Zeroes: \\({var} = {distinct[0]}\\) (repeated)")
+    else:
+        shown = [f"\\({var} = {z}\\)" for z in distinct]
+        steps.append("Zeroes: " + (", ".join(shown[:-1]) + " and " + shown[-1] if len(shown) > 1
+                                   else shown[0]))
+    if not analysis.exact:
+        steps.append("(numeric approximations; exact solving took too long)")
+
+    answer = [f"Zeroes: \\({', '.join(_tex(z) for z in expanded or analysis.zeroes)}\\)"]
+    if expanded is not None and len(expanded) == degree and degree >= 1:
+        symmetric = [r.rounded() for r in relations(poly, analysis)]
+        coeffs = poly.all_coeffs()
+        a = _tex(coeffs[0])
+        terms = [_paren(_tex(z)) for z in expanded]
+        for k, (name, value) in enumerate(zip(_relationship_names(degree), symmetric), 1):
+            letter, coeff = LETTERS[k], _tex(coeffs[k])
+            if k % 2:
+                numeric = f"\\frac{{-{_paren(coeff)}}}{{{a}}}"
+                symbolic = f"-\\frac{{{letter}}}{{a}}"
+            else:
+                numeric = f"\\frac{{{coeff}}}{{{a}}}"
+                symbolic = f"\\frac{{{letter}}}{{a}}"
+            lhs = ""
+            if k == 1 and degree > 1:
+                lhs = " + ".join(terms) + " = "
+            elif k == degree and degree > 1:
+                lhs = " \\times ".join(terms) + " = "
+            steps.append(f"{name}: \\({lhs}{_tex(value)} = {numeric} = {symbolic}\\)")
+            answer.append(f"{name}: \\({_tex(value)}\\)")
+    return Solution(steps, "; ".join(answer), analysis.exact)
+
+
+def _from_sum_product(question):
+    import sympy as sp
+
+    from .analysis import analyze
+
+    s, p = sp.sympify(question["sum"]), sp.sympify(question["product"])
+    x = sp.Symbol("x")
+    monic = x ** 2 - s * x + p
+    poly = question_polynomial(question)
+    k = poly.all_coeffs()[0]
+    scaled = sp.expand(k * monic)
+    steps = [f"For sum \\(S = {_tex(s)}\\) and product \\(P = {_tex(p)}\\), "
+             f"the polynomial is \\(x^2 - Sx + P = {sp.latex(monic)}\\)"]
+    answer = f"\\({sp.latex(monic)}\\)"
+    if k != 1:
+        steps.append(f"Multiply by \\({_tex(k)}\\) to clear fractions: \\({sp.latex(scaled)}\\)")
+        answer += f" or \\({sp.latex(scaled)}\\)"
+    analysis = analyze(poly)
+    if analysis.exact and len(analysis.symmetric) == 2:
+        zeroes = ", ".join(_tex(z) for z in analysis.zeroes)
+        total, product = (r.rounded() for r in relations(poly, analysis))
+        steps.append(f"Check: its zeroes \\({zeroes}\\) have sum \\({_tex(total)}\\) "
+                     f"and product \\({_tex(product)}\\)")
+    return Solution(steps, answer, analysis.exact)
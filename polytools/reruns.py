@@ -0,0 +1,149 @@
+"""Bookkeeping for fragment-scoped reruns of the app's interactive tools.
+
+Each interactive tool (a graph expander, the zero calculator, the three
+Interactive Tools tabs) runs as a Streamlit fragment, so moving one of its
+widgets reruns that tool alone instead of the whole script. :class:`RerunStats`
+records, per session, how often each tool ran, how long it took, and for
+every fragment-only rerun how much of the last full run it did not repeat:
+the other tools on the page and everything outside them.
+
+A tool run counts as a fragment rerun when the tool already ran since the
+last full run; the full run itself is bracketed by :meth:`RerunStats.begin_run`
+and :meth:`RerunStats.end_run`.
+
+:func:`rerun_requested` is the ``cancel`` callback the tools pass to
+:func:`polytools.analysis.analyze`: once Streamlit has queued a rerun for
+newer input, a pending solve for the old input is abandoned.
+"""
+
+import time
+import warnings
+from contextlib import contextmanager
+
+_unreadable_warned = False
+
+
+def rerun_requested():
+    """Whether Streamlit has queued a rerun or stop of the running script.
+
+    Streamlit has no public API for this, so it reads the private
+    ``ScriptRequests._state`` of the script run context (checked against
+    the installed Streamlit by ``tests/test_reruns.py``). Outside a script
+    run it is false. Should a Streamlit upgrade remove that state, it warns
+    once instead of silently never cancelling.
+    """
+    global _unreadable_warned
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None:
+        return False
+    state = getattr(getattr(ctx, "script_requests", None), "_state", None)
+    if state is None:
+        if not _unreadable_warned:
+            _unreadable_warned = True
+            warnings.warn("cannot read Streamlit's script requests; solves will not be "
+                          "cancelled on rerun", RuntimeWarning, stacklevel=2)
+        return False
+    return state.name != "CONTINUE"
+
+
+class ToolStats:
+    """Run counts and timings of one tool, in milliseconds."""
+
+    __slots__ = ("runs", "fragment_runs", "last_ms", "total_ms")
+
+    def __init__(self):
+        self.runs = 0
+        self.fragment_runs = 0
+        self.last_ms = 0.0
+        self.total_ms = 0.0
+
+    def as_dict(self):
+        return {
+            "runs": self.runs,
+            "fragment_runs": self.fragment_runs,
+            "last_ms": round(self.last_ms, 2),
+            "mean_ms": round(self.total_ms / self.runs, 2) if self.runs else 0.0,
+        }
+
+
+class RerunStats:
+    """Full runs, fragment reruns and the work the latter skipped."""
+
+    __slots__ = ("full_runs", "fragment_runs", "last_full_ms", "skipped_tools",
+                 "skipped_ms", "tools", "_page", "_started")
+
+    def __init__(self):
+        self.full_runs = 0
+        self.fragment_runs = 0
+        self.last_full_ms = 0.0
+        # Tool runs and milliseconds of the last full run that fragment reruns
+        # did not repeat.
+        self.skipped_tools = 0
+        self.skipped_ms = 0.0
+        self.tools = {}
+        self._page = set()
+        self._started = None
+
+    def begin_run(self):
+        """Mark the start of a full script run."""
+        self.full_runs += 1
+        self._page = set()
+        self._started = time.perf_counter()
+
+    def end_run(self):
+        """Mark the end of a full script run and record its duration."""
+        if self._started is not None:
+            self.last_full_ms = (time.perf_counter() - self._started) * 1e3
+            self._started = None
+
+    @contextmanager
+    def track(self, name):
+        """Time one run of the tool ``name``."""
+        tool = self.tools.get(name)
+        if tool is None:
+            tool = self.tools[name] = ToolStats()
+        fragment_rerun = name in self._page
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1e3
+            tool.runs += 1
+            tool.last_ms = elapsed
+            tool.total_ms += elapsed
+            if fragment_rerun:
+                tool.fragment_runs += 1
+                self.fragment_runs += 1
+                self.skipped_tools += len(self._page) - 1
+                self.skipped_ms += max(0.0, self.last_full_ms - elapsed)
+            else:
+                self._page.add(name)
+
+    def summary(self):
+        """Counters for the debug panel."""
+        return {
+            "full_runs": self.full_runs,
+            "fragment_reruns": self.fragment_runs,
+            "last_full_run_ms": round(self.last_full_ms, 2),
+            "tool_runs_skipped": self.skipped_tools,
+            "ms_skipped": round(self.skipped_ms, 2),
+        }
+
+    def tool_table(self):
+        return {name: tool.as_dict() for name, tool in self.tools.items()}
+
+
+def get_rerun_stats(store, key="rerun_stats"):
+    """Return the session's :class:`RerunStats` from ``store``, creating it once.
+
+    It is first created by a tool during a full run, which it then counts
+    as begun.
+    """
+    stats = store.get(key)
+    if stats is None:
+        stats = RerunStats()
+        stats.begin_run()
+        store[key] = stats
+    return stats
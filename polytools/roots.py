@@ -0,0 +1,245 @@
+"""Numeric zeroes of real polynomials of any degree, with error bounds.
+
+``np.roots`` takes the eigenvalues of the companion matrix: O(n^3) time, no
+error estimate, and a repeated zero comes back as several nearby numbers
+with nothing to say they belong together. :func:`find_roots` refines all
+``n`` approximations at once with the Aberth–Ehrlich iteration (O(n^2) per
+sweep, started from the Newton polygon of the coefficients) and then
+certifies them with inclusion discs (Neumaier's theorem): with
+
+    r_i = n * |p(z_i)| / |a_n * prod_{j != i} (z_i - z_j)|
+
+every connected union of ``m`` discs ``|z - z_i| <= r_i`` holds exactly
+``m`` zeroes of ``p``, counted with multiplicity. Overlapping discs are
+therefore reported as one zero of multiplicity ``m`` (or ``m`` zeroes closer
+together than float64 can separate). Since the coefficients are real,
+non-real zeroes come in conjugate pairs, so a single disc that meets the
+real axis holds a real zero and a cluster that misses the axis holds none.
+
+Badly conditioned inputs (Wilkinson's ``(x - 1)(x - 2)...(x - 20)``) can
+leave discs so wide that far-apart zeroes merge into one cluster. Such a
+cluster is not reported as a multiple zero; its approximations are listed
+one by one and marked ``isolated=False``.
+
+Values of ``p`` outside the unit disc are computed from the reversed
+polynomial at ``1/z`` and bounds are kept as logarithms, so high degrees do
+not overflow.
+"""
+
+import numpy as np
+
+EPS = np.finfo(float).eps
+MAX_ITERATIONS = 200
+# Widest cluster, relative to its modulus, still reported as one multiple zero.
+CLUSTER_TOLERANCE = 1e-2
+
+
+class Root:
+    """A zero of a polynomial, or a cluster of ``multiplicity`` zeroes.
+
+    Every zero it stands for lies within ``radius`` of ``value``. ``value`` is
+    a float when ``real`` is true and a complex number otherwise. When
+    ``isolated`` is false the approximation belongs to an unresolved
+    cluster: ``radius`` still holds, but ``real`` is only a best guess.
+    """
+
+    __slots__ = ("value", "radius", "multiplicity", "real", "isolated")
+
+    def __init__(self, value, radius, multiplicity=1, real=False, isolated=True):
+        self.value = value
+        self.radius = radius
+        self.multiplicity = multiplicity
+        self.real = real
+        self.isolated = isolated
+
+    def __repr__(self):
+        return (f"Root({self.value!r}, radius={self.radius:.3g}, "
+                f"multiplicity={self.multiplicity}, real={self.real}, isolated={self.isolated})")
+
+
+def _horner3(coeffs, abs_coeffs, z):
+    """``p(z)``, ``p'(z)`` and the rounding scale ``sum |a_k| |z|^k``."""
+    p = np.full(z.shape, coeffs[0], dtype=complex)
+    dp = np.zeros(z.shape, dtype=complex)
+    scale = np.full(z.shape, abs_coeffs[0])
+    az = np.abs(z)
+    for c, ac in zip(coeffs[1:], abs_coeffs[1:]):
+        dp = dp * z + p
+        p = p * z + c
+        scale = scale * az + ac
+    return p, dp, scale
+
+
+def _evaluate(coeffs, z):
+    """Newton corrections ``p/p'``, ``log|p|`` and ``log`` of the rounding error bound.
+
+    Inside the unit disc ``p`` is evaluated directly; outside it
+    ``p(z) = z^n q(1/z)`` with ``q`` the reversed polynomial.
+    """
+    n = coeffs.size - 1
+    abs_coeffs = np.abs(coeffs)
+    newton = np.empty(z.shape, dtype=complex)
+    log_p = np.empty(z.shape)
+    log_noise = np.empty(z.shape)
+    gamma = 4 * (n + 1) * EPS
+
+    inside = np.abs(z) <= 1
+    if inside.any():
+        zi = z[inside]
+        p, dp, scale = _horner3(coeffs, abs_coeffs, zi)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton[inside] = np.where(dp != 0, p / dp, 0)
+            log_p[inside] = np.log(np.abs(p))
+        log_noise[inside] = np.log(gamma * scale)
+    outside = ~inside
+    if outside.any():
+        zo = z[outside]
+        w = 1 / zo
+        q, dq, scale = _horner3(coeffs[::-1], abs_coeffs[::-1], w)
+        # p'/p = w * (n - w q'/q)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            denom = n - w * dq / q
+            newton[outside] = np.where((q != 0) & (denom != 0), zo / denom, 0)
+            log_p[outside] = n * np.log(np.abs(zo)) + np.log(np.abs(q))
+        log_noise[outside] = n * np.log(np.abs(zo)) + np.log(gamma * scale)
+    return newton, log_p, log_noise
+
+
+def _initial_guesses(coeffs):
+    """Starting points on circles given by the Newton polygon (Bini, 1996).
+
+    The upper convex hull of ``(k, log|a_k|)`` gives, for each of its edges,
+    how many zeroes have roughly which modulus.
+    """
+    n = coeffs.size - 1
+    by_power = np.abs(coeffs[::-1])
+    ks = np.flatnonzero(by_power)
+    logs = np.log(by_power[ks])
+    hull = []
+    for k, v in zip(ks, logs):
+        while len(hull) >= 2:
+            (k1, v1), (k2, v2) = hull[-2], hull[-1]
+            # Drop the middle point unless it lies strictly above the chord.
+            if (v2 - v1) * (k - k1) <= (v - v1) * (k2 - k1):
+                hull.pop()
+            else:
+                break
+        hull.append((k, v))
+
+    guesses = []
+    sigma = 0.7
+    for i, ((k1, v1), (k2, v2)) in enumerate(zip(hull, hull[1:])):
+        m = k2 - k1
+        radius = np.exp((v1 - v2) / m)
+        angles = 2 * np.pi * np.arange(m) / m + 2 * np.pi * i / n + sigma
+        guesses.append(radius * np.exp(1j * angles))
+    return np.concatenate(guesses)
+
+
+def _aberth(coeffs, max_iterations):
+    n = coeffs.size - 1
+    z = _initial_guesses(coeffs)
+    active = np.ones(n, dtype=bool)
+    last_step = np.full(n, np.inf)
+    for _ in range(max_iterations):
+        idx = np.flatnonzero(active)
+        if idx.size == 0:
+            break
+        newton, log_p, log_noise = _evaluate(coeffs, z[idx])
+        diff = z[idx, None] - z[None, :]
+        diff[np.arange(idx.size), idx] = 1
+        inv = 1 / diff
+        inv[np.arange(idx.size), idx] = 0
+        sums = inv.sum(axis=1)
+        step = newton / (1 - newton * sums)
+        step[~np.isfinite(step)] = 0
+        z[idx] -= step
+        size = np.abs(step)
+        # A zero is done once it stops moving, or once p(z) is within the
+        # rounding error bound and the steps have stopped shrinking (they are
+        # then just noise).
+        done = ((size <= EPS * np.abs(z[idx]))
+                | ((log_p <= log_noise) & (size > last_step[idx] / 2)))
+        last_step[idx] = size
+        active[idx[done]] = False
+    return z
+
+
+def _inclusion_radii(coeffs, z):
+    """Neumaier inclusion radii, with evaluation rounding folded into ``|p|``."""
+    n = z.size
+    _, log_p, log_noise = _evaluate(coeffs, z)
+    log_value = np.logaddexp(log_p, log_noise)
+    diff = np.abs(z[:, None] - z[None, :])
+    np.fill_diagonal(diff, 1.0)
+    with np.errstate(divide="ignore"):
+        log_prod = np.log(diff).sum(axis=1)
+    log_r = np.log(n) + log_value - np.log(abs(coeffs[0])) - log_prod
+    # Cauchy bound: every zero has modulus below 1 + max |a_k / a_n|.
+    cauchy = 1 + np.max(np.abs(coeffs[1:] / coeffs[0]))
+    with np.errstate(over="ignore"):
+        return np.minimum(np.exp(np.minimum(log_r, 700)), 2 * cauchy)
+
+
+def _clusters(z, r):
+    """Connected components of the overlap graph of the discs."""
+    overlap = np.abs(z[:, None] - z[None, :]) <= r[:, None] + r[None, :]
+    label = np.full(z.size, -1)
+    components = []
+    for start in range(z.size):
+        if label[start] >= 0:
+            continue
+        label[start] = len(components)
+        members = [start]
+        frontier = [start]
+        while frontier:
+            nxt = np.flatnonzero(overlap[frontier].any(axis=0) & (label < 0))
+            label[nxt] = len(components)
+            members.extend(nxt.tolist())
+            frontier = nxt.tolist()
+        components.append(np.array(members))
+    return components
+
+
+def find_roots(coeffs, max_iterations=MAX_ITERATIONS):
+    """All zeroes of the real polynomial ``coeffs`` (highest power first).
+
+    Returns a list of :class:`Root`, real zeroes first in increasing order,
+    then complex ones ordered by real and imaginary part. Multiplicities
+    add up to the degree. The radii are valid bounds even if the iteration
+    stops before converging; they are just wider.
+    """
+    coeffs = np.trim_zeros(np.asarray(coeffs, dtype=float), "f")
+    if not np.all(np.isfinite(coeffs)):
+        raise ValueError("coefficients are too large for floating point")
+    roots = []
+    # Zero is found exactly: it is a zero of multiplicity k when the last k
+    # coefficients vanish.
+    trimmed = np.trim_zeros(coeffs, "b")
+    if trimmed.size < coeffs.size and coeffs.size > 1:
+        roots.append(Root(0.0, 0.0, coeffs.size - trimmed.size, real=True))
+    coeffs = trimmed / np.max(np.abs(trimmed)) if trimmed.size else trimmed
+
+    if coeffs.size > 1:
+        z = _aberth(coeffs, max_iterations)
+        r = _inclusion_radii(coeffs, z)
+        for members in _clusters(z, r):
+            zc = z[members]
+            centre = zc.mean()
+            radius = float(np.max(np.abs(zc - centre) + r[members]))
+            if members.size > 1 and radius > CLUSTER_TOLERANCE * max(1.0, abs(centre)):
+                for zi in zc:
+                    bound = abs(zi - centre) + radius
+                    if abs(zi.imag) <= CLUSTER_TOLERANCE * max(1.0, abs(zi)):
+                        roots.append(Root(float(zi.real), bound, real=True, isolated=False))
+                    else:
+                        roots.append(Root(complex(zi), bound, isolated=False))
+            elif abs(centre.imag) <= radius:
+                # The cluster is its own mirror image, so it holds a real zero
+                # (for an isolated disc) or a real cluster.
+                roots.append(Root(float(centre.real), radius + abs(centre.imag),
+                                  members.size, real=True))
+            else:
+                roots.append(Root(complex(centre), radius, members.size))
+    roots.sort(key=lambda root: (not root.real, complex(root.value).real, complex(root.value).imag))
+    return roots
@@ -0,0 +1,85 @@
+"""Adaptive sampling of polynomial curves for plotting.
+
+A fixed ``np.linspace(-10, 10, 400)`` grid spends most of its points on
+stretches a straight segment would draw just as well, and can still miss
+the exact point where a curve with a repeated zero (``4s^2 - 4s + 1``)
+touches the axis. :func:`adaptive_sample` starts from a coarse grid plus
+the real zeroes, turning points and inflection points inside the window,
+then bisects only those intervals whose chord is visibly off the curve,
+until a point budget is reached.
+"""
+
+import numpy as np
+
+from .horner import horner
+
+# Chord error allowed, as a fraction of the visible y-range; 1/1000 is below
+# a pixel for the chart heights the app uses.
+TOLERANCE = 1e-3
+
+
+def real_roots_in(coeffs, lo, hi):
+    """Real roots of ``coeffs`` strictly inside ``(lo, hi)``, sorted."""
+    coeffs = np.trim_zeros(np.asarray(coeffs, dtype=float), "f")
+    if coeffs.size < 2:
+        return np.empty(0)
+    roots = np.roots(coeffs)
+    real = roots.real[np.abs(roots.imag) <= 1e-7 * np.maximum(1.0, np.abs(roots))]
+    return np.sort(real[(real > lo) & (real < hi)])
+
+
+def special_points(coeffs, lo, hi):
+    """Zeroes, turning points and inflection points of the curve in ``(lo, hi)``."""
+    coeffs = np.asarray(coeffs, dtype=float)
+    parts = [real_roots_in(coeffs, lo, hi)]
+    for order in (1, 2):
+        if coeffs.size > order:
+            parts.append(real_roots_in(np.polyder(coeffs, order), lo, hi))
+    return np.concatenate(parts)
+
+
+def y_range(coeffs, lo, hi):
+    """Exact ``(min, max)`` of the polynomial on ``[lo, hi]``.
+
+    Extremes on a closed interval occur at an end point or a turning point.
+    """
+    coeffs = np.asarray(coeffs, dtype=float)
+    candidates = np.concatenate([[lo, hi], real_roots_in(np.polyder(coeffs), lo, hi)
+                                 if coeffs.size > 1 else []])
+    values = horner(coeffs, candidates)
+    return float(values.min()), float(values.max())
+
+
+def adaptive_sample(coeffs, xlim=(-10, 10), ylim=None, budget=200, initial=9, tol=TOLERANCE):
+    """Sample ``y = p(x)`` on ``xlim`` with at most ``budget`` points.
+
+    Returns sorted ``(x, y)`` arrays. ``ylim`` is the visible y-window; chord
+    error is measured relative to its height, and intervals lying entirely
+    above or below it are not refined. Without ``ylim`` the curve's own range
+    on ``xlim`` is used.
+    """
+    lo, hi = float(xlim[0]), float(xlim[1])
+    coeffs = np.asarray(coeffs, dtype=float)
+    x = np.unique(np.concatenate([np.linspace(lo, hi, initial), special_points(coeffs, lo, hi)]))
+    y = horner(coeffs, x)
+    bottom, top = ylim if ylim is not None else y_range(coeffs, lo, hi)
+    span = max(top - bottom, np.finfo(float).eps)
+
+    while x.size < budget:
+        mid = (x[:-1] + x[1:]) / 2
+        y_mid = horner(coeffs, mid)
+        error = np.abs(y_mid - (y[:-1] + y[1:]) / 2) / span
+        if ylim is not None:
+            above = (y[:-1] > top) & (y[1:] > top) & (y_mid > top)
+            below = (y[:-1] < bottom) & (y[1:] < bottom) & (y_mid < bottom)
+            error[above | below] = 0.0
+        split = np.flatnonzero(error > tol)
+        if split.size == 0:
+            break
+        room = budget - x.size
+        if split.size > room:
+            split = split[np.argsort(error[split])[::-1][:room]]
+            split.sort()
+        x = np.insert(x, split + 1, mid[split])
+        y = np.insert(y, split + 1, y_mid[split])
+    return x, y
@@ -0,0 +1,430 @@
+"""A solver service that several Streamlit front-ends share.
+
+Run it next to the app on a multi-core node::
+
+    python -m polytools.service [--socket PATH | --port PORT] [--threads N]
+
+and start every front-end with ``POLYTOOLS_SOLVER_SERVICE`` set to the same
+address (a socket path, or ``host:port``). A front-end then sends each
+polynomial that misses its own caches to the service instead of solving it
+in the process that also runs the UI, and keeps the answer in
+:data:`polytools.analysis.analysis_cache` as before. Solving and UI scale
+independently: the service owns the SymPy worker processes
+(:mod:`polytools.pool`, sized by ``POLYTOOLS_SOLVER_WORKERS``) and its own
+caches, shared by every front-end, and may use :mod:`polytools.diskcache`.
+
+The service is an asyncio server speaking length-prefixed pickles, and no
+frame is unpickled before the peer is trusted. A Unix socket is created
+with mode 0600, so only its owner can connect. TCP needs a shared secret in
+``POLYTOOLS_SERVICE_SECRET`` on both sides: the server refuses to listen
+without one, and each connection starts with an HMAC challenge in both
+directions before any pickle is read. Requests are collected for up to
+:data:`BATCH_WINDOW` seconds or :data:`BATCH_SIZE` items; a batch is grouped by canonical form, so identical polynomials from different
+front-ends are solved once, and each group runs
+:func:`polytools.analysis.analyze` on a thread pool.
+
+:class:`ServiceClient` is blocking, with one connection per thread. It polls
+the caller's ``cancel`` while waiting. When the service cannot be reached it
+raises :class:`ServiceUnavailable` and stays marked down for
+:data:`RETRY_INTERVAL` seconds, and ``analyze`` solves in-process instead.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import os
+import pickle
+import signal
+import socket
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import canonical_form
+from .pool import POLL_INTERVAL, SolveCancelled
+
+SERVICE_ADDRESS = os.environ.get("POLYTOOLS_SOLVER_SERVICE") or None
+SERVICE_SECRET = os.environ.get("POLYTOOLS_SERVICE_SECRET") or None
+BATCH_SIZE = 64
+BATCH_WINDOW = 0.002
+RETRY_INTERVAL = 5.0
+# A reply may wait for a queued solve, its time budget and the numeric
+# fallback; give up on the service (and solve locally) after this much more.
+REPLY_SLACK = 10.0
+_HEADER = struct.Struct("!I")
+_NONCE_SIZE = 32
+_DIGEST_SIZE = hashlib.sha256().digest_size
+
+
+class ServiceUnavailable(Exception):
+    """The solver service could not be reached or dropped the connection."""
+
+
+def parse_address(address):
+    """``("unix", path)`` for a path, ``("tcp", (host, port))`` for ``host:port``."""
+    if "/" in address or ":" not in address:
+        return "unix", address
+    host, port = address.rsplit(":", 1)
+    return "tcp", (host or "127.0.0.1", int(port))
+
+
+def _proof(secret, role, nonce):
+    """HMAC of a peer's nonce, showing that ``role`` knows ``secret``."""
+    return hmac.new(secret.encode(), role + nonce, hashlib.sha256).digest()
+
+
+def _frame(obj):
+    data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    return _HEADER.pack(len(data)) + data
+
+
+# Server
+
+class SolverService:
+    """Batches incoming solve requests and runs them on a thread pool."""
+
+    def __init__(self, threads=None, batch_size=BATCH_SIZE, batch_window=BATCH_WINDOW,
+                 secret=SERVICE_SECRET):
+        from .pool import solver_pool
+
+        # Enough threads to keep every solver worker busy, plus some for
+        # requests answered from cache or solved without SymPy.
+        threads = threads or max(4, 2 * solver_pool.workers)
+        self.executor = ThreadPoolExecutor(threads, thread_name_prefix="polytools-service")
+        self.threads = threads
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.secret = secret
+        self._queue = None
+        self.connections = 0
+        self.rejected = 0
+        self.requests = 0
+        self.items = 0
+        self.batches = 0
+        self.largest_batch = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    async def serve(self, address, ready=None):
+        """Listen on ``address`` until cancelled; ``ready`` is set once listening.
+
+        Raises :class:`ValueError` for a TCP address without a secret.
+        """
+        kind, target = parse_address(address)
+        if kind == "tcp" and not self.secret:
+            raise ValueError("a TCP solver service needs POLYTOOLS_SERVICE_SECRET")
+        self._queue = asyncio.Queue()
+        batcher = asyncio.create_task(self._batcher())
+        if kind == "unix":
+            # Create the socket owner-only from the start, not chmod it later.
+            umask = os.umask(0o177)
+            try:
+                server = await asyncio.start_unix_server(self._handle, path=target)
+            finally:
+                os.umask(umask)
+        else:
+            server = await asyncio.start_server(self._handle, *target)
+        if ready is not None:
+            ready.set()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+            if kind == "unix" and os.path.exists(target):
+                os.unlink(target)
+
+    async def _authenticate(self, reader, writer):
+        challenge = os.urandom(_NONCE_SIZE)
+        writer.write(challenge)
+        await writer.drain()
+        answer = await reader.readexactly(_DIGEST_SIZE + _NONCE_SIZE)
+        if not hmac.compare_digest(answer[:_DIGEST_SIZE],
+                                   _proof(self.secret, b"client", challenge)):
+            return False
+        writer.write(_proof(self.secret, b"server", answer[_DIGEST_SIZE:]))
+        await writer.drain()
+        return True
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            if self.secret and not await self._authenticate(reader, writer):
+                self.rejected += 1
+                return
+            while True:
+                size, = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+                kind, payload = pickle.loads(await reader.readexactly(size))
+                self.requests += 1
+                if kind == "stats":
+                    reply = self.stats()
+                else:
+                    loop = asyncio.get_running_loop()
+                    futures = []
+                    for item in payload:
+                        future = loop.create_future()
+                        self._queue.put_nowait((item, future))
+                        futures.append(future)
+                    reply = await asyncio.gather(*futures)
+                writer.write(_frame(reply))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def _batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            self._dispatch(loop, batch)
+
+    def _dispatch(self, loop, batch):
+        groups = {}
+        for (poly, timeout, numeric_only), future in batch:
+            key = (canonical_form(poly)[0], numeric_only)
+            if key not in groups:
+                groups[key] = ((poly, timeout, numeric_only), [])
+            groups[key][1].append(future)
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        self.coalesced += len(batch) - len(groups)
+        for args, futures in groups.values():
+            task = loop.run_in_executor(self.executor, _analyze, *args)
+            task.add_done_callback(lambda task, futures=futures: self._resolve(task, futures))
+
+    def _resolve(self, task, futures):
+        ok, value = task.result()
+        if not ok:
+            self.errors += 1
+        for future in futures:
+            if not future.done():
+                future.set_result((ok, value))
+
+    def stats(self):
+        from .analysis import cache_stats, pool_stats
+
+        return {
+            "threads": self.threads,
+            "connections": self.connections,
+            "rejected": self.rejected,
+            "requests": self.requests,
+            "items": self.items,
+            "batches": self.batches,
+            "mean_batch": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "cache": cache_stats()["analysis"],
+            "pool": pool_stats(),
+        }
+
+
+def _analyze(poly, timeout, numeric_only):
+    from .analysis import analyze
+
+    try:
+        return True, analyze(poly, timeout=timeout, numeric_only=numeric_only)
+    except Exception as exc:
+        return False, exc
+
+
+# Client
+
+class ServiceClient:
+    """Blocking client of :class:`SolverService`, one connection per thread."""
+
+    def __init__(self, address, retry_interval=RETRY_INTERVAL, secret=SERVICE_SECRET):
+        self.address = address
+        self.retry_interval = retry_interval
+        self.secret = secret
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._down_until = 0.0
+        self.calls = 0
+        self.failures = 0
+        self.cancelled = 0
+
+    def available(self):
+        """False while the service is marked down after a failure."""
+        return time.monotonic() >= self._down_until
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _connect(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            return sock
+        kind, target = parse_address(self.address)
+        if kind == "tcp" and not self.secret:
+            raise ServiceUnavailable(
+                f"solver service at {self.address} needs POLYTOOLS_SERVICE_SECRET")
+        try:
+            if kind == "unix":
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.connect(target)
+            else:
+                sock = socket.create_connection(target)
+        except OSError as exc:
+            raise ServiceUnavailable(f"no solver service at {self.address}: {exc}") from exc
+        sock.settimeout(POLL_INTERVAL)
+        self._local.sock = sock
+        if self.secret:
+            self._authenticate(sock)
+        return sock
+
+    def _authenticate(self, sock):
+        deadline = time.monotonic() + REPLY_SLACK
+        challenge = self._recv(sock, _NONCE_SIZE, None, deadline)
+        nonce = os.urandom(_NONCE_SIZE)
+        sock.sendall(_proof(self.secret, b"client", challenge) + nonce)
+        answer = self._recv(sock, _DIGEST_SIZE, None, deadline)
+        if not hmac.compare_digest(answer, _proof(self.secret, b"server", nonce)):
+            raise ServiceUnavailable(
+                f"solver service at {self.address} did not prove the shared secret")
+
+    def _disconnect(self):
+        sock = getattr(self._local, "sock", None)
+        self._local.sock = None
+        if sock is not None:
+            sock.close()
+
+    def _recv(self, sock, size, cancel, deadline):
+        chunks, remaining = [], size
+        while remaining:
+            try:
+                chunk = sock.recv(min(remaining, 1 << 20))
+            except socket.timeout:
+                if cancel is not None and cancel():
+                    raise SolveCancelled("cancelled while waiting for the solver service")
+                if time.monotonic() > deadline:
+                    raise ServiceUnavailable("solver service did not reply in time")
+                continue
+            if not chunk:
+                raise ServiceUnavailable("solver service closed the connection")
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b"".join(chunks)
+
+    def request(self, kind, payload=None, cancel=None, wait=REPLY_SLACK):
+        """Send one request and return the reply.
+
+        Raises :class:`ServiceUnavailable` (and marks the service down) if it
+        cannot be reached or does not reply within ``wait`` seconds, and
+        :class:`polytools.pool.SolveCancelled` if ``cancel`` returns true
+        first; either way the connection is dropped, since a reply may
+        still be on its way.
+        """
+        try:
+            sock = self._connect()
+            sock.sendall(_frame((kind, payload)))
+            deadline = time.monotonic() + wait
+            size, = _HEADER.unpack(self._recv(sock, _HEADER.size, cancel, deadline))
+            return pickle.loads(self._recv(sock, size, cancel, deadline))
+        except SolveCancelled:
+            self._disconnect()
+            self._count("cancelled")
+            raise
+        except (ServiceUnavailable, OSError) as exc:
+            self._disconnect()
+            self._count("failures")
+            self._down_until = time.monotonic() + self.retry_interval
+            if isinstance(exc, ServiceUnavailable):
+                raise
+            raise ServiceUnavailable(f"solver service at {self.address} failed: {exc}") from exc
+
+    def analyze_many(self, polys, timeout=None, numeric_only=False, cancel=None):
+        """Analyses of ``polys`` in order; an item that failed is its exception."""
+        from .pool import solver_pool
+
+        budget = solver_pool.timeout if timeout is None else timeout
+        items = [(poly, timeout, numeric_only) for poly in polys]
+        self._count("calls")
+        replies = self.request("analyze", items, cancel=cancel, wait=budget + REPLY_SLACK)
+        return [value for _, value in replies]
+
+    def analyze(self, poly, timeout=None, numeric_only=False, cancel=None):
+        """:func:`polytools.analysis.analyze` of ``poly``, computed by the service."""
+        result, = self.analyze_many([poly], timeout, numeric_only, cancel)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def server_stats(self):
+        return self.request("stats")
+
+    def stats(self):
+        with self._lock:
+            return {
+                "address": self.address,
+                "available": self.available(),
+                "calls": self.calls,
+                "failures": self.failures,
+                "cancelled": self.cancelled,
+            }
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m polytools.service",
+                                     description=__doc__.splitlines()[0])
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--socket", metavar="PATH", help="Unix socket to listen on")
+    group.add_argument("--port", type=int, help="listen on 127.0.0.1:PORT instead (needs POLYTOOLS_SERVICE_SECRET)")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="concurrent solves (default twice the solver workers, at least 4)")
+    parser.add_argument("--stats", action="store_true",
+                        help="print the statistics of a running service and exit")
+    args = parser.parse_args(argv)
+    if args.port is not None:
+        address = f"127.0.0.1:{args.port}"
+    else:
+        address = args.socket or SERVICE_ADDRESS
+    if address is None:
+        parser.error("no address: pass --socket or --port, or set POLYTOOLS_SOLVER_SERVICE")
+    if parse_address(address)[0] == "tcp" and not SERVICE_SECRET:
+        parser.error("TCP needs a shared secret: set POLYTOOLS_SERVICE_SECRET here and "
+                     "in every front-end, or use --socket")
+
+    if args.stats:
+        for name, value in ServiceClient(address).server_stats().items():
+            print(f"{name:14} {value}")
+        return 0
+
+    from . import analysis
+
+    # This process is the service; it must not forward to itself.
+    analysis.solver_service = None
+    service = SolverService(threads=args.threads)
+    print(f"polytools solver service on {address} ({service.threads} threads)", flush=True)
+
+    async def run():
+        # Stop cleanly (removing the socket) on SIGTERM as well as Ctrl-C.
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM,
+                                                      asyncio.current_task().cancel)
+        await service.serve(address)
+
+    try:
+        asyncio.run(run())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
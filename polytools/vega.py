@@ -0,0 +1,58 @@
+"""Vega-Lite specs for the app's polynomial graphs, drawn in the browser.
+
+With the Matplotlib backend every slider movement rasterises a PNG on the
+server. :func:`line_chart_spec` instead returns a spec carrying only the
+sampled points and zero markers, which ``st.vega_lite_chart`` hands to the
+browser to draw. It takes the same arguments as
+:meth:`polytools.plotting.LineChart.update`, so the two are interchangeable
+(``label`` is accepted but unused; the title already names the curve).
+"""
+
+import numpy as np
+
+# Decimal places kept for sampled points; enough for a chart, and it keeps
+# the JSON payload small.
+PRECISION = 4
+
+
+def line_chart_spec(x, y, title, label=None, zeroes=(), zero_labels=None,
+                    xlim=(-10, 10), ylim=(-10, 10)):
+    x = np.round(np.asarray(x, dtype=float), PRECISION)
+    y = np.round(np.asarray(y, dtype=float), PRECISION)
+    points = [{"x": float(a), "y": float(b)} for a, b in zip(x.tolist(), y.tolist())]
+    markers = [
+        {"x": round(float(z), PRECISION), "y": 0.0,
+         "label": zero_labels[i] if zero_labels else f"Zero at x = {z:.2f}"}
+        for i, z in enumerate(zeroes) if xlim[0] <= z <= xlim[1]
+    ]
+    scale_x = {"domain": [float(xlim[0]), float(xlim[1])]}
+    scale_y = {"domain": [float(ylim[0]), float(ylim[1])]}
+    layers = [
+        {"data": {"values": [{"v": 0}]}, "mark": {"type": "rule", "color": "black", "opacity": 0.3},
+         "encoding": {"y": {"field": "v", "type": "quantitative", "scale": scale_y}}},
+        {"data": {"values": [{"v": 0}]}, "mark": {"type": "rule", "color": "black", "opacity": 0.3},
+         "encoding": {"x": {"field": "v", "type": "quantitative", "scale": scale_x}}},
+        {"data": {"values": points},
+         "mark": {"type": "line", "color": "#1f4fd8", "strokeWidth": 2, "clip": True},
+         "encoding": {
+             "x": {"field": "x", "type": "quantitative", "scale": scale_x, "title": "x"},
+             "y": {"field": "y", "type": "quantitative", "scale": scale_y, "title": "y"},
+         }},
+    ]
+    if markers:
+        layers.append({
+            "data": {"values": markers},
+            "mark": {"type": "point", "filled": True, "color": "red", "size": 80},
+            "encoding": {
+                "x": {"field": "x", "type": "quantitative", "scale": scale_x},
+                "y": {"field": "y", "type": "quantitative", "scale": scale_y},
+                "tooltip": [{"field": "label", "type": "nominal"}],
+            },
+        })
+    return {
+        "$schema": "https://vega.github.io/schema/vega-lite/v5.json",
+        "title": title,
+        "width": "container",
+        "height": 360,
+        "layer": layers,
+    }
@@ -0,0 +1,246 @@
+"""Vieta's relations for polynomials of any degree.
+
+For ``p = c_0 x^n + c_1 x^(n-1) + ... + c_n`` with zeroes ``z_1..z_n``
+(counted by multiplicity, complex ones included) the elementary symmetric
+sums satisfy ``e_k = (-1)^k c_k / c_0``: the sum of the zeroes is ``-b/a``,
+the sum of products taken two at a time ``c/a``, and so on up to the
+product. :func:`elementary_symmetric` computes all ``n`` sums with the usual
+O(n^2) recurrence, on ``Fraction``, SymPy or float values alike.
+
+:func:`relations` checks every relation for a polynomial. Exact zeroes
+(rational, or radicals from the solver) are compared exactly when the sum
+expands to the ratio; sums of cube roots from Cardano's formula usually do
+not, and are compared at :data:`DIGITS` significant digits. Otherwise
+the zeroes come from :func:`polytools.roots.find_roots`, each known to lie
+within a radius of its approximation, and :func:`symmetric_bounds` turns
+those radii and the rounding of the recurrence into a rigorous error bound
+for each ``e_k``; a relation holds when the ratio is within that bound.
+Complex-conjugate zeroes need no special case: their contributions are
+real up to rounding.
+"""
+
+import math
+from fractions import Fraction
+
+import numpy as np
+
+from .cache import LRUCache
+
+EPS = np.finfo(float).eps
+# Significant digits radical sums are evaluated to when they do not expand
+# to the coefficient ratio; the relation must hold to within 10 fewer.
+DIGITS = 50
+# Coefficient names in ax^n + bx^(n-1) + ..., as in the formulas sections.
+LETTERS = "abcdefgh"
+# Textbook notation for the sums of the zeroes of quadratics and cubics.
+EXPRESSIONS = {
+    2: ("α + β", "αβ"),
+    3: ("α + β + γ", "αβ + βγ + γα", "αβγ"),
+}
+_COUNTS = {2: "two", 3: "three", 4: "four", 5: "five", 6: "six", 7: "seven", 8: "eight",
+           9: "nine", 10: "ten"}
+
+
+def elementary_symmetric(values):
+    """``[e_1, ..., e_n]`` of ``values`` by the usual O(n^2) recurrence."""
+    e = [1]
+    for v in values:
+        e = [1] + [e[k] + v * e[k - 1] for k in range(1, len(e))] + [v * e[-1]]
+    return e[1:]
+
+
+def symmetric_bounds(values, radii=None):
+    """Float ``e_k`` of ``values`` and a bound on the error of each.
+
+    ``radii[i]`` bounds how far the true ``values[i]`` may be from the one
+    given. The bound covers those radii and the rounding of the
+    recurrence: with ``|z_i - w_i| <= r_i``,
+    ``|e_k(w) - e_k(z)| <= e_k(|z| + r) - e_k(|z|)``, and rounding adds at
+    most ``4 (n + 1) eps e_k(|z| + r)``.
+    """
+    z = np.asarray(values, dtype=complex)
+    r = np.zeros(z.size) if radii is None else np.asarray(radii, dtype=float)
+    n = z.size
+    e = np.zeros(n + 1, dtype=complex)
+    outer = np.zeros(n + 1)
+    inner = np.zeros(n + 1)
+    e[0] = outer[0] = inner[0] = 1.0
+    # A zero too sensitive to locate can have an enormous radius; the bound
+    # is then infinite rather than a warning.
+    with np.errstate(over="ignore", invalid="ignore"):
+        for zi, ai, ri in zip(z, np.abs(z), r):
+            # The right-hand sides still read the previous row.
+            e[1:] = e[1:] + zi * e[:-1]
+            outer[1:] = outer[1:] + (ai + ri) * outer[:-1]
+            inner[1:] = inner[1:] + ai * inner[:-1]
+        gamma = 4 * (n + 1) * EPS
+        error = outer[1:] * (1 + gamma) - inner[1:] * (1 - gamma) + gamma * outer[1:]
+    error[np.isnan(error)] = np.inf
+    return e[1:], np.maximum(error, 0.0)
+
+
+def relationship_name(k, degree):
+    """``Sum of zeroes``, ``Sum of products taken two at a time``, ..., ``Product of zeroes``."""
+    if k == 1:
+        return "Sum of zeroes"
+    if k == degree:
+        return "Product of zeroes"
+    return f"Sum of products taken {_COUNTS.get(k, k)} at a time"
+
+
+def ratio_label(k):
+    """``-b/a``, ``c/a``, ... for coefficient ``k``; ``(-1)^k c_k/c_0`` past ``h``."""
+    if k < len(LETTERS):
+        return ("-" if k % 2 else "") + f"{LETTERS[k]}/a"
+    return f"(-1)^{k} c_{k}/c_0"
+
+
+class Relation:
+    """One relation ``e_k = (-1)^k c_k / c_0`` and whether it holds.
+
+    ``symmetric`` is ``e_k`` computed from the zeroes and ``ratio`` the
+    coefficient ratio. ``error`` is ``None`` when both are exact and the
+    comparison is exact, else the bound on ``|e_k - ratio|`` within which
+    the relation is taken to hold; a float ``symmetric`` that is real
+    within the bound is given as a float.
+    """
+
+    __slots__ = ("k", "degree", "symmetric", "ratio", "error", "holds")
+
+    def __init__(self, k, degree, symmetric, ratio, error, holds):
+        self.k = k
+        self.degree = degree
+        self.symmetric = symmetric
+        self.ratio = ratio
+        self.error = error
+        self.holds = holds
+
+    @property
+    def name(self):
+        return relationship_name(self.k, self.degree)
+
+    @property
+    def label(self):
+        return ratio_label(self.k)
+
+    @property
+    def expression(self):
+        """``α + β`` and friends for quadratics and cubics, else ``e_k``."""
+        names = EXPRESSIONS.get(self.degree)
+        return names[self.k - 1] if names else f"e_{self.k}"
+
+    def rounded(self):
+        """``symmetric`` without the digits its error bound leaves in doubt."""
+        if self.error is None or not math.isfinite(self.error):
+            return self.symmetric
+        digits = max(0, -math.floor(math.log10(self.error))) if self.error > 0 else 15
+        value = self.symmetric
+        if isinstance(value, complex):
+            return complex(round(value.real, digits) + 0.0, round(value.imag, digits) + 0.0)
+        # "+ 0.0" turns -0.0 into 0.0 for display.
+        return round(value, digits) + 0.0
+
+    def __repr__(self):
+        return (f"Relation(k={self.k}, symmetric={self.symmetric!r}, ratio={self.ratio!r}, "
+                f"error={self.error!r}, holds={self.holds})")
+
+
+def zeroes_with_multiplicity(poly, analysis):
+    """Exact zeroes of ``analysis`` counted by multiplicity, or ``None`` if not known."""
+    from .exact import rational_roots
+
+    if not analysis.exact:
+        return None
+    if not poly.is_rational:
+        return list(analysis.zeroes) if len(analysis.zeroes) == poly.degree else None
+    found, rest = rational_roots(poly.all_coeffs())
+    rational = {root for root, _ in found}
+
+    def is_rational_root(z):
+        # The solver returns rational zeroes as Fraction or sp.Rational.
+        if getattr(z, "is_Rational", False):
+            z = Fraction(int(z.p), int(z.q))
+        return isinstance(z, Fraction) and z in rational
+
+    others = [z for z in analysis.zeroes if not is_rational_root(z)]
+    if len(others) != len(rest) - 1:
+        return None
+    return [root for root, m in found for _ in range(m)] + others
+
+
+def _exact_relations(poly, zeroes, symmetric=None):
+    import sympy as sp
+
+    n = poly.degree
+    if symmetric is None or len(symmetric) != n:
+        symmetric = elementary_symmetric(zeroes)
+    result = []
+    for k, (e, ratio) in enumerate(zip(symmetric, poly.vieta()), 1):
+        if isinstance(e, Fraction) and isinstance(ratio, Fraction):
+            result.append(Relation(k, n, e, ratio, None, e == ratio))
+            continue
+        e = sp.expand(sp.sympify(e))
+        if sp.expand(e - sp.sympify(ratio)) == 0:
+            result.append(Relation(k, n, e, ratio, None, True))
+            continue
+        # Sums of Cardano radicals rarely expand to a number and simplifying
+        # them takes seconds to minutes, so compare at high precision instead.
+        value = complex(sp.N(e, DIGITS))
+        bound = 10.0 ** (10 - DIGITS) * max(1.0, abs(complex(ratio)))
+        shown = value.real if abs(value.imag) <= bound else value
+        result.append(Relation(k, n, shown, ratio, bound, abs(value - complex(ratio)) <= bound))
+    return result
+
+
+def _numeric_relations(poly, roots):
+    n = poly.degree
+    values = [complex(r.value) for r in roots for _ in range(r.multiplicity)]
+    radii = [r.radius for r in roots for _ in range(r.multiplicity)]
+    symmetric, error = symmetric_bounds(values, radii)
+    # The roots belong to the float coefficients, so those give the ratios
+    # to compare with, up to one rounding each.
+    coeffs = poly.coeffs
+    floats = [(-1) ** k * coeffs[k] / coeffs[0] for k in range(1, n + 1)]
+    result = []
+    for k, (e, bound, ratio, shown) in enumerate(zip(symmetric, error, floats, poly.vieta()), 1):
+        bound = float(bound + 2 * EPS * abs(ratio))
+        value = float(e.real) if abs(e.imag) <= bound else complex(e)
+        result.append(Relation(k, n, value, shown, bound, bool(abs(e - ratio) <= bound)))
+    return result
+
+
+_cache = LRUCache(maxsize=1024)
+
+
+def relations(poly, analysis=None):
+    """Every Vieta relation of ``poly``: :class:`Relation` for ``k = 1..n``.
+
+    With an exact :class:`polytools.analysis.Analysis` (or, without one, a
+    rational polynomial whose zeroes are all rational) the zeroes are
+    exact and so is the check. Otherwise the certified numeric zeroes of
+    ``analysis.roots`` or :func:`polytools.roots.find_roots` are used, with
+    error bounds. Results are cached per polynomial.
+    """
+    from .cache import canonical_form
+
+    if poly.degree < 1:
+        return []
+    key = canonical_form(poly)[0]
+
+    def compute():
+        from .exact import rational_roots
+        from .roots import find_roots
+
+        if analysis is not None and analysis.exact:
+            zeroes = zeroes_with_multiplicity(poly, analysis)
+            if zeroes is not None and len(zeroes) == poly.degree:
+                return _exact_relations(poly, zeroes, analysis.symmetric)
+        if analysis is None and poly.is_rational:
+            found, rest = rational_roots(poly.all_coeffs())
+            if len(rest) == 1:
+                return _exact_relations(poly, [r for r, m in found for _ in range(m)])
+        roots = analysis.roots if analysis is not None and analysis.roots else None
+        return _numeric_relations(poly, roots or find_roots(poly.coeffs))
+
+    exact = analysis is not None and analysis.exact
+    return _cache.get_or_compute((key, exact), compute)
@@ -0,0 +1,8 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Solve in-process: no worker start-up per test session, and the tests time
+# the solver itself rather than the pool.
+os.environ.setdefault("POLYTOOLS_SOLVER_WORKERS", "0")
@@ -0,0 +1,28 @@
+import io
+import json
+
+from polytools.batch import read_inputs, run
+
+
+def batch(text, fmt="jsonl", field="polynomial"):
+    out = io.StringIO()
+    progress = run(read_inputs(io.StringIO(text), fmt, field), out, jobs=0)
+    return [json.loads(line) for line in out.getvalue().splitlines()], progress
+
+
+def test_bad_json_lines_become_error_records():
+    lines = ['"x^2 - 1"', "[1, 2]", "42", '{"id": 7, "poly": "x - 1"}', "{oops",
+             '{"id": 8, "polynomial": "x^2 - 4"}']
+    records, progress = batch("\n".join(lines))
+    assert len(records) == len(lines)
+    assert [("error" in r) for r in records] == [False, True, True, True, True, False]
+    assert records[3]["id"] == 7 and "'polynomial'" in records[3]["error"]
+    assert records[5]["id"] == 8 and records[5]["vieta_ok"] is True
+    assert progress.errors == 4
+
+
+def test_vieta_ok_counts_repeated_zeroes():
+    records, _ = batch("x^3 - 3x + 2\n(x - 1)^2 (x + 2)^2\nx^3 + x + 1\n7\n", fmt="text")
+    assert [r["vieta_ok"] for r in records] == [True, True, True, None]
+    assert records[0]["symmetric_sums"] == ["0", "-3", "-2"]
+    assert records[0]["vieta_ratios"] == ["0", "-3", "-2"]
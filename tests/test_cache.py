@@ -0,0 +1,74 @@
+import threading
+import time
+from fractions import Fraction
+
+from polytools.cache import LRUCache, canonical_form
+from polytools.parser import parse_polynomial
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_least_recently_used_is_evicted():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert "a" in cache and "c" in cache and "b" not in cache
+
+
+def test_entries_expire():
+    clock = Clock()
+    cache = LRUCache(ttl=10, clock=clock)
+    cache.put("long", 1)
+    cache.put("short", 2, ttl=1)
+    cache.put("forever", 3, ttl=None)
+    clock.now = 5
+    assert cache.get("long") == 1 and cache.get("short") is None
+    clock.now = 1e6
+    assert cache.get("long") is None and cache.get("forever") == 3
+
+
+def test_ttl_chosen_from_computed_value():
+    clock = Clock()
+    cache = LRUCache(ttl=3600, clock=clock)
+    cache.get_or_compute("k", lambda: "fallback", ttl=lambda value: 30 if value == "fallback" else 3600)
+    clock.now = 31
+    assert cache.get_or_compute("k", lambda: "exact") == "exact"
+
+
+def test_concurrent_misses_share_one_computation():
+    cache = LRUCache()
+    calls = []
+    started = threading.Event()
+
+    def compute():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return 42
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute)))
+               for _ in range(5)]
+    threads[0].start()
+    started.wait()
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [42] * 5 and len(calls) == 1
+    assert cache.stats()["coalesced"] == 4
+
+
+def test_scalar_multiples_share_a_key():
+    key, scale = canonical_form(parse_polynomial("2x^2 - 6x - 8"))
+    assert key == canonical_form(parse_polynomial("-t^2 + 3t + 4"))[0]
+    assert key == ("q", (1, -3, -4)) and scale == 2
+    assert canonical_form(parse_polynomial("1/2x - 1/3"))[1] == Fraction(1, 6)
@@ -0,0 +1,54 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from polytools.generator import generate, polynomial_text
+from polytools.parser import parse_polynomial
+from polytools.polynomial import Polynomial
+
+
+@pytest.mark.parametrize("degree", [2, 3, 4])
+def test_zeroes_belong_to_their_polynomials(degree):
+    problems = generate(500, degree=degree, max_numerator=30, denominators=(1, 2, 3), max_leading=3,
+                        seed=degree)
+    assert len(problems) == 500
+    assert problems.verify().all()
+    for question in problems.questions():
+        poly = parse_polynomial(question["polynomial"])
+        assert poly.degree == degree
+        for zero in question["zeroes"]:
+            assert poly(Fraction(zero)) == 0
+
+
+def test_sum_and_product():
+    problems = generate(500, kind="from_sum_product", max_numerator=20, denominators=(1, 2, 5), seed=1)
+    for question in problems.questions():
+        poly = parse_polynomial(question["answer"])
+        a, b, c = poly.all_coeffs()
+        assert -b / a == Fraction(question["sum"]) and c / a == Fraction(question["product"])
+
+
+def test_problems_are_distinct_up_to_scaling():
+    problems = generate(2000, max_numerator=40, denominators=(1, 2, 3, 4), max_leading=4, seed=2)
+    coeffs = np.asarray(problems.coeffs)
+    keys = {tuple(row // np.gcd.reduce(row) * np.sign(row[0])) for row in coeffs}
+    assert len(keys) == len(problems)
+
+
+def test_too_few_distinct_problems():
+    with pytest.raises(ValueError):
+        generate(1000, max_numerator=3, seed=0)
+
+
+def test_same_seed_same_problems():
+    first = generate(100, seed=9)
+    second = generate(100, seed=9)
+    assert np.array_equal(first.coeffs, second.coeffs)
+
+
+@pytest.mark.parametrize("coeffs, text", [([1, -3, -4], "x^2 - 3x - 4"), ([6, 0, -3], "6x^2 - 3"),
+                                          ([-1, 1, 0], "-x^2 + x")])
+def test_polynomial_text(coeffs, text):
+    assert polynomial_text(coeffs) == text
+    assert parse_polynomial(text) == Polynomial(coeffs)
@@ -0,0 +1,91 @@
+import io
+import json
+
+import pytest
+
+from polytools.grader import Grader, grade, main, read_submissions
+from polytools.questions import QuestionBank
+
+QUESTIONS = [
+    {"id": "q1", "kind": "find_zeroes", "topic": "zeroes-and-coefficients", "degree": 2,
+     "difficulty": "easy", "text": "", "polynomial": "6x^2 - 3 - 7x"},
+    {"id": "q2", "kind": "find_zeroes", "topic": "zeroes-and-coefficients", "degree": 2,
+     "difficulty": "easy", "text": "", "polynomial": "t^2 - 15"},
+    {"id": "q3", "kind": "from_sum_product", "topic": "polynomial-from-zeroes", "degree": 2,
+     "difficulty": "easy", "text": "", "sum": "1/4", "product": "-1"},
+    {"id": "q4", "kind": "from_sum_product", "topic": "polynomial-from-zeroes", "degree": 2,
+     "difficulty": "hard", "text": "", "sum": "sqrt(2)", "product": "1/3"},
+    {"id": "q5", "kind": "find_zeroes", "topic": "zeroes-and-coefficients", "degree": 3,
+     "difficulty": "hard", "text": "", "polynomial": "x^3 + x + 1"},
+]
+
+
+@pytest.fixture(scope="module")
+def bank_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("bank") / "bank.jsonl"
+    path.write_text("".join(json.dumps(q) + "\n" for q in QUESTIONS))
+    return str(path)
+
+
+@pytest.fixture(scope="module")
+def grader(bank_path):
+    return Grader(QuestionBank(bank_path))
+
+
+@pytest.mark.parametrize("question, part, answer, verdict", [
+    ("q1", "zeroes", "3/2, -1/3", "correct"),
+    ("q1", "zeroes", "-1/3; 1.5", "correct"),
+    ("q1", "zeroes", "3/2, 1/3", "wrong"),
+    ("q1", "sum", "7/6", "correct"),
+    ("q1", "product", "-1/2", "correct"),
+    ("q1", "product", "1/2", "wrong"),
+    ("q2", "zeroes", "±√15", "correct"),
+    ("q2", "zeroes", "sqrt(15), -sqrt(15)", "correct"),
+    ("q2", "zeroes", "3.873, -3.873", "wrong"),
+    ("q3", "polynomial", "4x^2 - x - 4", "correct"),
+    ("q3", "polynomial", "x^2 - 1/4x - 1", "correct"),
+    ("q3", "polynomial", "4x^2 + x - 4", "wrong"),
+    ("q4", "polynomial", "3x^2 - 3sqrt(2)x + 1", "correct"),
+    ("q4", "polynomial", "3x^2 - 4.2426x + 1", "wrong"),
+    ("q1", "zeroes", "9**9**9", "invalid"),
+    ("q1", "zeroes", "__import__('os')", "invalid"),
+    ("q1", "sum", "√", "invalid"),
+    ("q1", "sum", "sqrt", "invalid"),
+    ("q1", "sum", "()", "invalid"),
+    ("q1", "sum", "2 + √", "invalid"),
+    ("q1", "zeroes", "√, 1", "invalid"),
+    ("q4", "polynomial", "x^2 - sqrt x + 1", "invalid"),
+    ("q4", "polynomial", "x^2 - ()x + 1", "invalid"),
+    ("q1", "sum", 0, "wrong"),
+    ("missing", "zeroes", "1", "unknown"),
+])
+def test_verdicts(grader, question, part, answer, verdict):
+    assert grader.grade(question, answer, part)[1] == verdict
+
+
+def test_irreducible_cubic_is_graded_exactly(grader):
+    # Its zeroes must be the exact radicals, not floats compared to 1e-9.
+    zeroes = grader.reference("q5").zeroes
+    assert not any(isinstance(z, (float, complex)) for z in zeroes)
+    assert grader.grade("q5", "-0.6823278038", "zeroes")[1] == "wrong"
+
+
+def test_bad_lines_are_invalid_records(bank_path):
+    lines = ['{"question": "q1", "part": "sum", "answer": "7/6"}', "{oops", "[1]",
+             '{"question": "q2", "part": "sum", "answer": 0}', '{"question": "q2", "part": "sum"}']
+    out = io.StringIO()
+    report = grade(read_submissions(io.StringIO("\n".join(lines)), "jsonl"), out, bank_path=bank_path)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [r["verdict"] for r in records] == ["correct", "invalid", "invalid", "correct", "invalid"]
+    assert records[1]["line"] == "{oops" and "invalid JSON" in records[1]["error"]
+    assert report.verdicts["invalid"] == 3
+
+
+def test_cli_survives_unreadable_answers(bank_path, tmp_path):
+    submissions = tmp_path / "answers.csv"
+    submissions.write_text("student,question,part,answer\n"
+                           "s1,q1,sum,7/6\ns2,q1,sum,√\ns3,q1,product,-1/2\n")
+    results = tmp_path / "results.jsonl"
+    assert main([str(submissions), "--bank", bank_path, "-o", str(results), "-j", "0", "-q"]) == 0
+    verdicts = [json.loads(line)["verdict"] for line in results.read_text().splitlines()]
+    assert verdicts == ["correct", "invalid", "correct"]
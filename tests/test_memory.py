@@ -0,0 +1,50 @@
+import pytest
+
+from polytools import memory
+from polytools.analysis import parse, parse_cache
+
+
+@pytest.fixture
+def pressure(monkeypatch):
+    state = {"rss": 0, "now": 1000.0}
+    monkeypatch.setattr(memory, "rss", lambda: state["rss"])
+    monkeypatch.setattr(memory.time, "monotonic", lambda: state["now"])
+    monkeypatch.setattr(memory, "release_free_memory", lambda: None)
+    monkeypatch.setattr(memory, "_numeric_only", False)
+    monkeypatch.setattr(memory, "_last_purge", None)
+    monkeypatch.setattr(memory, "pressure_events", 0)
+    return state
+
+
+def test_caches_are_purged_once_per_crossing(pressure):
+    pressure["rss"] = 200
+    parse("x^2 - 1")
+    assert memory.check_process(limit=100)
+    assert len(parse_cache) == 0 and memory.pressure_events == 1
+
+    # Still over the limit: the caches fill and are kept.
+    parse("x^2 - 1")
+    for _ in range(10):
+        pressure["now"] += 1
+        assert memory.check_process(limit=100)
+    assert len(parse_cache) == 1 and memory.pressure_events == 1
+
+    # Purged again once the interval has passed.
+    pressure["now"] += memory.PURGE_INTERVAL
+    memory.check_process(limit=100)
+    assert len(parse_cache) == 0 and memory.pressure_events == 2
+
+
+def test_recovery_needs_the_lower_threshold(pressure):
+    pressure["rss"] = 200
+    memory.check_process(limit=100)
+    pressure["rss"] = 95
+    assert memory.check_process(limit=100)
+    pressure["rss"] = 80
+    assert not memory.check_process(limit=100)
+
+    # A new crossing purges at once.
+    pressure["rss"] = 200
+    pressure["now"] += 1
+    memory.check_process(limit=100)
+    assert memory.pressure_events == 2
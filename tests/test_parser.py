@@ -0,0 +1,95 @@
+import random
+import re
+from fractions import Fraction
+
+import pytest
+
+import sympy as sp
+
+from polytools.parser import MAX_DEGREE, PolynomialSyntaxError, parse_polynomial, parse_with_surds
+from polytools.polynomial import Polynomial
+
+
+@pytest.mark.parametrize("text, coeffs, var", [
+    ("x^2 - 3x - 4", [1, -3, -4], "x"),
+    ("6x^2 - 3 - 7x", [6, -7, -3], "x"),
+    ("4u² + 8u", [4, 8, 0], "u"),
+    ("t**2 - 15", [1, 0, -15], "t"),
+    ("x^2 - 1/4x - 1", [1, Fraction(-1, 4), -1], "x"),
+    ("(x - 1)(x + 2)", [1, 1, -2], "x"),
+    ("2(x + 1)^2", [2, 4, 2], "x"),
+    ("x^2/-4 + 2*-x", [Fraction(-1, 4), -2, 0], "x"),
+    ("0.5x − 1.25", [Fraction(1, 2), Fraction(-5, 4)], "x"),
+    ("3 × y ÷ 2", [Fraction(3, 2), 0], "y"),
+    ("7", [7], "x"),
+])
+def test_textbook_inputs(text, coeffs, var):
+    poly = parse_polynomial(text)
+    assert poly.all_coeffs() == [Fraction(c) for c in coeffs]
+    assert poly.var == var
+
+
+def test_printed_polynomials_parse_back():
+    rng = random.Random(3)
+    for _ in range(300):
+        degree = rng.randint(0, 8)
+        coeffs = [Fraction(rng.randint(-50, 50), rng.randint(1, 9)) for _ in range(degree + 1)]
+        coeffs[0] = coeffs[0] or Fraction(1)
+        poly = Polynomial(coeffs, var=rng.choice("xstuy"))
+        parsed = parse_polynomial(str(poly), default_var=poly.var)
+        assert parsed == poly and parsed.var == poly.var
+
+
+@pytest.mark.parametrize("text, message", [
+    ("x2", "write x^2"),
+    ("3x2 + 1", "write x^2"),
+    ("1e5", "scientific notation"),
+    ("2.5E3x", "scientific notation"),
+    ("2E-3", "scientific notation '2E-3'"),
+    ("1e-20x^2+x+1", "scientific notation '1e-20'"),
+    ("1e+5x", "scientific notation '1e+5'"),
+    ("x^2 + y", "more than one variable"),
+    ("2 3", "missing operator"),
+    ("x^-1", "negative exponents"),
+    ("1/x", "division by a non-constant"),
+    ("x/0", "division by zero"),
+    ("sqrt(2)x", "unknown name"),
+    ("x^2 +", "incomplete expression"),
+    ("(x + 1", "expected ')'"),
+    ("__import__('os')", "unexpected character"),
+    ("", "empty input"),
+    (f"x^{MAX_DEGREE + 1}", "exceeds the limit"),
+    ("(x + 1)^100000", "exceeds the limit"),
+    ("(" * 60 + "x" + ")" * 60, "nested too deeply"),
+])
+def test_rejected_inputs(text, message):
+    with pytest.raises(PolynomialSyntaxError, match=re.escape(message)):
+        parse_polynomial(text)
+
+
+def test_names_with_e_are_still_variables():
+    # Only a digit after the e makes it an exponent.
+    assert parse_polynomial("e^2 + 2e").all_coeffs() == [1, 2, 0]
+
+
+@pytest.mark.parametrize("text, coeffs, var", [
+    ("sqrt(2)*x**2 - 1", [sp.sqrt(2), 0, -1], "x"),
+    ("3x^2 - 3√2x + 1", [3, -3 * sp.sqrt(2), 1], "x"),
+    ("2u² - √5u", [2, -sp.sqrt(5), 0], "u"),
+    ("(x - √2)(x + √2)", [1, 0, -2], "x"),
+])
+def test_surd_coefficients(text, coeffs, var):
+    poly = parse_with_surds(text)
+    assert [sp.nsimplify(c) - d for c, d in zip(poly.all_coeffs(), coeffs)] == [0] * len(coeffs)
+    assert poly.var == var
+
+
+def test_rational_input_skips_sympy():
+    poly = parse_with_surds("x^2 - 1/4x - 1")
+    assert poly == parse_polynomial("x^2 - 1/4x - 1") and poly.is_rational
+
+
+@pytest.mark.parametrize("text", ["x^2 - sqrt(x)", "√", "sqrt(2)^9^9x", "sqrt(2)x + y"])
+def test_surds_outside_coefficients_are_rejected(text):
+    with pytest.raises(PolynomialSyntaxError, match="square roots are only allowed"):
+        parse_with_surds(text)
@@ -0,0 +1,28 @@
+import gc
+import io
+import weakref
+
+from polytools.plotting import FIGURE_BYTES, LineChart
+
+
+def render(chart):
+    # What st.pyplot does with the figure.
+    buffer = io.BytesIO()
+    chart.update([-2, 0, 2], [4, 0, 4], "y = x²", label="y = x²", zeroes=[0.0]).savefig(
+        buffer, format="png", dpi=200, bbox_inches="tight")
+    return buffer.getvalue()
+
+
+def test_release_frees_the_raster_buffer():
+    chart = LineChart(figsize=(10, 6))
+    before = render(chart)
+    renderer = weakref.ref(chart.figure.canvas.get_renderer())
+    assert chart.memory_footprint() > FIGURE_BYTES + 1_000_000
+
+    chart.release()
+    gc.collect()
+    # Nothing may still reference the renderer, or its buffer stays alive.
+    assert renderer() is None
+    assert chart.memory_footprint() < FIGURE_BYTES + 1_000
+
+    assert render(chart) == before
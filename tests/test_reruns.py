@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+
+import pytest
+import streamlit.runtime.scriptrunner as scriptrunner
+from streamlit.runtime.scriptrunner import RerunData
+from streamlit.runtime.scriptrunner_utils.script_requests import ScriptRequests
+
+from polytools import reruns
+
+
+@pytest.fixture
+def context(monkeypatch):
+    """Run :func:`rerun_requested` against ``ctx`` instead of a real script run."""
+    def use(ctx):
+        monkeypatch.setattr(scriptrunner, "get_script_run_ctx", lambda suppress_warning=False: ctx)
+    monkeypatch.setattr(reruns, "_unreadable_warned", False)
+    return use
+
+
+def test_rerun_requested_follows_streamlit(context):
+    # The real ScriptRequests of the installed Streamlit, so an upgrade that
+    # moves its private state fails here rather than disabling cancellation.
+    requests = ScriptRequests()
+    context(SimpleNamespace(script_requests=requests))
+    assert not reruns.rerun_requested()
+    assert requests.request_rerun(RerunData())
+    assert reruns.rerun_requested()
+
+    stopped = ScriptRequests()
+    context(SimpleNamespace(script_requests=stopped))
+    stopped.request_stop()
+    assert reruns.rerun_requested()
+
+
+def test_outside_a_script_run(context):
+    context(None)
+    assert not reruns.rerun_requested()
+
+
+def test_unreadable_state_warns_once(context):
+    context(SimpleNamespace(script_requests=object()))
+    with pytest.warns(RuntimeWarning, match="will not be cancelled"):
+        assert not reruns.rerun_requested()
+    assert not reruns.rerun_requested()
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from polytools.horner import horner
+from polytools.parser import parse_polynomial
+from polytools.sampling import TOLERANCE, adaptive_sample, y_range
+
+# Exercise 1 and the section examples, with the y-window the app draws them in.
+EXERCISES = ["x^2 - 2x - 8", "4s^2 - 4s + 1", "6x^2 - 3 - 7x", "4u^2 + 8u", "t^2 - 15",
+             "3x^2 - x - 4", "x^2 - 3x - 4", "x^3 - 6x^2 + 11x - 6", "2x^3 - 5x^2 - 14x + 8",
+             "x^3 - 4x", "2x + 3"]
+
+
+def coefficients(text):
+    return parse_polynomial(text).coeffs
+
+
+def screen_error(coeffs, x, y, ylim):
+    dense = np.linspace(-10, 10, 100001)
+    true = np.clip(horner(coeffs, dense), *ylim)
+    drawn = np.clip(np.interp(dense, x, y), *ylim)
+    return np.max(np.abs(true - drawn)) / (ylim[1] - ylim[0])
+
+
+@pytest.mark.parametrize("text", EXERCISES)
+def test_curve_is_within_tolerance_on_screen(text):
+    coeffs = coefficients(text)
+    ylim = (-20, 20)
+    x, y = adaptive_sample(coeffs, ylim=ylim)
+    assert np.all(np.diff(x) > 0)
+    assert x[0] == -10 and x[-1] == 10
+    assert x.size <= 200
+    assert np.array_equal(y, horner(coeffs, x))
+    assert screen_error(coeffs, x, y, ylim) <= 2 * TOLERANCE
+
+
+@pytest.mark.parametrize("text, zeroes", [
+    ("x^2 - 2x - 8", [-2, 4]),
+    ("x^3 - 6x^2 + 11x - 6", [1, 2, 3]),
+    ("2x^3 - 5x^2 - 14x + 8", [-2, 0.5, 4]),
+    ("4u^2 + 8u", [-2, 0]),
+])
+def test_zeroes_are_sampled(text, zeroes):
+    x, y = adaptive_sample(coefficients(text), ylim=(-20, 20))
+    for zero in zeroes:
+        i = np.argmin(np.abs(x - zero))
+        assert x[i] == pytest.approx(zero, abs=1e-12)
+        assert abs(y[i]) <= 1e-9
+
+
+@pytest.mark.parametrize("text, zero", [("4s^2 - 4s + 1", 0.5), ("x^2 + 6x + 9", -3.0),
+                                        ("x^3 - 3x^2 + 3x - 1", 1.0)])
+def test_repeated_zero_touches_the_axis(text, zero):
+    # The vertex of a tangent curve is a sample, not something between two.
+    x, y = adaptive_sample(coefficients(text), ylim=(-20, 20))
+    assert zero in x
+    assert y[np.searchsorted(x, zero)] == 0.0
+
+
+def test_turning_points_are_sampled():
+    x, _ = adaptive_sample(coefficients("x^2 - 3x - 4"), ylim=(-20, 20))
+    assert 1.5 in x
+
+
+def test_budget_is_respected():
+    x, _ = adaptive_sample(coefficients("x^3 - 4x"), budget=30, tol=1e-9)
+    assert x.size <= 30
+
+
+def test_curve_outside_the_window_is_not_refined():
+    # x^2 + 100 never enters [-20, 20]: nothing to draw more finely.
+    x, _ = adaptive_sample(coefficients("x^2 + 100"), ylim=(-20, 20))
+    assert x.size < 20
+
+
+@pytest.mark.parametrize("text", EXERCISES)
+def test_y_range_matches_dense_grid(text):
+    coeffs = coefficients(text)
+    low, high = y_range(coeffs, -10, 10)
+    dense = horner(coeffs, np.linspace(-10, 10, 200001))
+    assert low == pytest.approx(dense.min(), abs=1e-6)
+    assert high == pytest.approx(dense.max(), abs=1e-6)
@@ -0,0 +1,73 @@
+import asyncio
+import os
+import socket
+import stat
+import threading
+
+import pytest
+
+from polytools.analysis import parse
+from polytools.service import ServiceClient, ServiceUnavailable, SolverService
+
+
+@pytest.fixture
+def running():
+    """Start a :class:`SolverService` on a background event loop."""
+    stops = []
+
+    def start(address, secret=None):
+        service = SolverService(threads=2, secret=secret)
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        task = loop.create_task(service.serve(address, ready))
+
+        def run():
+            try:
+                loop.run_until_complete(task)
+            except asyncio.CancelledError:
+                pass
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        assert ready.wait(5)
+        stops.append((loop, task, thread))
+        return service
+
+    yield start
+    for loop, task, thread in stops:
+        loop.call_soon_threadsafe(task.cancel)
+        thread.join(5)
+        loop.close()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_unix_socket_is_owner_only(running, tmp_path):
+    path = str(tmp_path / "solver.sock")
+    running(path)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    analysis = ServiceClient(path, secret=None).analyze(parse("x^2 - 1"))
+    assert sorted(analysis.zeroes) == [-1, 1]
+
+
+def test_tcp_needs_a_secret():
+    service = SolverService(threads=1, secret=None)
+    with pytest.raises(ValueError, match="POLYTOOLS_SERVICE_SECRET"):
+        asyncio.run(service.serve("127.0.0.1:1"))
+    with pytest.raises(ServiceUnavailable, match="POLYTOOLS_SERVICE_SECRET"):
+        ServiceClient("127.0.0.1:1", secret=None).server_stats()
+
+
+def test_tcp_handshake(running):
+    address = f"127.0.0.1:{free_port()}"
+    service = running(address, secret="s3cret")
+    assert ServiceClient(address, secret="s3cret").server_stats()["requests"] == 1
+
+    with pytest.raises(ServiceUnavailable):
+        ServiceClient(address, secret="guess").server_stats()
+    assert service.rejected == 1
+    assert service.requests == 1
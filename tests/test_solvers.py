@@ -0,0 +1,122 @@
+import random
+import time
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from polytools.analysis import analyze, parse
+from polytools.closed_form import solve_closed_form
+from polytools.exact import isolate_real_roots, rational_roots
+from polytools.polynomial import Polynomial
+from polytools.roots import find_roots
+
+
+def random_rationals(rng, n, max_numerator=12, max_denominator=6):
+    return [Fraction(rng.randint(-max_numerator, max_numerator), rng.randint(1, max_denominator))
+            for _ in range(n)]
+
+
+def test_rational_zeroes_round_trip():
+    rng = random.Random(1)
+    for _ in range(200):
+        zeroes = random_rationals(rng, rng.randint(1, 8))
+        leading = rng.choice([1, -2, 3, Fraction(1, 2)])
+        poly = Polynomial.from_roots(zeroes, leading=leading)
+        found, rest = rational_roots(poly.all_coeffs())
+        assert len(rest) == 1
+        assert sorted(r for r, m in found for _ in range(m)) == sorted(zeroes)
+
+
+@pytest.mark.parametrize("text, zeroes", [
+    ("x^2 - 2x - 8", [-2, 4]),
+    ("4s^2 - 4s + 1", [Fraction(1, 2)]),
+    ("6x^2 - 3 - 7x", [Fraction(-1, 3), Fraction(3, 2)]),
+    ("4u^2 + 8u", [-2, 0]),
+    ("3x^2 - x - 4", [-1, Fraction(4, 3)]),
+    ("2x^3 - 5x^2 - 14x + 8", [-2, Fraction(1, 2), 4]),
+])
+def test_analyze_textbook_exercises(text, zeroes):
+    poly = parse(text)
+    analysis = analyze(poly)
+    assert analysis.exact
+    assert sorted(Fraction(str(z)) for z in analysis.zeroes) == zeroes
+    assert all(v == 0 for v in analysis.values)
+
+
+@pytest.mark.parametrize("text", ["x^3 + x + 1", "x^3 - 3x + 1", "7x^3 - 2x^2 + x + 11", "x^3 - 2",
+                                  "t^2 - 15", "x^2 + 2x + 5"])
+def test_irrational_zeroes_stay_exact_and_fast(text):
+    poly = parse(text)
+    start = time.perf_counter()
+    analysis = analyze(poly, timeout=30)
+    assert time.perf_counter() - start < 3
+    assert analysis.exact
+    assert len(analysis.zeroes) == poly.degree
+    assert all(v == 0 for v in analysis.values)
+    for zero in analysis.zeroes:
+        assert abs(np.polyval(poly.coeffs, complex(zero))) < 1e-9
+
+
+def test_real_zeroes_are_told_apart_exactly():
+    # Three real zeroes of a casus irreducibilis cubic, written with i.
+    analysis = analyze(parse("x^3 - 3x + 1"))
+    assert len(analysis.real_zeroes) == 3
+    assert len(analyze(parse("x^3 + x + 1")).real_zeroes) == 1
+
+
+@pytest.mark.parametrize("coeffs", [[1, -3, -4], [4, -4, 1], [1, 0, 1], [2, -5, -14, 8], [1, 0, 1, 1],
+                                    [1, -3, 3, -1], [1, 0, -2, 0]])
+def test_closed_form_matches_polynomial(coeffs):
+    zeroes = solve_closed_form(coeffs)
+    assert sum(m for _, m in zeroes) == len(coeffs) - 1
+    rebuilt = coeffs[0] * np.poly([complex(z) for z, m in zeroes for _ in range(m)])
+    assert np.allclose(rebuilt, coeffs, atol=1e-9)
+
+
+def test_isolating_intervals_contain_one_zero_each():
+    rng = random.Random(2)
+    for _ in range(50):
+        zeroes = sorted(set(random_rationals(rng, rng.randint(2, 6))))
+        # Rational zeroes next to the irrational pair of x^2 - 2.
+        coeffs = Polynomial.from_roots(zeroes).all_coeffs()
+        coeffs = [a - 2 * b for a, b in zip(coeffs + [0, 0], [0, 0] + coeffs)]
+        expected = sorted([float(z) for z in zeroes] + [-2 ** 0.5, 2 ** 0.5])
+        # An interval only excludes the other zeroes of its own factor, so
+        # compare after refining.
+        intervals = [interval.refine(Fraction(1, 10 ** 12)) for interval in isolate_real_roots(coeffs)]
+        intervals.sort(key=lambda interval: interval.lo)
+        assert len(intervals) == len(expected)
+        for interval, zero in zip(intervals, expected):
+            assert interval.lo <= interval.hi
+            assert float(interval.lo) - 1e-12 <= zero <= float(interval.hi) + 1e-12
+
+
+@pytest.mark.parametrize("degree", [5, 12, 20])
+def test_find_roots_radii_contain_the_zeroes(degree):
+    rng = np.random.default_rng(degree)
+    pairs = rng.integers(-3, 4, degree // 2) + 1j * rng.integers(1, 4, degree // 2)
+    real = rng.integers(-3, 4, degree - 2 * pairs.size)
+    every = np.concatenate([pairs, pairs.conj(), real])
+    # Small Gaussian-integer zeroes keep every coefficient exact in float64.
+    coeffs = np.real(np.poly(every))
+    assert np.all(coeffs == np.round(coeffs)) and np.abs(coeffs).max() < 2 ** 53
+    roots = find_roots(coeffs)
+    assert sum(r.multiplicity for r in roots) == degree
+    for z in every:
+        assert any(abs(complex(r.value) - z) <= r.radius for r in roots)
+
+
+@pytest.mark.parametrize("degree", [7, 64, 200])
+def test_find_roots_of_unity(degree):
+    roots = find_roots([1] + [0] * (degree - 1) + [-1])
+    assert sum(r.multiplicity for r in roots) == degree
+    assert sum(r.multiplicity for r in roots if r.real) == (1 if degree % 2 else 2)
+    for k in range(degree):
+        z = np.exp(2j * np.pi * k / degree)
+        assert any(abs(complex(r.value) - z) <= r.radius + 1e-15 for r in roots)
+
+
+def test_find_roots_groups_repeated_zeroes():
+    roots = find_roots(Polynomial.from_roots([1, 1, 1, 2]).coeffs)
+    assert sorted((round(r.value, 6), r.multiplicity) for r in roots) == [(1.0, 3), (2.0, 1)]
@@ -0,0 +1,62 @@
+import itertools
+import math
+import random
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from polytools.analysis import analyze, parse
+from polytools.polynomial import Polynomial
+from polytools.vieta import elementary_symmetric, relations, symmetric_bounds
+
+
+def test_recurrence_matches_products_of_k_zeroes():
+    rng = random.Random(4)
+    values = [Fraction(rng.randint(-9, 9), rng.randint(1, 5)) for _ in range(9)]
+    expected = [sum(math.prod(c) for c in itertools.combinations(values, k)) for k in range(1, 10)]
+    assert elementary_symmetric(values) == expected
+
+
+@pytest.mark.parametrize("text", ["x^2 - 3x - 4", "4s^2 - 4s + 1", "x^2 + 2x + 5", "t^2 - 15",
+                                  "2x^3 - 5x^2 - 14x + 8", "x^3 + x + 1", "x^3 - 3x + 1", "x^3 - 2",
+                                  "(x - 1)^2(x + 3)", "x^5 - 1", "x^8 - 3x^5 + 2x + 7"])
+def test_relations_hold(text):
+    poly = parse(text)
+    found = relations(poly, analyze(poly))
+    assert [r.k for r in found] == list(range(1, poly.degree + 1))
+    assert all(r.holds for r in found)
+    assert [r.ratio for r in found] == poly.vieta()
+
+
+def test_rational_zeroes_compare_exactly():
+    found = relations(Polynomial.from_roots([Fraction(1, 2), -2, 4], leading=2))
+    assert all(r.error is None for r in found)
+    assert [r.symmetric for r in found] == [Fraction(5, 2), -7, -4]
+
+
+def test_wrong_zeroes_fail():
+    poly = Polynomial([1.0, 0.0, 0.0, -3.0, 0.0, 0.0, 0.0, 2.0, 7.0])
+    from polytools.roots import find_roots
+    from polytools.vieta import _numeric_relations
+
+    perturbed = find_roots([1.0, 0.0, 0.0, -3.001, 0.0, 0.0, 0.0, 2.0, 7.0])
+    assert not all(r.holds for r in _numeric_relations(poly, perturbed))
+
+
+def test_bounds_contain_exact_sums():
+    rng = random.Random(5)
+    values = [Fraction(rng.randint(-40, 40), rng.randint(1, 7)) for _ in range(30)]
+    sums, bounds = symmetric_bounds([float(v) for v in values], [abs(float(v) - v) for v in values])
+    for e, bound, exact in zip(sums, bounds, elementary_symmetric(values)):
+        assert abs(Fraction(e.real) - exact) <= Fraction(bound)
+        assert abs(e.imag) <= bound
+
+
+def test_names_and_labels():
+    found = relations(parse("x^4 - 1"))
+    assert [r.name for r in found] == ["Sum of zeroes", "Sum of products taken two at a time",
+                                       "Sum of products taken three at a time", "Product of zeroes"]
+    assert [r.label for r in found] == ["-b/a", "c/a", "-d/a", "e/a"]
+    assert [r.expression for r in relations(parse("x^2 - 1"))] == ["α + β", "αβ"]
+    assert np.isclose(relations(parse("x^4 - 1"))[3].rounded(), -1)